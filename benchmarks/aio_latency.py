@@ -0,0 +1,79 @@
+"""Measures the latency of the event loop while rMQR Codes are generated.
+
+Usage:
+    python benchmarks/aio_latency.py [--count N] [--concurrency N]
+
+A ticker task sleeps 1 ms repeatedly on the loop and records how late it wakes up,
+while large symbols are fitted and rendered into PNG. This prints the percentiles of
+the lateness for the generation called inline, offloaded to the default thread
+executor, and offloaded to a process executor.
+
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from rmqrcode import rMQR
+from rmqrcode.aio import Offloader
+from rmqrcode.batch import encode_image
+
+DATA = "https://oudon.xyz/" + "0123456789abcdef" * 6
+
+
+async def ticker(lateness, stop):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lateness.append(time.perf_counter() - start - 0.001)
+
+
+async def generate_inline(count, concurrency):
+    for i in range(count):
+        encode_image(rMQR.fit(f"{DATA}{i}"), "png")
+        await asyncio.sleep(0)
+
+
+async def generate_offloaded(count, concurrency, executor=None):
+    offloader = Offloader(executor, max_concurrency=concurrency)
+    async for _ in offloader.fit_many((f"{DATA}{i}" for i in range(count)), render="png"):
+        pass
+
+
+async def measure(generate):
+    lateness = []
+    stop = asyncio.Event()
+    task = asyncio.ensure_future(ticker(lateness, stop))
+    start = time.perf_counter()
+    await generate()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await task
+    return elapsed, lateness
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=200, help="The number of symbols. (default: 200)")
+    parser.add_argument("--concurrency", type=int, default=2, help="The concurrency limit. (default: 2)")
+    args = parser.parse_args()
+
+    with ProcessPoolExecutor(args.concurrency) as executor:
+        modes = {
+            "inline": lambda: generate_inline(args.count, args.concurrency),
+            "thread": lambda: generate_offloaded(args.count, args.concurrency),
+            "process": lambda: generate_offloaded(args.count, args.concurrency, executor),
+        }
+        for name, generate in modes.items():
+            elapsed, lateness = asyncio.run(measure(generate))
+            quantiles = statistics.quantiles(lateness, n=100)
+            print(
+                f"{name:8} total {elapsed:6.2f} s, loop lateness p50 {quantiles[49] * 1000:6.2f} ms, "
+                f"p99 {quantiles[98] * 1000:6.2f} ms, max {max(lateness) * 1000:6.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
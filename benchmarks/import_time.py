@@ -0,0 +1,87 @@
+"""Measures the time of `import rmqrcode` and checks it against a budget.
+
+Usage:
+    python benchmarks/import_time.py [--runs N] [--budget MS]
+
+Each run imports rmqrcode in a fresh interpreter with `-X importtime`. The bytecode
+is cached in a temporary directory and warmed up first, so the compilation of the
+sources is not measured even if PYTHONDONTWRITEBYTECODE is set. This prints the
+median cumulative import time of rmqrcode and the slowest modules, and exits with
+status 1 if the median exceeds the budget or a heavy optional module is imported.
+
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# These modules must not be imported by `import rmqrcode`.
+LAZY_MODULES = ("PIL", "numpy", "logging")
+
+CHECK_CODE = f"import sys, rmqrcode; print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+
+
+def run(args, pycache_prefix):
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return subprocess.run(
+        [sys.executable, "-X", f"pycache_prefix={pycache_prefix}", *args],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def parse_importtime(stderr):
+    """Parses the output of `-X importtime`.
+
+    Returns:
+        dict: The cumulative time in microseconds for each module.
+
+    """
+    res = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        res[name.strip()] = int(cumulative)
+    return res
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=20, help="The number of runs. (default: 20)")
+    parser.add_argument("--budget", type=float, default=25.0, help="The budget in milliseconds. (default: 25)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pycache_prefix:
+        # This run also warms up the bytecode cache.
+        lazy_modules = run(["-c", CHECK_CODE], pycache_prefix).stdout.strip()
+        runs = [
+            parse_importtime(run(["-X", "importtime", "-c", "import rmqrcode"], pycache_prefix).stderr)
+            for _ in range(args.runs)
+        ]
+
+    median = statistics.median(r["rmqrcode"] for r in runs) / 1000
+    print(f"import rmqrcode: {median:.1f} ms (median of {len(runs)} runs, budget {args.budget:.1f} ms)")
+    print("slowest modules (median cumulative ms):")
+    modules = {name: statistics.median(r.get(name, 0) for r in runs) / 1000 for name in runs[-1]}
+    for name, ms in sorted(modules.items(), key=lambda item: -item[1])[1:11]:
+        print(f"  {ms:7.2f} {name}")
+
+    ok = True
+    if lazy_modules:
+        print(f"NG: imported at import time: {lazy_modules}")
+        ok = False
+    if median > args.budget:
+        print("NG: over budget")
+        ok = False
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
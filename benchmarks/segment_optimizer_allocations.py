@@ -0,0 +1,61 @@
+"""Measures memory allocated by the segmentation optimizer.
+
+Usage:
+    python benchmarks/segment_optimizer_allocations.py
+
+For each payload length, this prints the memory blocks and bytes retained by one
+SegmentOptimizer after an optimization, and the peak bytes allocated by one
+rMQR.fit call.
+
+"""
+
+import gc
+import tracemalloc
+
+from rmqrcode import ErrorCorrectionLevel, rMQR
+from rmqrcode.segments import SegmentOptimizer
+
+PAYLOADS = {
+    "5 chars": "ab123",
+    "50 chars": "https://example.com/items/0123456789?lot=ABCDEF-42",
+    "300 chars": "0123456789" * 30,
+}
+
+
+def measure_optimizer(data):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    optimizer = SegmentOptimizer()
+    optimizer.compute(data, "R17x139", ErrorCorrectionLevel.M)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    blocks = sum(stat.count_diff for stat in stats)
+    size = sum(stat.size_diff for stat in stats)
+    del optimizer
+    return blocks, size
+
+
+def measure_fit(data):
+    gc.collect()
+    tracemalloc.start()
+    rMQR.fit(data, ecc=ErrorCorrectionLevel.M)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    # Warm up caches built on first use.
+    rMQR.fit("warm up")
+
+    print(f"{'payload':>10} {'optimizer blocks':>17} {'optimizer bytes':>16} {'fit peak bytes':>15}")
+    for name, data in PAYLOADS.items():
+        blocks, size = measure_optimizer(data)
+        peak = measure_fit(data)
+        print(f"{name:>10} {blocks:>17} {size:>16} {peak:>15}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 from . import encoder
 from .format.error_correction_level import ErrorCorrectionLevel
-from .qr_image import QRImage
+from .png_image import PNGImage
 from .rmqrcode import (
     DataTooLongError,
     FitStrategy,
@@ -8,6 +8,7 @@ from .rmqrcode import (
     NoSegmentError,
     rMQR,
 )
+from .svg_image import SVGImage
 
 __all__ = (
     "rMQR",
@@ -15,7 +16,22 @@ __all__ = (
     "FitStrategy",
     "IllegalVersionError",
     "NoSegmentError",
+    "PNGImage",
     "QRImage",
+    "SVGImage",
     "ErrorCorrectionLevel",
     "encoder",
 )
+
+
+def __getattr__(name):
+    # QRImage requires Pillow, which is heavy to import. It is imported on first access.
+    if name == "QRImage":
+        from .qr_image import QRImage
+
+        return QRImage
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | {"QRImage"})
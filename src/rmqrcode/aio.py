@@ -0,0 +1,260 @@
+"""Coroutine API for asyncio applications.
+
+The encoding and the rendering are CPU-bound and take milliseconds for a large
+symbol, so calling them inline blocks the event loop. Offloader runs them in an
+executor, and limits the number of the calls running at the same time.
+
+The functions are run in the default executor of the loop unless an executor is
+given. A thread executor keeps the loop responsive, but the work still holds the
+GIL, so the other tasks on the loop are delayed a little under a heavy load. Pass a
+concurrent.futures.ProcessPoolExecutor to keep the latency of the loop flat.
+
+Example:
+    >>> offloader = Offloader(max_concurrency=4)
+    >>> qr = await offloader.fit("https://oudon.xyz")
+    >>> png = await offloader.render(qr, "png")
+    >>> async for png in offloader.fit_many(urls, render="png"):
+    ...     await upload(png)
+
+"""
+
+import asyncio
+import os
+from collections import deque
+from functools import partial
+
+from .batch import encode_image
+from .enums.fit_strategy import FitStrategy
+from .errors import DataTooLongError, IllegalVersionError
+from .format.error_correction_level import ErrorCorrectionLevel
+from .rmqrcode import rMQR
+
+
+def _fit(data, ecc, fit_strategy, render=None, module_size=10):
+    qr = rMQR.fit(data, ecc=ecc, fit_strategy=fit_strategy)
+    return qr if render is None else encode_image(qr, render, module_size)
+
+
+def _make(data, version, ecc, render=None, module_size=10):
+    qr = rMQR(version, ecc)
+    qr.add_segment(data)
+    qr.make()
+    return qr if render is None else encode_image(qr, render, module_size)
+
+
+class Offloader:
+    """A class to run the generation in an executor with a concurrency limit.
+
+    The functions and their arguments are pickled if the executor is a process
+    executor.
+
+    Args:
+        executor (concurrent.futures.Executor): The executor. The default executor of
+            the loop is used if None.
+        max_concurrency (int): The maximum number of the calls running in the executor
+            at the same time. The number of CPUs by default.
+
+    Raises:
+        ValueError: If max_concurrency is not positive.
+
+    """
+
+    def __init__(self, executor=None, max_concurrency=None):
+        if max_concurrency is None:
+            max_concurrency = os.cpu_count() or 1
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be positive")
+        self._executor = executor
+        self._max_concurrency = max_concurrency
+        self._semaphore = None
+        self._loop = None
+
+    @property
+    def max_concurrency(self):
+        return self._max_concurrency
+
+    async def run(self, function, *args):
+        """Calls the function in the executor when the limit allows.
+
+        Args:
+            function (function): The function. It must be picklable for a process executor.
+            *args: The arguments.
+
+        Returns:
+            The return value of the function.
+
+        """
+        async with self._get_semaphore():
+            return await self._loop.run_in_executor(self._executor, function, *args)
+
+    async def fit(self, data, ecc=ErrorCorrectionLevel.M, fit_strategy=FitStrategy.BALANCED):
+        """The coroutine version of rMQR.fit().
+
+        Args:
+            data (str): Data string to encode.
+            ecc (rmqrcode.ErrorCorrectionLevel): Error correction level.
+            fit_strategy (rmqrcode.FitStrategy): Strategy how to determine rMQR Code size.
+
+        Returns:
+            rmqrcode.rMQR: Optimized rMQR Code.
+
+        Raises:
+            rmqrcode.DataTooLongError: If the data is too long to encode.
+
+        """
+        return await self.run(_fit, data, ecc, fit_strategy)
+
+    async def make(self, data, version, ecc=ErrorCorrectionLevel.M):
+        """Makes the rMQR Code of the version.
+
+        Args:
+            data (str): Data string to encode.
+            version (str): The version name like "R13x99".
+            ecc (rmqrcode.ErrorCorrectionLevel): Error correction level.
+
+        Returns:
+            rmqrcode.rMQR: The rMQR Code.
+
+        Raises:
+            rmqrcode.DataTooLongError: If the data is too long to encode.
+            rmqrcode.IllegalVersionError: If the version is illegal.
+
+        """
+        return await self.run(_make, data, version, ecc)
+
+    async def render(self, qr, format="png", module_size=10):
+        """Encodes the rMQR Code into an image file.
+
+        See rmqrcode.batch.encode_image() for the formats.
+
+        Args:
+            qr (rmqrcode.rMQR): The rMQR Code.
+            format (str): The image format like "png".
+            module_size (int): The size of a module in pixels.
+
+        Returns:
+            bytes: The image file.
+
+        """
+        return await self.run(encode_image, qr, format, module_size)
+
+    def fit_many(
+        self,
+        data,
+        ecc=ErrorCorrectionLevel.M,
+        fit_strategy=FitStrategy.BALANCED,
+        render=None,
+        module_size=10,
+        return_exceptions=False,
+    ):
+        """Fits the data and yields the results in the input order.
+
+        At most max_concurrency items are read ahead of the consumer, so a slow
+        consumer holds the generation back instead of piling up the results.
+
+        Args:
+            data (iterable): The data strings. An async iterable is also accepted.
+            ecc (rmqrcode.ErrorCorrectionLevel): Error correction level.
+            fit_strategy (rmqrcode.FitStrategy): Strategy how to determine rMQR Code size.
+            render (str): The image format like "png". If given, the image files are
+                yielded instead of the rMQR Codes.
+            module_size (int): The size of a module in pixels for render.
+            return_exceptions (bool): If True, the exception raised for an item is yielded
+                in place of the result instead of being raised.
+
+        Returns:
+            async iterator: The rMQR Codes, or the image files (bytes) if render is given.
+
+        """
+        function = partial(_fit, ecc=ecc, fit_strategy=fit_strategy, render=render, module_size=module_size)
+        return self.map(function, data, return_exceptions)
+
+    def make_many(
+        self, data, version, ecc=ErrorCorrectionLevel.M, render=None, module_size=10, return_exceptions=False
+    ):
+        """Makes the rMQR Codes of the version and yields the results in the input order.
+
+        See fit_many() for the backpressure.
+
+        Args:
+            data (iterable): The data strings. An async iterable is also accepted.
+            version (str): The version name like "R13x99".
+            ecc (rmqrcode.ErrorCorrectionLevel): Error correction level.
+            render (str): The image format like "png". If given, the image files are
+                yielded instead of the rMQR Codes.
+            module_size (int): The size of a module in pixels for render.
+            return_exceptions (bool): If True, the exception raised for an item is yielded
+                in place of the result instead of being raised.
+
+        Returns:
+            async iterator: The rMQR Codes, or the image files (bytes) if render is given.
+
+        """
+        function = partial(_make, version=version, ecc=ecc, render=render, module_size=module_size)
+        return self.map(function, data, return_exceptions)
+
+    def _get_semaphore(self):
+        # The semaphore is made in the running loop because asyncio objects are bound to a
+        # loop before Python 3.10.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        return self._semaphore
+
+    async def map(self, function, data, return_exceptions=False):
+        """Calls the function for each item and yields the results in the input order.
+
+        This is the building block of fit_many() and make_many(). The items are read
+        only when the number of the pending calls is under max_concurrency.
+
+        Args:
+            function (function): The function which takes an item. It must be picklable
+                for a process executor.
+            data (iterable): The items. An async iterable is also accepted.
+            return_exceptions (bool): If True, DataTooLongError and IllegalVersionError
+                raised for an item are yielded in place of the result instead of being raised.
+
+        Yields:
+            The return value of the function for each item.
+
+        """
+        items = _aiter(data)
+        # The futures of the items read ahead, in the input order.
+        pending = deque()
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < self._max_concurrency:
+                    try:
+                        item = await items.__anext__()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    pending.append(asyncio.ensure_future(self.run(function, item)))
+                if not pending:
+                    break
+                try:
+                    result = await pending.popleft()
+                except (DataTooLongError, IllegalVersionError) as e:
+                    if not return_exceptions:
+                        raise
+                    result = e
+                yield result
+        finally:
+            for future in pending:
+                if future.done() and not future.cancelled():
+                    # Retrieves the exception not to be reported as never retrieved.
+                    future.exception()
+                else:
+                    future.cancel()
+            await items.aclose()
+
+
+async def _aiter(data):
+    if hasattr(data, "__aiter__"):
+        async for item in data:
+            yield item
+    else:
+        for item in data:
+            yield item
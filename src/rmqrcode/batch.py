@@ -0,0 +1,530 @@
+"""Batch generation of rMQR Code images from records.
+
+A record is a dict with the following keys.
+
+- **"data"** (str): The data to encode. Required.
+- **"output"** (str): The output file name. The default is made from the output template.
+- **"ecc"** (str): "M" or "H".
+- **"version"** (str): The version name like "R13x99". The version is optimized if omitted.
+- **"fit_strategy"** (str): "min_width", "min_height" or "balanced".
+
+The records are read from text (one data per line) or JSON Lines. The output format
+is determined by the extension of the output file name. The images are written into
+a directory by DirectoryWriter, or streamed into a zip or tar archive by
+ZipArchiveWriter and TarArchiveWriter without temporary files.
+
+"""
+
+import io
+import json
+import os
+import string
+import tarfile
+import time
+import zipfile
+from abc import ABCMeta, abstractmethod
+
+from .enums.fit_strategy import FitStrategy
+from .errors import DataTooLongError, IllegalVersionError
+from .format.error_correction_level import ErrorCorrectionLevel
+from .rmqrcode import rMQR
+
+ECC_LEVELS = {"M": ErrorCorrectionLevel.M, "H": ErrorCorrectionLevel.H}
+FIT_STRATEGIES = {
+    "min_width": FitStrategy.MINIMIZE_WIDTH,
+    "min_height": FitStrategy.MINIMIZE_HEIGHT,
+    "balanced": FitStrategy.BALANCED,
+}
+DEFAULT_OUTPUT_TEMPLATE = "{index:06d}.png"
+ARCHIVE_FORMATS = ("zip", "tar", "tar.gz", "tar.bz2", "tar.xz")
+_ARCHIVE_EXTENSIONS = (
+    (".zip", "zip"),
+    (".tar", "tar"),
+    (".tar.gz", "tar.gz"),
+    (".tgz", "tar.gz"),
+    (".tar.bz2", "tar.bz2"),
+    (".tbz2", "tar.bz2"),
+    (".tar.xz", "tar.xz"),
+    (".txz", "tar.xz"),
+)
+
+
+# The keys of the records which take a string.
+_STRING_KEYS = ("output", "ecc", "version", "fit_strategy")
+
+
+class RecordError(ValueError):
+    "A class represents an error raised when a record is invalid."
+
+    pass
+
+
+def read_records(lines, input_format="text", defaults=None):
+    """Reads the records.
+
+    Args:
+        lines (iterable): The lines of the input.
+        input_format (str): "text" for one data per line or "jsonl" for JSON Lines.
+        defaults (dict): The default values of the keys of the records.
+
+    Yields:
+        dict: The record for each line, or RecordError if the line is invalid. The blank
+            lines are skipped. The keys "index" (the index of the record) and "line" (the
+            line number) are added. RecordError has the attribute `line`.
+
+    """
+    defaults = defaults or {}
+    index = 0
+    for line_number, line in enumerate(lines, 1):
+        line = line.rstrip("\r\n")
+        if not line.strip():
+            continue
+        if input_format == "text":
+            record = {"data": line}
+        else:
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                record = RecordError(f"invalid JSON: {e}")
+            else:
+                if not isinstance(record, dict):
+                    record = RecordError("a record must be a JSON object")
+
+        if isinstance(record, dict):
+            record = {**defaults, **record, "index": index, "line": line_number}
+            try:
+                check_record(record)
+            except RecordError as e:
+                record = e
+        if isinstance(record, RecordError):
+            record.line = line_number
+        index += 1
+        yield record
+
+
+def check_record(record):
+    """Checks the types of the values of the record.
+
+    Args:
+        record (dict): The record.
+
+    Returns:
+        void
+
+    Raises:
+        RecordError: If the data is not a string of Unicode characters, or a value of the
+            other keys is neither a string nor None.
+
+    """
+    data = record.get("data")
+    if data is None:
+        raise RecordError('"data" is required')
+    if not isinstance(data, str):
+        raise RecordError('"data" must be a string')
+    try:
+        data.encode("utf-8")
+    except UnicodeEncodeError as e:
+        raise RecordError(f'"data" is not valid Unicode: {e}')
+    for key in _STRING_KEYS:
+        if not isinstance(record.get(key), (str, type(None))):
+            raise RecordError(f'"{key}" must be a string')
+
+
+def check_name(name):
+    """Checks that the output file name stays in the output directory.
+
+    Args:
+        name (str): The output file name.
+
+    Returns:
+        void
+
+    Raises:
+        RecordError: If the name is empty, absolute or has a drive, or has a ".." part.
+
+    """
+    # The backslash and the drive are also checked for the archives extracted on Windows.
+    parts = name.replace("\\", "/").split("/")
+    if not name or os.path.isabs(name) or parts[0] == "" or ":" in parts[0] or ".." in parts:
+        raise RecordError(f"invalid output name: {name!r}")
+
+
+def check_template(template):
+    """Checks the template of the output file names.
+
+    Args:
+        template (str): The template.
+
+    Returns:
+        void
+
+    Raises:
+        ValueError: If the template has a field other than {index} and {version}, or an
+            invalid format specification.
+
+    """
+    for _, field_name, _, _ in string.Formatter().parse(template):
+        if field_name is not None and field_name not in ("index", "version"):
+            raise ValueError("the template accepts only the fields {index} and {version}")
+    try:
+        template.format(index=0, version="R7x43")
+    except (KeyError, IndexError, ValueError, AttributeError, TypeError) as e:
+        raise ValueError(f"invalid template: {e}")
+
+
+def output_name(record, template=DEFAULT_OUTPUT_TEMPLATE, version_name=None):
+    """Returns the output file name of the record.
+
+    Args:
+        record (dict): The record.
+        template (str): The template of the name used if the record has no "output". The
+            fields {index} and {version} are replaced.
+        version_name (str): The version name of the made symbol.
+
+    Returns:
+        str: The file name.
+
+    Raises:
+        RecordError: If the name is not allowed by check_name().
+
+    """
+    if record.get("output"):
+        name = record["output"]
+    else:
+        name = template.format(index=record["index"], version=version_name)
+    check_name(name)
+    return name
+
+
+def make_qr(record):
+    """Makes the rMQR Code of the record.
+
+    Args:
+        record (dict): The record.
+
+    Returns:
+        rmqrcode.rMQR: The rMQR Code.
+
+    Raises:
+        RecordError: If a value of the record is invalid.
+        rmqrcode.DataTooLongError: If the data is too long to encode.
+        rmqrcode.IllegalVersionError: If the version is illegal.
+
+    """
+    ecc, fit_strategy = _options(record)
+    if record.get("version"):
+        qr = rMQR(record["version"], ecc)
+        qr.add_segment(record["data"])
+        qr.make()
+        return qr
+    return rMQR.fit(record["data"], ecc=ecc, fit_strategy=fit_strategy)
+
+
+def _options(record):
+    """Checks the record and returns its options.
+
+    Args:
+        record (dict): The record.
+
+    Returns:
+        tuple: (rmqrcode.ErrorCorrectionLevel, rmqrcode.FitStrategy).
+
+    Raises:
+        RecordError: If a value of the record is invalid.
+
+    """
+    check_record(record)
+    ecc = ECC_LEVELS.get(record.get("ecc") or "M")
+    if ecc is None:
+        raise RecordError(f"invalid ecc: {record['ecc']!r}")
+    fit_strategy = FIT_STRATEGIES.get(record.get("fit_strategy") or "balanced")
+    if fit_strategy is None:
+        raise RecordError(f"invalid fit strategy: {record['fit_strategy']!r}")
+    return ecc, fit_strategy
+
+
+def _make_qrs(records):
+    """Makes the rMQR Codes of the records with rMQR.fit_many() and rMQR.make_many().
+
+    The identical data are computed once and the symbols of the same version are made
+    together.
+
+    Args:
+        records (list): The records, or the exceptions for the invalid records.
+
+    Returns:
+        list: The rMQR Code or the exception for each record.
+
+    """
+    results = list(records)
+    fit_positions, fit_items = [], []
+    make_positions, make_items = [], []
+    for i, record in enumerate(records):
+        if isinstance(record, Exception):
+            continue
+        try:
+            ecc, fit_strategy = _options(record)
+        except RecordError as e:
+            results[i] = e
+            continue
+        if record.get("version"):
+            make_positions.append(i)
+            make_items.append((record["data"], record["version"], ecc))
+        else:
+            fit_positions.append(i)
+            fit_items.append((record["data"], ecc, fit_strategy))
+
+    chunk_size = max(len(records), 1)
+    for positions, qrs in (
+        (fit_positions, rMQR.fit_many(fit_items, chunk_size=chunk_size, return_exceptions=True)),
+        (make_positions, rMQR.make_many(make_items, chunk_size=chunk_size, return_exceptions=True)),
+    ):
+        for i, qr in zip(positions, qrs):
+            results[i] = qr
+    return results
+
+
+def render(qr, name, module_size=10):
+    """Renders the rMQR Code in the format of the extension of the name.
+
+    Args:
+        qr (rmqrcode.rMQR): The rMQR Code.
+        name (str): The output file name.
+        module_size (int): The size of a module in pixels.
+
+    Returns:
+        bytes: The image file.
+
+    """
+    return encode_image(qr, os.path.splitext(name)[1].lstrip("."), module_size)
+
+
+def encode_image(qr, format="png", module_size=10):
+    """Encodes the rMQR Code into an image file.
+
+    The PNG, SVG, PBM and PGM formats are written without Pillow. The other formats
+    are written by QRImage with Pillow.
+
+    Args:
+        qr (rmqrcode.rMQR): The rMQR Code.
+        format (str): The image format like "png". The case is ignored.
+        module_size (int): The size of a module in pixels.
+
+    Returns:
+        bytes: The image file.
+
+    """
+    format = format.lower()
+    stream = io.BytesIO()
+    if format == "png":
+        from .png_image import PNGImage
+
+        PNGImage(qr, module_size).write(stream)
+    elif format == "svg":
+        from .svg_image import SVGImage
+
+        return SVGImage(qr, module_size).to_string().encode("utf-8")
+    elif format in ("pbm", "pgm"):
+        from .netpbm import write_pbm, write_pgm
+
+        (write_pbm if format == "pbm" else write_pgm)(qr, stream, module_size)
+    else:
+        from .qr_image import QRImage
+
+        QRImage(qr, module_size).save(stream, image_format=format or None)
+    return stream.getvalue()
+
+
+def process_records(records, template=DEFAULT_OUTPUT_TEMPLATE, module_size=10):
+    """Makes and renders the records.
+
+    This function can be passed to rmqrcode.parallel.map_parallel() with functools.partial.
+
+    Args:
+        records (list): The records, or RecordError for the invalid records.
+        template (str): The template of the output file names.
+        module_size (int): The size of a module in pixels.
+
+    Returns:
+        list: The (output file name, image file) tuple for each record, or the exception
+            raised for the record. The exception has the line number of the record as the
+            attribute `line`. The errors of rendering, like an unknown image format, are
+            returned as RecordError.
+
+    """
+    results = []
+    for record, qr in zip(records, _make_qrs(records)):
+        if isinstance(record, Exception):
+            results.append(record)
+            continue
+        try:
+            if isinstance(qr, (DataTooLongError, IllegalVersionError)):
+                raise qr
+            if isinstance(qr, Exception):
+                raise RecordError(f"cannot encode the data: {qr}")
+            name = output_name(record, template, qr.version_name())
+            try:
+                data = render(qr, name, module_size)
+            except (ValueError, TypeError, KeyError, OSError) as e:
+                raise RecordError(f"cannot render {name!r}: {e}")
+            results.append((name, data))
+        except (DataTooLongError, IllegalVersionError, RecordError) as e:
+            e.line = record["line"]
+            results.append(e)
+    return results
+
+
+class OutputWriter(metaclass=ABCMeta):
+    "A base class of the writers of the image files."
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @abstractmethod
+    def write(self, name, data):
+        """Writes the file.
+
+        Args:
+            name (str): The file name. The "/" separates the directories.
+            data (bytes): The content of the file.
+
+        Returns:
+            void
+
+        Raises:
+            RecordError: If the name is not allowed by check_name().
+
+        """
+        raise NotImplementedError()
+
+    def close(self):
+        pass
+
+
+class DirectoryWriter(OutputWriter):
+    """A class to write the files into a directory.
+
+    The subdirectories in the file names are created as needed.
+
+    Args:
+        directory (str): The directory.
+
+    """
+
+    def __init__(self, directory="."):
+        self._directory = directory
+
+    def write(self, name, data):
+        check_name(name)
+        path = os.path.join(self._directory, name)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+
+
+class ZipArchiveWriter(OutputWriter):
+    """A class to stream the files into a zip archive.
+
+    The stream needs not be seekable, so the archive can be written into a pipe.
+
+    Args:
+        stream (io.RawIOBase): The binary stream to write into. It is not closed.
+        compression (int): The compression method of zipfile. The default is
+            zipfile.ZIP_STORED because PNG is already compressed.
+
+    """
+
+    def __init__(self, stream, compression=zipfile.ZIP_STORED):
+        self._zip = zipfile.ZipFile(stream, "w", compression)
+        self._compression = compression
+        self._date_time = time.localtime()[:6]
+
+    def write(self, name, data):
+        check_name(name)
+        info = zipfile.ZipInfo(name, self._date_time)
+        info.compress_type = self._compression
+        info.external_attr = 0o644 << 16
+        self._zip.writestr(info, data)
+
+    def close(self):
+        """Writes the central directory.
+
+        Returns:
+            void
+
+        """
+        self._zip.close()
+
+
+class TarArchiveWriter(OutputWriter):
+    """A class to stream the files into a tar archive.
+
+    Args:
+        stream (io.RawIOBase): The binary stream to write into. It is not closed.
+        compression (str): "", "gz", "bz2" or "xz".
+
+    """
+
+    def __init__(self, stream, compression=""):
+        self._tar = tarfile.open(fileobj=stream, mode=f"w|{compression}")
+        self._mtime = int(time.time())
+
+    def write(self, name, data):
+        check_name(name)
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = self._mtime
+        info.mode = 0o644
+        self._tar.addfile(info, io.BytesIO(data))
+
+    def close(self):
+        """Writes the end of the archive.
+
+        Returns:
+            void
+
+        """
+        self._tar.close()
+
+
+def archive_format(name):
+    """Returns the archive format of the file name.
+
+    Args:
+        name (str): The file name.
+
+    Returns:
+        str: One of ARCHIVE_FORMATS, or None if the extension is not of an archive.
+
+    """
+    name = name.lower()
+    for extension, format in _ARCHIVE_EXTENSIONS:
+        if name.endswith(extension):
+            return format
+    return None
+
+
+def archive_writer(stream, format):
+    """Returns the writer of the archive.
+
+    Args:
+        stream (io.RawIOBase): The binary stream to write into.
+        format (str): One of ARCHIVE_FORMATS.
+
+    Returns:
+        OutputWriter: The writer.
+
+    Raises:
+        ValueError: If the format is not supported.
+
+    """
+    if format == "zip":
+        return ZipArchiveWriter(stream)
+    if format in ARCHIVE_FORMATS:
+        return TarArchiveWriter(stream, format[len("tar.") :])
+    raise ValueError(f"format must be one of {', '.join(ARCHIVE_FORMATS)}")
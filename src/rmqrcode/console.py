@@ -1,16 +1,20 @@
 #!/usr/bin/env python
 import argparse
 import sys
+from functools import partial
+from itertools import islice
 
 from rmqrcode import (
     DataTooLongError,
     ErrorCorrectionLevel,
     FitStrategy,
     IllegalVersionError,
-    QRImage,
     rMQR,
 )
 
+# The number of the records processed together in a single process.
+_BATCH_CHUNK_SIZE = 256
+
 
 def _show_error_and_exit(msg):
     print(msg, file=sys.stderr)
@@ -31,6 +35,9 @@ def _make_qr(data, ecc, version, fit_strategy):
 
 
 def _save_image(qr, output):
+    # Pillow is imported only when an image is saved.
+    from rmqrcode import QRImage
+
     image = QRImage(qr)
     try:
         image.save(output)
@@ -38,10 +45,103 @@ def _save_image(qr, output):
         _show_error_and_exit(f"Error: {e}")
 
 
+def _error_message(e):
+    if isinstance(e, DataTooLongError):
+        return str(e) or "The data is too long."
+    return str(e)
+
+
+def _open_batch_input(path):
+    if path == "-":
+        return sys.stdin
+    try:
+        return open(path, encoding="utf-8")
+    except OSError as e:
+        _show_error_and_exit(f"Error: {e}")
+
+
+def _open_batch_output(args, batch):
+    # Returns the writer and the stream to close after the writer.
+    if args.archive is None:
+        return batch.DirectoryWriter(args.output_dir), None
+    if args.archive == "-":
+        return batch.archive_writer(sys.stdout.buffer, args.archive_format), None
+    try:
+        stream = open(args.archive, "wb")
+    except OSError as e:
+        _show_error_and_exit(f"Error: {e}")
+    return batch.archive_writer(stream, args.archive_format), stream
+
+
+def _run_batch(args, batch):
+    defaults = {"ecc": args.ecc, "version": args.version, "fit_strategy": args.fit_strategy}
+    process = partial(batch.process_records, template=args.output_template, module_size=args.module_size)
+
+    written = 0
+    failed = 0
+    stream = _open_batch_input(args.batch)
+    writer, output_stream = _open_batch_output(args, batch)
+    try:
+        records = batch.read_records(stream, args.input_format, defaults)
+        if args.jobs == 1:
+            # The records are processed in chunks to make the identical data and the
+            # symbols of the same version together.
+            chunks = iter(lambda: list(islice(records, _BATCH_CHUNK_SIZE)), [])
+            results = (result for chunk in chunks for result in process(chunk))
+        else:
+            from rmqrcode.parallel import map_parallel
+
+            results = (result for _, result in map_parallel(process, records, jobs=args.jobs or None))
+
+        for result in results:
+            if isinstance(result, Exception):
+                print(f"Error: line {result.line}: {_error_message(result)}", file=sys.stderr)
+                failed += 1
+                continue
+            name, data = result
+            try:
+                writer.write(name, data)
+            except OSError as e:
+                _show_error_and_exit(f"Error: {e}")
+            written += 1
+    finally:
+        # The archive is finished even if the batch is stopped.
+        writer.close()
+        if output_stream is not None:
+            output_stream.close()
+        if stream is not sys.stdin:
+            stream.close()
+
+    print(f"{written} written, {failed} failed.", file=sys.stderr)
+    if failed:
+        sys.exit(1)
+
+
 def main():
     parser = _init_argparser()
     args = parser.parse_args()
 
+    if args.batch is not None:
+        # The batch module is used only in the batch mode.
+        from rmqrcode import batch
+
+        if args.DATA is not None:
+            parser.error("DATA and OUTPUT cannot be used with --batch")
+        try:
+            batch.check_template(args.output_template)
+        except ValueError as e:
+            parser.error(f"--output-template: {e}")
+        if args.jobs < 0:
+            parser.error("--jobs must not be negative")
+        if args.archive is not None and args.archive_format is None:
+            args.archive_format = batch.archive_format(args.archive)
+            if args.archive_format is None:
+                parser.error(f"--archive-format is required for the archive {args.archive!r}")
+        _run_batch(args, batch)
+        return
+    if args.OUTPUT is None:
+        parser.error("DATA and OUTPUT are required")
+
     if args.ecc == "M":
         ecc = ErrorCorrectionLevel.M
     elif args.ecc == "H":
@@ -63,8 +163,8 @@ def main():
 
 def _init_argparser():
     parser = argparse.ArgumentParser()
-    parser.add_argument("DATA", type=str, help="Data to encode.")
-    parser.add_argument("OUTPUT", type=str, help="Output file path")
+    parser.add_argument("DATA", type=str, nargs="?", help="Data to encode.")
+    parser.add_argument("OUTPUT", type=str, nargs="?", help="Output file path")
     parser.add_argument(
         "--ecc", help="Error correction level. (default: M)", type=str, choices=["M", "H"], default="M"
     )
@@ -75,6 +175,46 @@ def _init_argparser():
         help="Strategy how to determine rMQR Code size.",
         dest="fit_strategy",
     )
+
+    batch = parser.add_argument_group(
+        "batch mode",
+        "Makes an image for each record of the input. The options above are the defaults of the records.",
+    )
+    batch.add_argument("--batch", metavar="FILE", help="Input file of the records, or '-' for the standard input.")
+    batch.add_argument(
+        "--input-format",
+        choices=["text", "jsonl"],
+        default="text",
+        help="'text' for one data per line, or 'jsonl' for JSON Lines. (default: text)",
+        dest="input_format",
+    )
+    batch.add_argument(
+        "--output-dir", default=".", help="Directory of the output files. (default: .)", dest="output_dir"
+    )
+    batch.add_argument(
+        "--output-template",
+        default="{index:06d}.png",
+        help="Output file name with the fields {index} and {version}. The extension determines the format. "
+        "(default: {index:06d}.png)",
+        dest="output_template",
+    )
+    batch.add_argument(
+        "--module-size", type=int, default=10, help="Size of a module in pixels. (default: 10)", dest="module_size"
+    )
+    batch.add_argument(
+        "--archive",
+        metavar="FILE",
+        help="Archive to write the images into instead of --output-dir, or '-' for the standard output.",
+    )
+    batch.add_argument(
+        "--archive-format",
+        choices=["zip", "tar", "tar.gz", "tar.bz2", "tar.xz"],
+        help="Format of the archive. (default: determined by the extension of --archive)",
+        dest="archive_format",
+    )
+    batch.add_argument(
+        "--jobs", type=int, default=1, help="Number of worker processes, or 0 for the number of CPUs. (default: 1)"
+    )
     return parser
 
 
@@ -1,5 +1,4 @@
-import re
-
+from .character_classes import ALPHANUMERIC, CharacterClasses
 from .encoder_base import EncoderBase
 
 
@@ -57,25 +56,12 @@ class AlphanumericEncoder(EncoderBase):
         return "010"
 
     @classmethod
-    def _encoded_bits(cls, data):
-        res = ""
-        data_grouped = cls._group_by_2characters(data)
-        for s in data_grouped:
-            if len(s) == 2:
-                value = cls.CHARACTER_MAP[s[0]] * 45 + cls.CHARACTER_MAP[s[1]]
-                res += bin(value)[2:].zfill(11)
-            elif len(s) == 1:
-                value = cls.CHARACTER_MAP[s[0]]
-                res += bin(value)[2:].zfill(6)
-        return res
-
-    @classmethod
-    def _group_by_2characters(cls, data):
-        res = []
-        while data != "":
-            res.append(data[:2])
-            data = data[2:]
-        return res
+    def _write_encoded_bits(cls, buffer, data):
+        values = [cls.CHARACTER_MAP[c] for c in data]
+        for i in range(0, len(values) - 1, 2):
+            buffer.append(values[i] * 45 + values[i + 1], 11)
+        if len(values) % 2 == 1:
+            buffer.append(values[-1], 6)
 
     @classmethod
     def length(cls, data, character_count_indicator_length):
@@ -89,4 +75,4 @@ class AlphanumericEncoder(EncoderBase):
 
     @classmethod
     def is_valid_characters(cls, data):
-        return bool(re.match(r"^[0-9A-Z\s\$\%\*\+\-\.\/\:]*$", data))
+        return CharacterClasses(data).all_in(ALPHANUMERIC)
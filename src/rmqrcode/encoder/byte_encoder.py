@@ -7,12 +7,9 @@ class ByteEncoder(EncoderBase):
         return "011"
 
     @classmethod
-    def _encoded_bits(cls, s):
-        res = ""
-        encoded = s.encode("utf-8")
-        for byte in encoded:
-            res += bin(byte)[2:].zfill(8)
-        return res
+    def _write_encoded_bits(cls, buffer, s):
+        for byte in s.encode("utf-8"):
+            buffer.append(byte, 8)
 
     @classmethod
     def length(cls, data, character_count_indicator_length):
@@ -0,0 +1,102 @@
+"""A module to classify characters by the encoding modes.
+
+Each character is classified into a bitmask of the encoding modes which can
+encode it. The bit order is the same as the order of the encoders in the
+segment optimizer: Numeric, Alphanumeric, Byte and Kanji.
+
+Attributes:
+    NUMERIC (int): The bit of the Numeric mode.
+    ALPHANUMERIC (int): The bit of the Alphanumeric mode.
+    BYTE (int): The bit of the Byte mode.
+    KANJI (int): The bit of the Kanji mode.
+
+"""
+
+from functools import lru_cache
+
+NUMERIC = 1 << 0
+ALPHANUMERIC = 1 << 1
+BYTE = 1 << 2
+KANJI = 1 << 3
+
+ALPHANUMERIC_CHARACTERS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ $%*+-./:"
+
+
+def _make_ascii_table():
+    table = bytearray([BYTE]) * 256
+    for c in "0123456789":
+        table[ord(c)] |= NUMERIC
+    for c in ALPHANUMERIC_CHARACTERS:
+        table[ord(c)] |= ALPHANUMERIC
+    return bytes(table)
+
+
+# Translation table from an ASCII byte to the bitmask.
+_ASCII_TABLE = _make_ascii_table()
+
+# For each mode bit, the bytes which are the bitmasks including the bit. Deleting them
+# from a sequence of bitmasks leaves the characters which can not be encoded in the mode.
+_MASKS_WITH_BIT = {bit: bytes(m for m in range(16) if m & bit) for bit in (NUMERIC, ALPHANUMERIC, BYTE, KANJI)}
+
+
+@lru_cache(maxsize=8192)
+def _classify_non_ascii(character):
+    """Classifies a non ASCII character.
+
+    Args:
+        character (str): The character.
+
+    Returns:
+        tuple: (bitmask, the length of UTF-8 bytes).
+
+    """
+    mask = BYTE
+    try:
+        shift_jis = character.encode("shift_jis")
+    except UnicodeEncodeError:
+        shift_jis = b""
+    if len(shift_jis) == 2:
+        value = shift_jis[0] << 8 | shift_jis[1]
+        if 0x8140 <= value <= 0x9FFC or 0xE040 <= value <= 0xEBBF:
+            mask |= KANJI
+    return (mask, len(character.encode("utf-8")))
+
+
+class CharacterClasses:
+    """A class represents the classification of each character of the data.
+
+    Attributes:
+        data (str): The classified data.
+        masks (bytes): The bitmask of the encoding modes for each character.
+        byte_lengths (bytes): The length of UTF-8 bytes for each character.
+
+    """
+
+    def __init__(self, data):
+        self.data = data
+        if data.isascii():
+            self.masks = data.encode("ascii").translate(_ASCII_TABLE)
+            self.byte_lengths = b"\x01" * len(data)
+        else:
+            masks = bytearray(len(data))
+            byte_lengths = bytearray(len(data))
+            for i, character in enumerate(data):
+                if character < "\x80":
+                    masks[i] = _ASCII_TABLE[ord(character)]
+                    byte_lengths[i] = 1
+                else:
+                    masks[i], byte_lengths[i] = _classify_non_ascii(character)
+            self.masks = bytes(masks)
+            self.byte_lengths = bytes(byte_lengths)
+
+    def all_in(self, mode_bit):
+        """Checks whether every character can be encoded in the mode.
+
+        Args:
+            mode_bit (int): The bit of the encoding mode.
+
+        Returns:
+            bool: The result.
+
+        """
+        return len(self.masks.translate(None, _MASKS_WITH_BIT[mode_bit])) == 0
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
 
+from ..util.bit_buffer import BitBuffer
+
 
 class EncoderBase(ABC):
     """An abstract class for encoders"""
@@ -31,28 +33,50 @@ class EncoderBase(ABC):
         Raises:
             IllegalCharacterError: If the data includes illegal character.
 
+        """
+        buffer = BitBuffer()
+        cls.write(buffer, data, character_count_indicator_length)
+        return str(buffer)
+
+    @classmethod
+    def write(cls, buffer, data, character_count_indicator_length):
+        """Encodes data and appends it to the buffer.
+
+        Args:
+            buffer (rmqrcode.util.bit_buffer.BitBuffer): The buffer to write into.
+            data (str): Data to encode.
+            character_count_indicator_length: (int): Number of bits of character
+                count indicator defined in the Table 3.
+
+        Returns:
+            void
+
+        Raises:
+            IllegalCharacterError: If the data includes illegal character.
+
         """
         if not cls.is_valid_characters(data):
             raise IllegalCharacterError
 
-        res = cls.mode_indicator()
-        res += bin(cls.characters_num(data))[2:].zfill(character_count_indicator_length)
-        res += cls._encoded_bits(data)
-        return res
+        mode_indicator = cls.mode_indicator()
+        buffer.append(int(mode_indicator, 2), len(mode_indicator))
+        buffer.append(cls.characters_num(data), character_count_indicator_length)
+        cls._write_encoded_bits(buffer, data)
 
     @classmethod
     @abstractmethod
-    def _encoded_bits(cls, data):
-        """Encodes data and returns it.
+    def _write_encoded_bits(cls, buffer, data):
+        """Encodes data and appends it to the buffer.
 
         This method encodes the raw data without the meta data like the mode
         indicator, the number of data characters and so on.
 
         Args:
+            buffer (rmqrcode.util.bit_buffer.BitBuffer): The buffer to write into.
             data (str): Data to encode.
 
         Returns:
-            str: Encoded binary as string.
+            void
 
         """
         raise NotImplementedError()
@@ -1,3 +1,4 @@
+from .character_classes import KANJI, CharacterClasses
 from .encoder_base import EncoderBase, IllegalCharacterError
 
 
@@ -7,8 +8,7 @@ class KanjiEncoder(EncoderBase):
         return "100"
 
     @classmethod
-    def _encoded_bits(cls, data):
-        res = ""
+    def _write_encoded_bits(cls, buffer, data):
         for c in data:
             shift_jis = c.encode("shift-jis")
             hex_value = shift_jis[0] * 256 + shift_jis[1]
@@ -23,8 +23,7 @@ class KanjiEncoder(EncoderBase):
             msb = (hex_value - sub) >> 8
             lsb = (hex_value - sub) & 255
             encoded_value = msb * 0xC0 + lsb
-            res += bin(encoded_value)[2:].zfill(13)
-        return res
+            buffer.append(encoded_value, 13)
 
     @classmethod
     def length(cls, data, character_count_indicator_length):
@@ -36,14 +35,4 @@ class KanjiEncoder(EncoderBase):
 
     @classmethod
     def is_valid_characters(cls, data):
-        for c in data:
-            try:
-                shift_jis = c.encode("shift_jis")
-            except UnicodeEncodeError:
-                return False
-            if len(shift_jis) < 2:
-                return False
-            hex_value = shift_jis[0] * 256 + shift_jis[1]
-            if (0x8140 > hex_value and 0x9FFC < hex_value) or (0xE040 > hex_value and 0xEBBF < hex_value):
-                return False
-        return True
+        return CharacterClasses(data).all_in(KANJI)
@@ -1,5 +1,4 @@
-import re
-
+from .character_classes import NUMERIC, CharacterClasses
 from .encoder_base import EncoderBase
 
 
@@ -8,26 +7,13 @@ class NumericEncoder(EncoderBase):
     def mode_indicator(cls):
         return "001"
 
-    @classmethod
-    def _encoded_bits(cls, data):
-        res = ""
-        data_grouped = cls._group_by_3characters(data)
-        for num in data_grouped:
-            if len(num) == 3:
-                res += bin(int(num))[2:].zfill(10)
-            elif len(num) == 2:
-                res += bin(int(num))[2:].zfill(7)
-            elif len(num) == 1:
-                res += bin(int(num))[2:].zfill(4)
-        return res
+    GROUP_BITS_LENGTH = (0, 4, 7, 10)
 
     @classmethod
-    def _group_by_3characters(cls, data):
-        res = []
-        while data != "":
-            res.append(data[:3])
-            data = data[3:]
-        return res
+    def _write_encoded_bits(cls, buffer, data):
+        for i in range(0, len(data), 3):
+            num = data[i : i + 3]
+            buffer.append(int(num), cls.GROUP_BITS_LENGTH[len(num)])
 
     @classmethod
     def length(cls, data, character_count_indicator_length):
@@ -45,4 +31,4 @@ class NumericEncoder(EncoderBase):
 
     @classmethod
     def is_valid_characters(cls, data):
-        return bool(re.match(r"^[0-9]*$", data))
+        return CharacterClasses(data).all_in(NUMERIC)
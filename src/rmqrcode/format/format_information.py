@@ -0,0 +1,50 @@
+from ..util.error_correction import compute_bch
+from .error_correction_level import ErrorCorrectionLevel
+from .rmqr_versions import rMQRVersions
+
+_format_information_table = None
+
+
+def compute_format_information(version_indicator, ecc):
+    """Computes format information with BCH code.
+
+    Args:
+        version_indicator (int): The version indicator.
+        ecc (rmqrcode.ErrorCorrectionLevel): The error correction level.
+
+    Returns:
+        int: The 18 bits format information before masking.
+
+    """
+    format_information_data = version_indicator
+    if ecc == ErrorCorrectionLevel.H:
+        format_information_data |= 1 << 5
+    reminder_polynomial = compute_bch(format_information_data)
+    return format_information_data << 12 | reminder_polynomial
+
+
+def get_format_information(version_name, ecc):
+    """Returns the format information of the version and the error correction level.
+
+    The format information takes only 64 values. The table of all of them is built
+    at the first call.
+
+    Args:
+        version_name (str): The version name.
+        ecc (rmqrcode.ErrorCorrectionLevel): The error correction level.
+
+    Returns:
+        int: The 18 bits format information before masking.
+
+    """
+    global _format_information_table
+    table = _format_information_table
+    if table is None:
+        # The table is built in a local dict and published at once, so the other threads
+        # never see a partial table.
+        table = {}
+        for name, qr_version in rMQRVersions.items():
+            for level in ErrorCorrectionLevel:
+                table[(name, level)] = compute_format_information(qr_version["version_indicator"], level)
+        _format_information_table = table
+    return table[(version_name, ecc)]
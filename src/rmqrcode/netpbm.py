@@ -0,0 +1,88 @@
+"""Streaming writers of the Netpbm formats and the raw bitmap.
+
+The writers stream the image into a binary file-like object (for example
+sys.stdout.buffer) line by line from the packed rows. No image object is built.
+
+"""
+
+from .rmqrcode import QUIET_ZONE_MODULES
+from .util.raster import scaled_lines
+
+
+def _write_lines(qr, stream, module_size, quiet_zone_modules, bits_per_pixel, dark, light):
+    lines = scaled_lines(qr.packed_rows(), qr.width(), module_size, quiet_zone_modules, bits_per_pixel, dark, light)
+    for line in lines:
+        stream.write(line * module_size)
+
+
+def _image_size(qr, module_size, quiet_zone_modules):
+    return (
+        (qr.width() + quiet_zone_modules * 2) * module_size,
+        (qr.height() + quiet_zone_modules * 2) * module_size,
+    )
+
+
+def write_pbm(qr, stream, module_size=1, quiet_zone_modules=QUIET_ZONE_MODULES):
+    """Writes the rMQR Code as a binary PBM (P4) image.
+
+    Args:
+        qr (rmqrcode.rMQR): The rMQR Code.
+        stream (io.RawIOBase): The binary stream to write into.
+        module_size (int): The size of a module in pixels.
+        quiet_zone_modules (int): The width of the quiet zone in modules.
+
+    Returns:
+        void
+
+    """
+    width, height = _image_size(qr, module_size, quiet_zone_modules)
+    stream.write(f"P4\n{width} {height}\n".encode("ascii"))
+    # The bit is 1 for black in PBM.
+    _write_lines(qr, stream, module_size, quiet_zone_modules, 1, 1, 0)
+
+
+def write_pgm(qr, stream, module_size=1, quiet_zone_modules=QUIET_ZONE_MODULES):
+    """Writes the rMQR Code as a binary PGM (P5) image.
+
+    The pixel is 0 for the dark module and 255 for the light module.
+
+    Args:
+        qr (rmqrcode.rMQR): The rMQR Code.
+        stream (io.RawIOBase): The binary stream to write into.
+        module_size (int): The size of a module in pixels.
+        quiet_zone_modules (int): The width of the quiet zone in modules.
+
+    Returns:
+        void
+
+    """
+    width, height = _image_size(qr, module_size, quiet_zone_modules)
+    stream.write(f"P5\n{width} {height}\n255\n".encode("ascii"))
+    _write_lines(qr, stream, module_size, quiet_zone_modules, 8, 0, 255)
+
+
+def write_raw(qr, stream, module_size=1, quiet_zone_modules=QUIET_ZONE_MODULES, bits_per_pixel=1):
+    """Writes the rMQR Code as a raw bitmap without any header.
+
+    The layout is the same as rmqrcode.rMQR.tobytes() except for the scaling and the
+    quiet zone. If bits_per_pixel is 1, the pixels are packed from the most significant
+    bit and each line is padded to a multiple of 8 bits. If bits_per_pixel is 8, each
+    pixel takes 1 byte. The value is 1 for the dark module and 0 for the light module.
+
+    Args:
+        qr (rmqrcode.rMQR): The rMQR Code.
+        stream (io.RawIOBase): The binary stream to write into.
+        module_size (int): The size of a module in pixels.
+        quiet_zone_modules (int): The width of the quiet zone in modules.
+        bits_per_pixel (int): 1 or 8.
+
+    Returns:
+        void
+
+    Raises:
+        ValueError: If bits_per_pixel is neither 1 nor 8.
+
+    """
+    if bits_per_pixel not in (1, 8):
+        raise ValueError("bits_per_pixel must be 1 or 8")
+    _write_lines(qr, stream, module_size, quiet_zone_modules, bits_per_pixel, 1, 0)
@@ -0,0 +1,373 @@
+"""Parallel generation of rMQR Codes with a process pool.
+
+The items are sent to the worker processes in chunks. Each worker makes the symbols
+of a chunk with rMQR.fit_many() or rMQR.make_many(), and returns them as PackedSymbol,
+the packed modules without the rMQR objects. Optionally the worker renders each
+symbol with a picklable function, for example `functools.partial(render_png, module_size=4)`.
+
+The size of the chunks adapts to the measured time per item so that a chunk takes
+about `target_chunk_seconds` in a worker. At most `jobs * 2` chunks are in flight,
+so the memory is bounded for any length of input.
+
+Example:
+    >>> for symbol in fit_parallel(records, jobs=8):
+    ...     print(symbol.index, symbol.version_name)
+
+map_parallel() applies any picklable function to the chunks in the same way.
+
+"""
+
+import copy
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import partial
+from itertools import islice
+
+from .format.error_correction_level import ErrorCorrectionLevel
+from .rmqrcode import QUIET_ZONE_MODULES, FitStrategy, rMQR
+
+_MIN_CHUNK_SIZE = 1
+_MAX_CHUNK_SIZE = 4096
+_INITIAL_CHUNK_SIZE = 16
+
+# ProcessPoolExecutor accepts max_tasks_per_child on Python 3.11 or later.
+_NATIVE_MAX_TASKS_PER_CHILD = sys.version_info >= (3, 11)
+
+
+class PackedSymbol:
+    """A class represents a symbol made in a worker process.
+
+    Attributes:
+        index (int): The index of the item in the input.
+        version_name (str): The version name like "R13x99".
+        width (int): The width of the symbol without the quiet zone.
+        height (int): The height of the symbol without the quiet zone.
+        packed (bytes): The modules packed 1 bit per module without the quiet zone.
+            See rmqrcode.rMQR.tobytes().
+        rendered (object): The value returned by the render function, or None.
+
+    """
+
+    __slots__ = ("index", "version_name", "width", "height", "packed", "rendered")
+
+    def __init__(self, index, version_name, width, height, packed, rendered=None):
+        self.index = index
+        self.version_name = version_name
+        self.width = width
+        self.height = height
+        self.packed = packed
+        self.rendered = rendered
+
+    @classmethod
+    def from_qr(cls, index, qr, rendered=None):
+        """Packs the rMQR Code.
+
+        Args:
+            index (int): The index of the item.
+            qr (rmqrcode.rMQR): The rMQR Code.
+            rendered (object): The rendered value.
+
+        Returns:
+            PackedSymbol: The packed symbol.
+
+        """
+        return cls(index, qr.version_name(), qr.width(), qr.height(), qr.tobytes(with_quiet_zone=False), rendered)
+
+    def row_stride(self):
+        """Returns the number of bytes of a row of the packed modules.
+
+        Returns:
+            int: The row stride in bytes.
+
+        """
+        return (self.width + 7) // 8
+
+    def to_list(self, with_quiet_zone=True):
+        """Converts to two-dimensional list and returns it.
+
+        The value is 1 for the dark module and 0 for the light module.
+
+        Args:
+            with_quiet_zone (bool): Flag to select whether include the quiet zone.
+
+        Returns:
+            list: Converted list.
+
+        """
+        stride = self.row_stride()
+        quiet_zone = [0] * QUIET_ZONE_MODULES if with_quiet_zone else []
+        res = []
+        for y in range(self.height):
+            bits = int.from_bytes(self.packed[y * stride : (y + 1) * stride], "big") >> (stride * 8 - self.width)
+            res.append(quiet_zone + [bits >> (self.width - 1 - x) & 1 for x in range(self.width)] + quiet_zone)
+        if with_quiet_zone:
+            blank_rows = [[0] * (self.width + QUIET_ZONE_MODULES * 2) for _ in range(QUIET_ZONE_MODULES)]
+            res = blank_rows + res + [list(row) for row in blank_rows]
+        return res
+
+
+def _work(function, items):
+    """Calls the function with a chunk in a worker process.
+
+    Args:
+        function (function): The function to call.
+        items (list): The items of the chunk.
+
+    Returns:
+        tuple: (the list of the results, the elapsed seconds).
+
+    """
+    started = time.perf_counter()
+    results = list(function(items))
+    return (results, time.perf_counter() - started)
+
+
+def _make_packed_symbols(method, kwargs, render, items):
+    """Makes the symbols of a chunk as PackedSymbol.
+
+    Args:
+        method (str): "fit_many" or "make_many".
+        kwargs (dict): The keyword arguments for the method.
+        render (function): The render function or None.
+        items (list): The items of the chunk.
+
+    Returns:
+        list: The list of PackedSymbol (with the index unset) or exceptions.
+
+    """
+    results = []
+    for symbol in getattr(rMQR, method)(items, chunk_size=len(items), return_exceptions=True, **kwargs):
+        if isinstance(symbol, Exception):
+            results.append(symbol)
+        else:
+            results.append(PackedSymbol.from_qr(None, symbol, render(symbol) if render else None))
+    return results
+
+
+def fit_parallel(
+    data,
+    ecc=ErrorCorrectionLevel.M,
+    fit_strategy=FitStrategy.BALANCED,
+    jobs=None,
+    ordered=True,
+    render=None,
+    max_tasks_per_child=None,
+    target_chunk_seconds=0.1,
+    return_exceptions=False,
+):
+    """Computes optimized rMQR Codes for many data in parallel.
+
+    Args:
+        data (iterable): The items to encode. See rmqrcode.rMQR.fit_many().
+        ecc (rmqrcode.ErrorCorrectionLevel): Error correction level for the data strings.
+        fit_strategy (rmqrcode.FitStrategy): Strategy how determine rMQR Code version.
+        jobs (int): The number of worker processes. The number of CPUs by default.
+        ordered (bool): If True, the symbols are yielded in the input order. Otherwise
+            they are yielded as soon as their chunks are done.
+        render (function): The picklable function to call with each rmqrcode.rMQR in the
+            worker. The returned value is set to PackedSymbol.rendered.
+        max_tasks_per_child (int): The number of chunks a worker process handles before it
+            is replaced with a new process. The workers are not replaced if None.
+        target_chunk_seconds (float): The target time of a chunk in a worker.
+        return_exceptions (bool): If True, the exception raised for an item is yielded
+            in place of the symbol instead of being raised. The exception has the index of
+            the item as the attribute `index`.
+
+    Yields:
+        PackedSymbol: The symbol for each item.
+
+    Raises:
+        rmqrcode.DataTooLongError: If the data is too long to encode and `return_exceptions`
+            is False.
+
+    """
+    function = partial(_make_packed_symbols, "fit_many", {"ecc": ecc, "fit_strategy": fit_strategy}, render)
+    return _indexed(
+        map_parallel(function, data, jobs, ordered, max_tasks_per_child, target_chunk_seconds), return_exceptions
+    )
+
+
+def make_parallel(
+    data,
+    version=None,
+    ecc=ErrorCorrectionLevel.M,
+    jobs=None,
+    ordered=True,
+    render=None,
+    max_tasks_per_child=None,
+    target_chunk_seconds=0.1,
+    return_exceptions=False,
+):
+    """Makes rMQR Codes of the given version for many data in parallel.
+
+    Args:
+        data (iterable): The items to encode. See rmqrcode.rMQR.make_many().
+        version (str): The version name for the data strings.
+        ecc (rmqrcode.ErrorCorrectionLevel): Error correction level for the data strings.
+        jobs (int): The number of worker processes. The number of CPUs by default.
+        ordered (bool): If True, the symbols are yielded in the input order. Otherwise
+            they are yielded as soon as their chunks are done.
+        render (function): The picklable function to call with each rmqrcode.rMQR in the
+            worker. The returned value is set to PackedSymbol.rendered.
+        max_tasks_per_child (int): The number of chunks a worker process handles before it
+            is replaced with a new process. The workers are not replaced if None.
+        target_chunk_seconds (float): The target time of a chunk in a worker.
+        return_exceptions (bool): If True, the exception raised for an item is yielded
+            in place of the symbol instead of being raised. The exception has the index of
+            the item as the attribute `index`.
+
+    Yields:
+        PackedSymbol: The symbol for each item.
+
+    Raises:
+        rmqrcode.DataTooLongError: If the data is too long to encode and `return_exceptions`
+            is False.
+        rmqrcode.IllegalVersionError: If the version is illegal and `return_exceptions`
+            is False.
+
+    """
+    function = partial(_make_packed_symbols, "make_many", {"version": version, "ecc": ecc}, render)
+    return _indexed(
+        map_parallel(function, data, jobs, ordered, max_tasks_per_child, target_chunk_seconds), return_exceptions
+    )
+
+
+def _indexed(results, return_exceptions):
+    """Sets the indices to the results of map_parallel().
+
+    Args:
+        results (iterable): The (index, PackedSymbol or exception) tuples.
+        return_exceptions (bool): Flag to select whether yield the exceptions.
+
+    Yields:
+        PackedSymbol: The symbol, or the exception if `return_exceptions` is True.
+
+    """
+    for index, result in results:
+        if isinstance(result, Exception):
+            # The same exception may be returned for identical items, so each position gets
+            # its own copy to keep its index.
+            result = copy.copy(result)
+        # The index is kept with the exception for the unordered results.
+        result.index = index
+        if isinstance(result, Exception) and not return_exceptions:
+            raise result
+        yield result
+
+
+class _Pool:
+    """A process pool which replaces the workers after the given number of tasks.
+
+    On Python 3.11 or later, ProcessPoolExecutor replaces each worker by itself. On the
+    older versions, the whole executor is replaced after `max_tasks_per_child * jobs`
+    tasks are submitted. The old executor finishes its tasks and is shut down before the
+    new one starts, so at most `jobs` worker processes run at the same time.
+
+    """
+
+    def __init__(self, jobs, max_tasks_per_child):
+        self._jobs = jobs
+        self._max_tasks_per_child = max_tasks_per_child
+        self._manual_recycling = max_tasks_per_child is not None and not _NATIVE_MAX_TASKS_PER_CHILD
+        self._submitted = 0
+        self._executor = self._new_executor()
+
+    def _new_executor(self):
+        if self._max_tasks_per_child is not None and not self._manual_recycling:
+            return ProcessPoolExecutor(self._jobs, max_tasks_per_child=self._max_tasks_per_child)
+        return ProcessPoolExecutor(self._jobs)
+
+    def submit(self, *args):
+        if self._manual_recycling and self._submitted >= self._max_tasks_per_child * self._jobs:
+            # The futures of the old executor keep their results after the shutdown.
+            self._executor.shutdown(wait=True)
+            self._executor = self._new_executor()
+            self._submitted = 0
+        self._submitted += 1
+        return self._executor.submit(*args)
+
+    def shutdown(self, cancel_futures=False):
+        if cancel_futures and sys.version_info >= (3, 9):
+            self._executor.shutdown(wait=True, cancel_futures=True)
+        else:
+            self._executor.shutdown(wait=True)
+
+
+def _next_chunk_size(chunk_size, items, seconds, target_chunk_seconds):
+    """Returns the size of the next chunk from the measured time of a chunk.
+
+    Args:
+        chunk_size (int): The current size.
+        items (int): The number of items of the measured chunk.
+        seconds (float): The elapsed time of the measured chunk.
+        target_chunk_seconds (float): The target time of a chunk.
+
+    Returns:
+        int: The next size.
+
+    """
+    if items == 0 or seconds <= 0:
+        return min(chunk_size * 2, _MAX_CHUNK_SIZE)
+    estimated = int(target_chunk_seconds * items / seconds)
+    # The size changes gradually to absorb the noise of the measurement.
+    estimated = max(chunk_size // 2, min(estimated, chunk_size * 2))
+    return max(_MIN_CHUNK_SIZE, min(estimated, _MAX_CHUNK_SIZE))
+
+
+def map_parallel(function, data, jobs=None, ordered=True, max_tasks_per_child=None, target_chunk_seconds=0.1):
+    """Applies the function to the chunks of the items in parallel.
+
+    This is the building block of fit_parallel() and make_parallel().
+
+    Args:
+        function (function): The picklable function which takes a list of items and returns
+            an iterable of the results of the same length.
+        data (iterable): The items.
+        jobs (int): The number of worker processes. The number of CPUs by default.
+        ordered (bool): If True, the results are yielded in the input order. Otherwise
+            they are yielded as soon as their chunks are done.
+        max_tasks_per_child (int): The number of chunks a worker process handles before it
+            is replaced with a new process. The workers are not replaced if None.
+        target_chunk_seconds (float): The target time of a chunk in a worker.
+
+    Yields:
+        tuple: (the index of the item, the result).
+
+    """
+    items = iter(data)
+    jobs = jobs or os.cpu_count() or 1
+    pool = _Pool(jobs, max_tasks_per_child)
+    chunk_size = _INITIAL_CHUNK_SIZE
+    start = 0
+    # The (start index, future) tuples in the submission order.
+    pending = deque()
+    exhausted = False
+    finished = False
+    try:
+        while True:
+            while not exhausted and len(pending) < jobs * 2:
+                chunk = list(islice(items, chunk_size))
+                if not chunk:
+                    exhausted = True
+                    break
+                pending.append((start, pool.submit(_work, function, chunk)))
+                start += len(chunk)
+            if not pending:
+                break
+
+            if ordered:
+                chunk_start, future = pending.popleft()
+            else:
+                done, _ = wait([future for _, future in pending], return_when=FIRST_COMPLETED)
+                chunk_start, future = next(entry for entry in pending if entry[1] in done)
+                pending.remove((chunk_start, future))
+            results, seconds = future.result()
+            chunk_size = _next_chunk_size(chunk_size, len(results), seconds, target_chunk_seconds)
+
+            yield from enumerate(results, chunk_start)
+        finished = True
+    finally:
+        pool.shutdown(cancel_futures=not finished)
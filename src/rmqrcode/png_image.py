@@ -0,0 +1,92 @@
+import io
+import struct
+import zlib
+
+from .rmqrcode import QUIET_ZONE_MODULES
+from .util.raster import scaled_lines
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# The size of the IDAT chunks.
+_IDAT_CHUNK_SIZE = 1 << 16
+
+
+def _write_chunk(stream, chunk_type, data):
+    stream.write(struct.pack(">I", len(data)))
+    stream.write(chunk_type)
+    stream.write(data)
+    stream.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(chunk_type))))
+
+
+class PNGImage:
+    """A class to make a PNG image of the rMQR Code without Pillow.
+
+    The image is a 1-bit grayscale PNG including the quiet zone. It is encoded with
+    zlib directly from the packed rows, line by line. See rmqrcode.util.raster.scaled_lines().
+
+    Args:
+        qr (rmqrcode.rMQR): The rMQR Code.
+        module_size (int): The size of a module in pixels.
+
+    """
+
+    def __init__(self, qr, module_size=10):
+        self._module_size = module_size
+        self._symbol_width = qr.width()
+        self._rows = qr.packed_rows()
+
+    def write(self, stream):
+        """Writes the PNG image into the binary stream.
+
+        Args:
+            stream (io.RawIOBase): The binary stream to write into.
+
+        Returns:
+            void
+
+        """
+        module_size = self._module_size
+        width = self._symbol_width + QUIET_ZONE_MODULES * 2
+        height = len(self._rows) + QUIET_ZONE_MODULES * 2
+        pixel_width = width * module_size
+        stream.write(_PNG_SIGNATURE)
+        # Bit depth 1, color type 0 (grayscale), compression 0, filter 0 and no interlace.
+        _write_chunk(stream, b"IHDR", struct.pack(">IIBBBBB", pixel_width, height * module_size, 1, 0, 0, 0, 0))
+
+        compressor = zlib.compressobj()
+        buffer = bytearray()
+        # The pixel is 0 (black) for the dark module and 1 (white) for the light module.
+        for line in scaled_lines(self._rows, self._symbol_width, module_size, QUIET_ZONE_MODULES, dark=0, light=1):
+            # Each line starts with the filter type 0 (None).
+            buffer.extend(compressor.compress((b"\x00" + line) * module_size))
+            while len(buffer) >= _IDAT_CHUNK_SIZE:
+                _write_chunk(stream, b"IDAT", bytes(buffer[:_IDAT_CHUNK_SIZE]))
+                del buffer[:_IDAT_CHUNK_SIZE]
+        buffer.extend(compressor.flush())
+        if buffer:
+            _write_chunk(stream, b"IDAT", bytes(buffer))
+        _write_chunk(stream, b"IEND", b"")
+
+    def save(self, name):
+        """Saves the PNG image.
+
+        Args:
+            name (str): The file path.
+
+        Returns:
+            void
+
+        """
+        with open(name, "wb") as f:
+            self.write(f)
+
+    def to_bytes(self):
+        """Returns the PNG image as bytes.
+
+        Returns:
+            bytes: The PNG file.
+
+        """
+        stream = io.BytesIO()
+        self.write(stream)
+        return stream.getvalue()
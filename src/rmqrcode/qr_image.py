@@ -1,16 +1,60 @@
-from PIL import Image, ImageDraw
+from PIL import Image
+
+from .rmqrcode import QUIET_ZONE_MODULES
+
+_MODES = ("1", "L", "P", "RGB")
+
+_DEFAULT_DARK_COLOR = (0, 0, 0)
+_DEFAULT_LIGHT_COLOR = (255, 255, 255)
 
 
 class QRImage:
-    def __init__(self, qr, module_size=10):
+    """A class to make an image of the rMQR Code.
+
+    The image is built on first use. The symbol is converted into a bitmap of 1 pixel
+    per module by a single Image.frombytes call, and scaled up by the module size with
+    the nearest neighbour resampling.
+
+    The mode of the image is one of the following.
+
+    - **"1"**: Bilevel. The dark module is 0 and the light module is 1.
+    - **"L"**: Grayscale. The dark module is 0 and the light module is 255.
+    - **"P"**: Palette of the two colors. The dark module is 1 and the light module is 0.
+    - **"RGB"**: True color. This is the default.
+
+    Args:
+        qr (rmqrcode.rMQR): The rMQR Code.
+        module_size (int): The size of a module in pixels.
+        mode (str): The mode of the image.
+        dark_color (tuple): The RGB color of the dark modules for "P" and "RGB".
+        light_color (tuple): The RGB color of the light modules for "P" and "RGB".
+
+    Raises:
+        ValueError: If the mode is not supported, or if custom colors are given for "1" or "L".
+
+    """
+
+    def __init__(
+        self, qr, module_size=10, mode="RGB", dark_color=_DEFAULT_DARK_COLOR, light_color=_DEFAULT_LIGHT_COLOR
+    ):
+        if mode not in _MODES:
+            raise ValueError(f"mode must be one of {', '.join(_MODES)}")
         self._module_size = module_size
-        qr_list = qr.to_list()
-        self._img = Image.new("RGB", (len(qr_list[0]) * module_size, len(qr_list) * module_size), (255, 255, 255))
-        self._make_image(qr_list)
+        self._mode = mode
+        self._dark_color = tuple(dark_color)
+        self._light_color = tuple(light_color)
+        if mode in ("1", "L") and not self._has_default_colors():
+            raise ValueError(f'custom colors are not supported in the mode "{mode}"')
+        self._width = qr.width() + QUIET_ZONE_MODULES * 2
+        self._height = qr.height() + QUIET_ZONE_MODULES * 2
+        if self._uses_palette():
+            self._data = qr.tobytes(bits_per_module=8)
+        else:
+            self._data = qr.tobytes()
+        self._img = None
 
     def show(self):
-        self._img.show()
-        pass
+        self._image().show()
 
     def get_ndarray(self):
         try:
@@ -18,22 +62,58 @@ class QRImage:
         except ImportError:
             raise ImportError("numpy is not installed")
 
-        return np.array(self._img)
-
-    def save(self, name):
-        self._img.save(name)
-
-    def _make_image(self, qr_list):
-        draw = ImageDraw.Draw(self._img)
-        for y in range(len(qr_list)):
-            for x in range(len(qr_list[0])):
-                r, g, b = (0, 0, 0) if qr_list[y][x] else (255, 255, 255)
-                draw.rectangle(
-                    xy=(
-                        x * self._module_size,
-                        y * self._module_size,
-                        (x + 1) * self._module_size,
-                        (y + 1) * self._module_size,
-                    ),
-                    fill=(r, g, b),
-                )
+        return np.array(self._image())
+
+    def save(self, name, image_format=None):
+        """Saves the image.
+
+        Args:
+            name (str): The file path or the binary file object.
+            image_format (str): The image format like "PNG". If None, the format is
+                determined by the extension of the file name.
+
+        Returns:
+            void
+
+        """
+        self._image().save(name, format=image_format)
+
+    def _has_default_colors(self):
+        return (self._dark_color, self._light_color) == (_DEFAULT_DARK_COLOR, _DEFAULT_LIGHT_COLOR)
+
+    def _uses_palette(self):
+        """Checks whether the image is made through the palette of the two colors.
+
+        Returns:
+            bool: True for "P" and for "RGB" with the custom colors.
+
+        """
+        if self._mode == "P":
+            return True
+        return self._mode == "RGB" and not self._has_default_colors()
+
+    def _image(self):
+        """Returns the image, making it at the first call.
+
+        Returns:
+            PIL.Image.Image: The image.
+
+        """
+        if self._img is None:
+            self._img = self._make_image()
+        return self._img
+
+    def _make_image(self):
+        size = (self._width, self._height)
+        if self._uses_palette():
+            # The byte is the palette index, 1 for the dark module.
+            img = Image.frombytes("P", size, self._data)
+            img.putpalette(self._light_color + self._dark_color)
+        else:
+            # The packed bit is 1 for the dark module, so it is read with the inverted raw mode.
+            img = Image.frombytes("1", size, self._data, "raw", "1;I")
+        if self._module_size != 1:
+            img = img.resize((self._width * self._module_size, self._height * self._module_size), Image.NEAREST)
+        if img.mode != self._mode:
+            img = img.convert(self._mode)
+        return img
@@ -19,40 +19,67 @@ Attributes:
 
 """
 
-import logging
+import copy
+from array import array
+from itertools import islice
 
 from . import encoder
 from . import segments as qr_segments
+from .encoder.character_classes import CharacterClasses
 from .enums.color import Color
 from .enums.fit_strategy import FitStrategy
 from .errors import DataTooLongError, IllegalVersionError, NoSegmentError
 from .format.alignment_pattern_coordinates import AlignmentPatternCoordinates
 from .format.error_correction_level import ErrorCorrectionLevel
+from .format.format_information import get_format_information
 from .format.generator_polynomials import GeneratorPolynomials
 from .format.mask import mask
 from .format.rmqr_versions import rMQRVersions
-from .util.error_correction import compute_bch, compute_reed_solomon
-from .util.utilities import split_into_8bits
+from .util.bit_buffer import BitBuffer
+from .util.error_correction import (
+    NUMPY_BATCH_THRESHOLD,
+    compute_reed_solomon,
+    compute_reed_solomon_batch,
+)
 
 QUIET_ZONE_MODULES = 2
 
+# The same as logging.DEBUG. The logging module is not imported at import time.
+_LOGGING_DEBUG = 10
+
+# Translation table from the binary digits to the bytes of 0 and 1.
+_BINARY_DIGITS = bytes.maketrans(b"01", b"\x00\x01")
+
+# Translation table from the binary digits to the characters of rMQRCore.__str__().
+_MODULE_CHARACTERS = str.maketrans("01", "_X")
+
 
 class rMQR:
     """A class to make an rMQR Code."""
 
+    _default_logger = None
+
     @staticmethod
     def _init_logger():
         """Initializes a logger and returns it.
 
+        The logger is initialized at the first call and shared by all rMQR objects.
+        The level is not set, so the debug messages are emitted only if the application
+        enables them, for example by `logging.getLogger("rmqrcode").setLevel(logging.DEBUG)`.
+
         Returns:
             logging.RootLogger: Logger
 
         """
-        logger = logging.getLogger(__name__)
-        logger.addHandler(logging.NullHandler())
-        logger.setLevel(logging.DEBUG)
-        logger.propagate = True
-        return logger
+        if rMQR._default_logger is None:
+            # The logging module is imported on first use to keep `import rmqrcode` light.
+            import logging
+
+            logger = logging.getLogger(__name__)
+            logger.addHandler(logging.NullHandler())
+            logger.propagate = True
+            rMQR._default_logger = logger
+        return rMQR._default_logger
 
     @staticmethod
     def fit(data, ecc=ErrorCorrectionLevel.M, fit_strategy=FitStrategy.BALANCED):
@@ -72,6 +99,162 @@ class rMQR:
         """
         return rMQROptimizer.compute(data, ecc, fit_strategy)
 
+    @staticmethod
+    def fit_many(
+        data,
+        ecc=ErrorCorrectionLevel.M,
+        fit_strategy=FitStrategy.BALANCED,
+        chunk_size=256,
+        return_exceptions=False,
+    ):
+        """Computes optimized rMQR codes for many data lazily.
+
+        The items are processed in chunks of `chunk_size`, so the memory is bounded for
+        any length of input. In a chunk, identical items are computed once, and the
+        symbols are grouped by version and error correction level and made together.
+        See rMQR.make_many().
+
+        Args:
+            data (iterable): The items to encode. An item is a data string, or a tuple
+                (data, ecc) or (data, ecc, fit_strategy) to override the shared arguments.
+            ecc (rmqrcode.ErrorCorrectionLevel): Error correction level for the data strings.
+            fit_strategy (rmqrcode.FitStrategy): Strategy how determine rMQR Code version.
+            chunk_size (int): The number of items processed at once.
+            return_exceptions (bool): If True, the exception raised for an item is yielded
+                in place of the rMQR Code instead of being raised. Each item gets its own
+                exception object.
+
+        Yields:
+            rmqrcode.rMQR: Optimized rMQR Code for each item in the input order.
+
+        Raises:
+            rmqrcode.DataTooLongError: If the data is too long to encode and `return_exceptions`
+                is False.
+            UnicodeEncodeError: If the data has a lone surrogate and `return_exceptions` is False.
+            TypeError: If an item is neither a string nor a tuple and `return_exceptions` is False.
+
+        """
+
+        def prepare(item):
+            if isinstance(item, str):
+                item = (item,)
+            item_data, item_ecc, item_fit_strategy = item + (ecc, fit_strategy)[len(item) - 1 :]
+            version_name, segments = rMQROptimizer.optimize(item_data, item_ecc, item_fit_strategy)
+            qr = rMQR(version_name, item_ecc)
+            qr.add_segments(segments)
+            return qr
+
+        return rMQR._make_in_chunks(data, prepare, chunk_size, return_exceptions)
+
+    @staticmethod
+    def make_many(data, version=None, ecc=ErrorCorrectionLevel.M, chunk_size=256, return_exceptions=False):
+        """Makes rMQR codes of the given version for many data lazily.
+
+        Each data is encoded as one segment in the Byte mode, in the same way as
+        rMQR.add_segment(). The items are processed in chunks of `chunk_size`. In a chunk,
+        identical items are computed once and the symbols are grouped by version and
+        error correction level, so the error correction codewords of a group are computed
+        at once (with NumPy if installed).
+
+        Args:
+            data (iterable): The items to encode. An item is a data string, or a tuple
+                (data, version) or (data, version, ecc) to override the shared arguments.
+            version (str): The version name for the data strings.
+            ecc (rmqrcode.ErrorCorrectionLevel): Error correction level for the data strings.
+            chunk_size (int): The number of items processed at once.
+            return_exceptions (bool): If True, the exception raised for an item is yielded
+                in place of the rMQR Code instead of being raised. Each item gets its own
+                exception object.
+
+        Yields:
+            rmqrcode.rMQR: The rMQR Code for each item in the input order.
+
+        Raises:
+            rmqrcode.DataTooLongError: If the data is too long to encode and `return_exceptions`
+                is False.
+            rmqrcode.IllegalVersionError: If the version is illegal and `return_exceptions`
+                is False.
+            UnicodeEncodeError: If the data has a lone surrogate and `return_exceptions` is False.
+            TypeError: If an item is neither a string nor a tuple and `return_exceptions` is False.
+
+        """
+
+        def prepare(item):
+            if isinstance(item, str):
+                item = (item,)
+            item_data, item_version, item_ecc = item + (version, ecc)[len(item) - 1 :]
+            qr = rMQR(item_version, item_ecc)
+            qr.add_segment(item_data)
+            return qr
+
+        return rMQR._make_in_chunks(data, prepare, chunk_size, return_exceptions)
+
+    @staticmethod
+    def _make_in_chunks(items, prepare, chunk_size, return_exceptions):
+        """Makes rMQR Codes for the items chunk by chunk.
+
+        Args:
+            items (iterable): The items.
+            prepare (function): The function returns an rMQR object with the segments added
+                for an item.
+            chunk_size (int): The number of items processed at once.
+            return_exceptions (bool): Flag to select whether yield the exceptions.
+
+        Yields:
+            rmqrcode.rMQR: The rMQR Code (or the exception) for each item.
+
+        """
+        items = iter(items)
+        while True:
+            chunk = list(islice(items, chunk_size))
+            if not chunk:
+                return
+
+            # The identical items share a key. The unhashable items, which are invalid, get
+            # a unique key each so that their errors are reported per item.
+            keys = []
+            for item in chunk:
+                try:
+                    hash(item)
+                except TypeError:
+                    item = object()
+                keys.append(item)
+
+            # The results of the unique items.
+            results = {}
+            groups = {}
+            for key, item in zip(keys, chunk):
+                if key in results:
+                    continue
+                try:
+                    qr = prepare(item)
+                    codewords = qr._make_data_codewords()
+                except (ValueError, TypeError) as e:
+                    # DataTooLongError, IllegalVersionError, UnicodeEncodeError for a lone
+                    # surrogate, or TypeError for an item of a wrong type.
+                    results[key] = e
+                    continue
+                results[key] = qr
+                groups.setdefault((qr.version_name(), qr._error_correction_level), []).append((qr, codewords))
+
+            for group in groups.values():
+                rMQR._put_all([qr for qr, _ in group], [codewords for _, codewords in group])
+
+            remaining = {}
+            for key in keys:
+                remaining[key] = remaining.get(key, 0) + 1
+            for key in keys:
+                result = results[key]
+                remaining[key] -= 1
+                if isinstance(result, Exception) and not return_exceptions:
+                    raise result
+                if remaining[key]:
+                    # Identical items yield independent objects, exceptions included. The copy
+                    # for the next one is taken before this one is yielded, so it is not
+                    # affected by the consumer.
+                    results[key] = copy.copy(result) if isinstance(result, Exception) else result._copy()
+                yield result
+
     def _optimized_segments(self, data):
         """Returns optimized segments computed by SegmentOptimizer.
 
@@ -82,7 +265,7 @@ class rMQR:
             list: The list of segments.
 
         """
-        optimizer = qr_segments.SegmentOptimizer()
+        optimizer = qr_segments.SegmentOptimizer.for_current_thread()
         return optimizer.compute(data, self.version_name(), self._error_correction_level)
 
     def __init__(self, version, ecc, with_quiet_zone=True, logger=None):
@@ -140,6 +323,19 @@ class rMQR:
         Raises:
             NoSegmentError: If no segment are stored.
 
+        """
+        rMQR._put_all([self], [self._make_data_codewords()])
+
+    def _make_data_codewords(self):
+        """Encodes the stored segments into the data codewords.
+
+        Returns:
+            bytearray: The data codeword sequence padded to the capacity.
+
+        Raises:
+            NoSegmentError: If no segment are stored.
+            DataTooLongError: If the data is too long to encode.
+
         """
         if len(self._segments) < 1:
             raise NoSegmentError()
@@ -147,20 +343,55 @@ class rMQR:
             encoded_data = self._encode_data()
         except DataTooLongError:
             raise DataTooLongError()
+        return self._make_codewords(encoded_data, self._qr_version["codewords_total"])
+
+    @staticmethod
+    def _put_all(qrs, codewords_list):
+        """Puts the modules of the rMQR Codes of the same version and error correction level.
+
+        The error correction codewords of the same block of all symbols are computed at once.
+        The codewords of a large group are placed at once by the NumPy backend if NumPy is
+        installed.
+
+        Args:
+            qrs (list): The list of rMQR objects.
+            codewords_list (list): The data codewords of each rMQR object computed by
+                rMQR._make_data_codewords().
+
+        Returns:
+            void
 
-        self._qr.put_finder_patterns()
-        self._qr.put_corner_finder_pattern()
-        self._qr.put_alignment_pattern()
-        self._qr.put_timing_pattern()
+        """
+        qr_version = qrs[0]._qr_version
+        blocks_definition = qr_version["blocks"][qrs[0]._error_correction_level]
+        blocks_list = rMQR._split_into_blocks_many(codewords_list, blocks_definition)
+
+        # The function patterns and the format information are the same in the group.
+        template = rMQRCore(qr_version["width"], qr_version["height"])
+        template.put_function_patterns()
+        template.put_format_information(qrs[0]._compute_format_info())
+        final_codewords_list = [qr._make_final_codewords(blocks) for qr, blocks in zip(qrs, blocks_list)]
+        data_rows_list = None
+        if len(qrs) >= NUMPY_BATCH_THRESHOLD:
+            data_rows_list = rMQRCore.data_rows_many(qr_version["width"], qr_version["height"], final_codewords_list)
+        for i, qr in enumerate(qrs):
+            qr._qr = template.copy()
+            if data_rows_list is None:
+                qr._qr.put_data(final_codewords_list[i], qr_version["remainder_bits"])
+            else:
+                qr._qr.put_data_rows(data_rows_list[i])
 
-        format_information = self._compute_format_info()
-        self._qr.put_format_information(format_information)
+    def _copy(self):
+        """Returns a copy which does not share the modules and the segments.
 
-        codewords_num = self._qr_version["codewords_total"]
-        codewords = self._make_codewords(encoded_data, codewords_num)
-        blocks = self._split_into_blocks(codewords, self._qr_version["blocks"][self._error_correction_level])
-        final_codewords = self._make_final_codewords(blocks)
-        self._qr.put_data(final_codewords, self._qr_version["remainder_bits"])
+        Returns:
+            rmqrcode.rMQR: The copy.
+
+        """
+        res = copy.copy(self)
+        res._segments = list(self._segments)
+        res._qr = self._qr.copy()
+        return res
 
     def _encode_data(self):
         """Encodes the data.
@@ -169,18 +400,18 @@ class rMQR:
         encoded data of each segments. Finally, this concatenates the terminator if possible.
 
         Returns:
-            str: The encoded data.
+            rmqrcode.util.bit_buffer.BitBuffer: The encoded data.
 
         """
         data_bits_max = self._qr_version["number_of_data_bits"][self._error_correction_level]
 
-        res = ""
+        res = BitBuffer()
         for segment in self._segments:
             character_count_indicator_length = self._qr_version["character_count_indicator_length"][
                 segment["encoder_class"]
             ]
-            res += segment["encoder_class"].encode(segment["data"], character_count_indicator_length)
-        res = self._append_terminator_if_possible(res, data_bits_max)
+            segment["encoder_class"].write(res, segment["data"], character_count_indicator_length)
+        self._append_terminator_if_possible(res, data_bits_max)
 
         if len(res) > data_bits_max:
             raise DataTooLongError("The data is too long.")
@@ -190,21 +421,20 @@ class rMQR:
     def _append_terminator_if_possible(self, data, data_bits_max):
         """Appends the terminator.
 
-        This method appends the terminator at the end of data and returns the
-        appended string. The terminator shall be omitted if the length of string
-        after appending the terminator greater than the rMQR code capacity.
+        This method appends the terminator at the end of data. The terminator shall
+        be omitted if the length of bits after appending the terminator greater than
+        the rMQR code capacity.
 
         Args:
-            data: The data.
+            data (rmqrcode.util.bit_buffer.BitBuffer): The data.
             data_bits_max: The max length of data bits.
 
         Returns:
-            str: The string after appending the terminator.
+            void
 
         """
         if len(data) + 3 <= data_bits_max:
-            data += "000"
-        return data
+            data.append(0b000, 3)
 
     def version_name(self):
         """Returns the version name.
@@ -270,7 +500,7 @@ class rMQR:
             This not includes the quiet zone.
 
         """
-        return self._qr[y][x]
+        return self._qr.get_data(x, y)
 
     def to_list(self, with_quiet_zone=True):
         """Converts to two-dimensional list and returns it.
@@ -296,19 +526,133 @@ class rMQR:
             res = self._qr.to_binary_list()
         return res
 
+    def packed_rows(self):
+        """Returns the modules as packed rows.
+
+        Returns:
+            list: The integers for each row from top to bottom. The bit `width - 1 - x` is 1
+                if the module at x-th column is dark.
+
+        Note:
+            This not includes the quiet zone.
+
+        """
+        return list(self._qr.rows())
+
+    def row_stride(self, with_quiet_zone=True, bits_per_module=1):
+        """Returns the number of bytes of a row of tobytes().
+
+        Args:
+            with_quiet_zone (bool): Flag to select whether include the quiet zone.
+            bits_per_module (int): 1 for the packed modules or 8 for 1 byte per module.
+
+        Returns:
+            int: The row stride in bytes.
+
+        Raises:
+            ValueError: If bits_per_module is neither 1 nor 8.
+
+        """
+        width = self._width + (QUIET_ZONE_MODULES * 2 if with_quiet_zone else 0)
+        if bits_per_module == 1:
+            return (width + 7) // 8
+        elif bits_per_module == 8:
+            return width
+        raise ValueError("bits_per_module must be 1 or 8")
+
+    def tobytes(self, with_quiet_zone=True, bits_per_module=1):
+        """Converts to bytes and returns it.
+
+        The rows are stored from top to bottom and each row takes row_stride() bytes.
+        If bits_per_module is 1, the modules are packed from the most significant bit and
+        each row is padded with 0 bits to a multiple of 8. The bit is 1 for the dark module.
+        If bits_per_module is 8, each module takes 1 byte, which is 1 for the dark module
+        and 0 for the light module. The quiet zone consists of light modules.
+
+        Example:
+            >>> data = qr.tobytes()
+            >>> size = (qr.width() + 4, qr.height() + 4)
+            >>> img = Image.frombuffer("1", size, data, "raw", "1;I", qr.row_stride(), 1)
+
+        Args:
+            with_quiet_zone (bool): Flag to select whether include the quiet zone.
+            bits_per_module (int): 1 for the packed modules or 8 for 1 byte per module.
+
+        Returns:
+            bytes: Converted bytes.
+
+        Raises:
+            ValueError: If bits_per_module is neither 1 nor 8.
+
+        """
+        quiet_zone_modules = QUIET_ZONE_MODULES if with_quiet_zone else 0
+        if bits_per_module == 1:
+            return self._qr.to_packed_bytes(quiet_zone_modules)
+        elif bits_per_module == 8:
+            return self._qr.to_unpacked_bytes(quiet_zone_modules)
+        raise ValueError("bits_per_module must be 1 or 8")
+
+    def to_memoryview(self, with_quiet_zone=True, bits_per_module=1):
+        """Converts to two-dimensional memoryview and returns it.
+
+        The memoryview is read-only and has the shape (rows, row_stride()) over the buffer
+        of tobytes(). It can be passed to any consumer of the buffer protocol without copy.
+
+        Args:
+            with_quiet_zone (bool): Flag to select whether include the quiet zone.
+            bits_per_module (int): 1 for the packed modules or 8 for 1 byte per module.
+
+        Returns:
+            memoryview: Converted memoryview of the unsigned bytes.
+
+        Raises:
+            ValueError: If bits_per_module is neither 1 nor 8.
+
+        """
+        data = self.tobytes(with_quiet_zone, bits_per_module)
+        stride = self.row_stride(with_quiet_zone, bits_per_module)
+        return memoryview(data).cast("B", (len(data) // stride, stride))
+
+    def to_numpy(self, with_quiet_zone=True, dtype=None):
+        """Converts to two-dimensional NumPy array and returns it.
+
+        The value is 1 (True) for the dark module and 0 (False) for the light module.
+        The array is unpacked at once from the packed rows including the quiet zone,
+        without the intermediate lists. For uint8 and bool, the unpacked array is returned
+        without copy.
+
+        Args:
+            with_quiet_zone (bool): Flag to select whether include the quiet zone.
+            dtype (numpy.dtype): The data type of the array. The default is numpy.uint8.
+
+        Returns:
+            numpy.ndarray: Converted array with shape (height, width).
+
+        Raises:
+            ImportError: NumPy is not installed.
+
+        """
+        try:
+            from .util.numpy_backend import unpack_modules
+        except ImportError:
+            raise ImportError("numpy is not installed")
+
+        quiet_zone_modules = QUIET_ZONE_MODULES if with_quiet_zone else 0
+        return unpack_modules(
+            self._qr.to_packed_bytes(quiet_zone_modules),
+            self._height + quiet_zone_modules * 2,
+            self._width + quiet_zone_modules * 2,
+            dtype,
+        )
+
     def __str__(self, with_quiet_zone=True):
         res = f"rMQR Version R{self._height}x{self._width}:\n"
         res += self._qr.__str__(with_quiet_zone)
         return res
 
     def _compute_format_info(self):
-        """Computes format information with BCH code."""
-        format_information_data = self._qr_version["version_indicator"]
-        if self._error_correction_level == ErrorCorrectionLevel.H:
-            format_information_data |= 1 << 5
-        reminder_polynomial = compute_bch(format_information_data)
-        format_information_data = format_information_data << 12 | reminder_polynomial
-        return format_information_data
+        """Returns format information with BCH code from the precomputed table."""
+        return get_format_information(self._version_name, self._error_correction_level)
 
     def _make_codewords(self, encoded_data, codewords_num):
         """Makes codeword sequence from encoded data.
@@ -318,46 +662,70 @@ class rMQR:
         requirements of number of codewords.
 
         Args:
-            encoded_data (str): The encoded data.
+            encoded_data (rmqrcode.util.bit_buffer.BitBuffer): The encoded data.
             codewords_num (int): The number of codewords.
 
         Returns:
-            list: The list of codeword strings.
+            bytearray: The codeword sequence.
 
         """
-        codewords = split_into_8bits(encoded_data)
+        codewords = encoded_data.to_bytes()
         while True:
             if len(codewords) >= codewords_num:
                 break
-            codewords.append("11101100")
+            codewords.append(0b11101100)
             if len(codewords) >= codewords_num:
                 break
-            codewords.append("00010001")
+            codewords.append(0b00010001)
         return codewords
 
     def _split_into_blocks(self, codewords, blocks_definition):
         """Splits codewords into several blocks.
 
         Args:
-            codewords (list): The list of codeword strings.
+            codewords (bytearray): The codeword sequence.
             blocks_definition: The list of dict.
 
         Returns:
             list: The list of Block object.
 
+        """
+        return rMQR._split_into_blocks_many([codewords], blocks_definition)[0]
+
+    @staticmethod
+    def _split_into_blocks_many(codewords_list, blocks_definition):
+        """Splits codewords of many symbols into several blocks.
+
+        The error correction codewords of the blocks of the same definition are computed
+        at once over all symbols. See rmqrcode.util.error_correction.compute_reed_solomon_batch().
+
+        Args:
+            codewords_list (list): The list of the codeword sequences.
+            blocks_definition: The list of dict.
+
+        Returns:
+            list: The list of the lists of Block objects for each codeword sequence.
+
         """
         data_idx = 0
-        blocks = []
+        blocks_list = [[] for _ in codewords_list]
         for block_definition in blocks_definition:
+            data_codewords_num = block_definition["k"]
+            ecc_codewords_num = block_definition["c"] - block_definition["k"]
+            data_blocks = []
             for i in range(block_definition["num"]):
-                data_codewords_num = block_definition["k"]
-                ecc_codewords_num = block_definition["c"] - block_definition["k"]
-                codewords_in_block = codewords[data_idx : data_idx + data_codewords_num]
-                block = Block(data_codewords_num, ecc_codewords_num)
-                block.set_data_and_compute_ecc(codewords_in_block)
-                blocks.append(block)
+                for codewords in codewords_list:
+                    data_blocks.append(bytes(codewords[data_idx : data_idx + data_codewords_num]))
                 data_idx += data_codewords_num
-        return blocks
+            ecc_blocks = compute_reed_solomon_batch(
+                data_blocks, GeneratorPolynomials[ecc_codewords_num], ecc_codewords_num
+            )
+            # The blocks are ordered by the block index and then by the symbol.
+            for j, (data, ecc) in enumerate(zip(data_blocks, ecc_blocks)):
+                block = Block(data_codewords_num, ecc_codewords_num)
+                block.set_data_and_ecc(data, ecc)
+                blocks_list[j % len(codewords_list)].append(block)
+        return blocks_list
 
     def _make_final_codewords(self, blocks):
         """Makes the final message codeword sequence.
@@ -380,10 +748,12 @@ class rMQR:
             blocks (list): The list of Block objects.
 
         Returns:
-            list: The list of codeword strings.
+            bytearray: The final codeword sequence.
 
         """
-        final_codewords = []
+        # The messages are formatted only if the debug level is enabled.
+        debug = self._logger.isEnabledFor(_LOGGING_DEBUG)
+        final_codewords = bytearray()
         # Add data codewords
         # The last block always has the most codewords.
         for i in range(blocks[-1].data_length()):
@@ -391,10 +761,11 @@ class rMQR:
                 try:
                     data_codeword = block.get_data_at(i)
                 except IndexError:
-                    break
+                    continue
                 else:
                     final_codewords.append(data_codeword)
-                    self._logger.debug(f"Put QR data codeword {i} : {data_codeword}")
+                    if debug:
+                        self._logger.debug(f"Put QR data codeword {i} : {data_codeword}")
 
         # Add ecc codewords
         # The last block always has the most codewords.
@@ -403,10 +774,11 @@ class rMQR:
                 try:
                     ecc_codeword = block.get_ecc_at(i)
                 except IndexError:
-                    break
+                    continue
                 else:
                     final_codewords.append(ecc_codeword)
-                    self._logger.debug(f"Put RS data codewords {i} : {ecc_codeword}")
+                    if debug:
+                        self._logger.debug(f"Put RS data codewords {i} : {ecc_codeword}")
         return final_codewords
 
     @staticmethod
@@ -452,62 +824,204 @@ class rMQROptimizer:
             rmqrcode.DataTooLongError: If the data is too long to encode.
 
         """
-        ok_versions = []
-        determined_width = set()
-        determined_height = set()
+        version_name, segments = rMQROptimizer.optimize(data, ecc, fit_strategy)
+        qr = rMQR(version_name, ecc)
+        qr.add_segments(segments)
+        qr.make()
+        return qr
+
+    @staticmethod
+    def optimize(data, ecc, fit_strategy):
+        """Determines the optimized version and segments for given data.
+
+        Args:
+            data (str): Data string to encode.
+            ecc (rmqrcode.ErrorCorrectionLevel): Error correction level.
+            fit_strategy (rmqrcode.FitStrategy): Strategy how determine rMQR Code version.
+
+        Returns:
+            tuple: (version name, the list of segments).
+
+        Raises:
+            rmqrcode.DataTooLongError: If the data is too long to encode.
+
+        """
+        if len(data) > qr_segments.SegmentOptimizer.MAX_CHARACTER:
+            raise DataTooLongError("The data is too long.")
+
+        character_classes = CharacterClasses(data)
+        bounds = qr_segments.LengthBounds(character_classes)
+
+        # The optimal segmentation depends only on the character count indicator lengths,
+        # so it is computed once for each distinct profile of them.
+        optimized_by_profile = {}
 
-        for version_name, qr_version in rMQRVersions.items():
-            optimizer = qr_segments.SegmentOptimizer()
-            try:
-                optimized_segments = optimizer.compute(data, version_name, ecc)
-            except DataTooLongError:
+        for version_name in rMQROptimizer._candidate_versions(fit_strategy):
+            qr_version = rMQRVersions[version_name]
+            character_count_indicator_length = qr_version["character_count_indicator_length"]
+            data_bits_max = qr_version["number_of_data_bits"][ecc]
+            if bounds.lower(character_count_indicator_length) > data_bits_max:
                 continue
 
-            width, height = qr_version["width"], qr_version["height"]
-            if width not in determined_width and height not in determined_height:
-                determined_width.add(width)
-                determined_height.add(height)
-                ok_versions.append(
-                    {
-                        "version": version_name,
-                        "width": width,
-                        "height": height,
-                        "segments": optimized_segments,
-                    }
+            profile = tuple(character_count_indicator_length[encoder_class] for encoder_class in qr_segments.encoders)
+            if profile not in optimized_by_profile:
+                optimizer = qr_segments.SegmentOptimizer.for_current_thread()
+                optimized_by_profile[profile] = optimizer.optimize(
+                    data, character_count_indicator_length, character_classes
                 )
 
-        if len(ok_versions) == 0:
-            raise DataTooLongError("The data is too long.")
+            optimized = optimized_by_profile[profile]
+            if optimized["cost"] > data_bits_max:
+                continue
+            return (version_name, optimized["segments"])
 
-        if fit_strategy == FitStrategy.MINIMIZE_WIDTH:
+        raise DataTooLongError("The data is too long.")
 
-            def sort_key(x):
-                return x["width"]
+    _candidate_versions_cache = {}
 
-        elif fit_strategy == FitStrategy.MINIMIZE_HEIGHT:
+    @staticmethod
+    def _candidate_versions(fit_strategy):
+        """Returns the version names in the order of preference for the fit strategy.
 
-            def sort_key(x):
-                return x["height"]
+        The versions are sorted by the sort key of the fit strategy. The versions have
+        the same key are kept in the order of rMQRVersions. So the first version that
+        can contain the data is the optimized version.
+
+        Args:
+            fit_strategy (rmqrcode.FitStrategy): Strategy how determine rMQR Code version.
 
-        elif fit_strategy == FitStrategy.BALANCED:
+        Returns:
+            list: The list of version names.
 
-            def sort_key(x):
-                return x["height"] * 9 + x["width"]
+        """
+        if fit_strategy not in rMQROptimizer._candidate_versions_cache:
+            if fit_strategy == FitStrategy.MINIMIZE_WIDTH:
 
-        selected = sorted(ok_versions, key=sort_key)[0]
-        qr = rMQR(selected["version"], ecc)
-        qr.add_segments(selected["segments"])
-        qr.make()
-        return qr
+                def sort_key(version_name):
+                    return rMQRVersions[version_name]["width"]
+
+            elif fit_strategy == FitStrategy.MINIMIZE_HEIGHT:
+
+                def sort_key(version_name):
+                    return rMQRVersions[version_name]["height"]
+
+            elif fit_strategy == FitStrategy.BALANCED:
+
+                def sort_key(version_name):
+                    return rMQRVersions[version_name]["height"] * 9 + rMQRVersions[version_name]["width"]
+
+            rMQROptimizer._candidate_versions_cache[fit_strategy] = sorted(rMQRVersions, key=sort_key)
+        return rMQROptimizer._candidate_versions_cache[fit_strategy]
 
 
 class rMQRCore:
-    "A class correspond to a grid of modules of rMQR code."
+    """A class correspond to a grid of modules of rMQR code.
+
+    The grid is stored as packed rows. Each row is an integer whose bit `width - 1 - x`
+    is 1 if the module at x-th column is dark. While constructing, another list of
+    packed rows records which modules are defined. It is dropped after the data is put
+    because all modules are defined then.
+
+    """
+
+    _function_patterns_templates = {}
+    _placement_maps = {}
+    _placement_bits_cache = {}
+    _mask_patterns_cache = {}
 
     def __init__(self, width, height):
         self._width = width
         self._height = height
-        self._qr = [[Color.UNDEFINED for x in range(self._width)] for y in range(self._height)]
+        self._rows = [0] * height
+        self._defined = [0] * height
+
+    def copy(self):
+        """Returns a copy of the grid.
+
+        Returns:
+            rMQRCore: The copy.
+
+        """
+        res = rMQRCore(self._width, self._height)
+        res._rows = list(self._rows)
+        res._defined = None if self._defined is None else list(self._defined)
+        return res
+
+    def _put_module(self, x, y, color):
+        """Puts the module at x-th column and y-th row.
+
+        Args:
+            x (int): The index of x.
+            y (int): The index of y.
+            color (rmqrcode.Color): The color. Color.BLACK for the dark module and Color.WHITE
+                for the light module.
+
+        Returns:
+            void
+
+        """
+        bit = 1 << (self._width - 1 - x)
+        self._defined[y] |= bit
+        if color == Color.BLACK:
+            self._rows[y] |= bit
+        else:
+            self._rows[y] &= ~bit
+
+    def _is_defined(self, x, y):
+        """Checks whether the module at x-th column and y-th row is defined.
+
+        Args:
+            x (int): The index of x.
+            y (int): The index of y.
+
+        Returns:
+            bool: The result.
+
+        """
+        return self._defined is None or bool(self._defined[y] >> (self._width - 1 - x) & 1)
+
+    @classmethod
+    def _function_patterns_template(cls, width, height):
+        """Returns the cached grid which has all function patterns.
+
+        The function patterns are the same for every symbol of a version. So the grid
+        is built at the first call for each size and the same immutable grid is returned
+        after that.
+
+        Args:
+            width (int): The width.
+            height (int): The height.
+
+        Returns:
+            tuple: (rows, defined). The tuples of packed rows of the modules and of the
+                defined flags.
+
+        """
+        template = cls._function_patterns_templates.get((width, height))
+        if template is None:
+            core = cls(width, height)
+            core.put_finder_patterns()
+            core.put_corner_finder_pattern()
+            core.put_alignment_pattern()
+            core.put_timing_pattern()
+            template = (tuple(core._rows), tuple(core._defined))
+            cls._function_patterns_templates[(width, height)] = template
+        return template
+
+    def put_function_patterns(self):
+        """Puts all function patterns.
+
+        This method puts the finder pattern, the finder sub pattern, the corner finder
+        patterns, the alignment patterns and the timing patterns by copying the cached
+        template. The format information is not included.
+
+        Returns:
+            void
+
+        """
+        rows, defined = rMQRCore._function_patterns_template(self._width, self._height)
+        self._rows = list(rows)
+        self._defined = list(defined)
 
     def get_data(self, x, y):
         """Returns the module value at x-th column and y-th row.
@@ -523,27 +1037,83 @@ class rMQRCore:
             IndexError: If the index is invalid.
 
         """
-        if 0 > x or self._width < x:
+        if 0 > x or self._width <= x:
             raise IndexError("x index out of range")
-        if 0 > y or self._height < y:
+        if 0 > y or self._height <= y:
             raise IndexError("y index out of range")
-        return self._qr[y][x]
+        if not self._is_defined(x, y):
+            return Color.UNDEFINED
+        return Color.BLACK if self._rows[y] >> (self._width - 1 - x) & 1 else Color.WHITE
+
+    def rows(self):
+        """Returns the packed rows.
+
+        Returns:
+            list: The integers for each row. The bit `width - 1 - x` is 1 if the module
+                at x-th column is dark.
+
+        Note:
+            This not includes the quiet zone.
+
+        """
+        return self._rows
+
+    def to_packed_bytes(self, quiet_zone_modules=0):
+        """Packs the modules into bytes, 1 bit per module.
+
+        Each row is packed from the most significant bit, the first module is the bit 7
+        of the first byte of the row. A row is padded with 0 bits to a multiple of 8, so
+        the row stride is ceil((width + quiet_zone_modules * 2) / 8) bytes. The bit is 1
+        for the dark module. This is the same layout as the PBM (P4) raster and the
+        mode "1" of Pillow except that the bit is inverted.
+
+        Args:
+            quiet_zone_modules (int): The width of the quiet zone to surround the symbol with.
+
+        Returns:
+            bytes: The packed modules.
+
+        """
+        width = self._width + quiet_zone_modules * 2
+        stride = (width + 7) // 8
+        shift = quiet_zone_modules + stride * 8 - width
+        blank_rows = bytes(stride * quiet_zone_modules)
+        return blank_rows + b"".join((row << shift).to_bytes(stride, "big") for row in self._rows) + blank_rows
+
+    def to_unpacked_bytes(self, quiet_zone_modules=0):
+        """Converts the modules into bytes, 1 byte per module.
+
+        The byte is 1 for the dark module and 0 for the light module. The row stride is
+        width + quiet_zone_modules * 2 bytes.
+
+        Args:
+            quiet_zone_modules (int): The width of the quiet zone to surround the symbol with.
+
+        Returns:
+            bytes: Converted bytes.
+
+        """
+        width = self._width + quiet_zone_modules * 2
+        row_format = f"0{width}b"
+        blank_rows = bytes(width * quiet_zone_modules)
+        # The quiet zone on both sides is formatted as the leading and trailing 0 digits.
+        rows = b"".join(format(row << quiet_zone_modules, row_format).encode("ascii") for row in self._rows)
+        return blank_rows + rows.translate(_BINARY_DIGITS) + blank_rows
 
     def to_binary_list(self):
         """Converts to two-dimensional list and returns it.
 
         The value is 1 for the dark module and 0 for the light module.
 
-        Args:
-            with_quiet_zone (bool): Flag to select whether include the quiet zone.
-
         Returns:
             list: Converted list.
 
         Note:
             This not includes the quiet zone.
         """
-        return [list(map(lambda x: 1 if x == Color.BLACK else 0, column)) for column in self._qr]
+        # The binary representation of each row is translated into bytes of 0 and 1.
+        row_format = f"0{self._width}b"
+        return [list(format(row, row_format).encode("ascii").translate(_BINARY_DIGITS)) for row in self._rows]
 
     def put_finder_patterns(self):
         self._put_finder_pattern()
@@ -554,49 +1124,49 @@ class rMQRCore:
         for i in range(7):
             for j in range(7):
                 if i == 0 or i == 6 or j == 0 or j == 6:
-                    self._qr[i][j] = Color.BLACK
+                    self._put_module(j, i, Color.BLACK)
                 else:
-                    self._qr[i][j] = Color.WHITE
+                    self._put_module(j, i, Color.WHITE)
 
         # Inner square
         for i in range(3):
             for j in range(3):
-                self._qr[2 + i][2 + j] = Color.BLACK
+                self._put_module(2 + j, 2 + i, Color.BLACK)
 
         # Separator
         for n in range(8):
             if n < self._height:
-                self._qr[n][7] = Color.WHITE
+                self._put_module(7, n, Color.WHITE)
 
             if self._height >= 9:
-                self._qr[7][n] = Color.WHITE
+                self._put_module(n, 7, Color.WHITE)
 
     def _put_finder_sub_pattern(self):
         # Outer square
         for i in range(5):
             for j in range(5):
                 color = Color.BLACK if i == 0 or i == 4 or j == 0 or j == 4 else Color.WHITE
-                self._qr[self._height - i - 1][self._width - j - 1] = color
+                self._put_module(self._width - j - 1, self._height - i - 1, color)
 
         # Inner square
-        self._qr[self._height - 1 - 2][self._width - 1 - 2] = Color.BLACK
+        self._put_module(self._width - 1 - 2, self._height - 1 - 2, Color.BLACK)
 
     def put_corner_finder_pattern(self):
         # Corner finder pattern
         # Bottom left
-        self._qr[self._height - 1][0] = Color.BLACK
-        self._qr[self._height - 1][1] = Color.BLACK
-        self._qr[self._height - 1][2] = Color.BLACK
+        self._put_module(0, self._height - 1, Color.BLACK)
+        self._put_module(1, self._height - 1, Color.BLACK)
+        self._put_module(2, self._height - 1, Color.BLACK)
 
         if self._height >= 11:
-            self._qr[self._height - 2][0] = Color.BLACK
-            self._qr[self._height - 2][1] = Color.WHITE
+            self._put_module(0, self._height - 2, Color.BLACK)
+            self._put_module(1, self._height - 2, Color.WHITE)
 
         # Top right
-        self._qr[0][self._width - 1] = Color.BLACK
-        self._qr[0][self._width - 2] = Color.BLACK
-        self._qr[1][self._width - 1] = Color.BLACK
-        self._qr[1][self._width - 2] = Color.WHITE
+        self._put_module(self._width - 1, 0, Color.BLACK)
+        self._put_module(self._width - 2, 0, Color.BLACK)
+        self._put_module(self._width - 1, 1, Color.BLACK)
+        self._put_module(self._width - 2, 1, Color.WHITE)
 
     def put_alignment_pattern(self):
         center_xs = AlignmentPatternCoordinates[self._width]
@@ -605,9 +1175,9 @@ class rMQRCore:
                 for j in range(3):
                     color = Color.BLACK if i == 0 or i == 2 or j == 0 or j == 2 else Color.WHITE
                     # Top side
-                    self._qr[i][center_x + j - 1] = color
+                    self._put_module(center_x + j - 1, i, color)
                     # Bottom side
-                    self._qr[self._height - 1 - i][center_x + j - 1] = color
+                    self._put_module(center_x + j - 1, self._height - 1 - i, color)
 
     def put_timing_pattern(self):
         self._put_timing_pattern_horizontal()
@@ -617,8 +1187,8 @@ class rMQRCore:
         for j in range(self._width):
             color = Color.BLACK if (j + 1) % 2 else Color.WHITE
             for i in [0, self._height - 1]:
-                if self._qr[i][j] == Color.UNDEFINED:
-                    self._qr[i][j] = color
+                if not self._is_defined(j, i):
+                    self._put_module(j, i, color)
 
     def _put_timing_pattern_vertical(self):
         center_xs = [0, self._width - 1]
@@ -626,8 +1196,8 @@ class rMQRCore:
         for i in range(self._height):
             color = Color.BLACK if (i + 1) % 2 else Color.WHITE
             for j in center_xs:
-                if self._qr[i][j] == Color.UNDEFINED:
-                    self._qr[i][j] = color
+                if not self._is_defined(j, i):
+                    self._put_module(j, i, color)
 
     def put_format_information(self, format_information):
         """Format information placement.
@@ -662,7 +1232,7 @@ class rMQRCore:
         for n in range(18):
             di = n % 5
             dj = n // 5
-            self._qr[si + di][sj + dj] = Color.BLACK if format_information >> n & 1 else Color.WHITE
+            self._put_module(sj + dj, si + di, Color.BLACK if format_information >> n & 1 else Color.WHITE)
 
     def _put_format_information_finder_sub_pattern_side(self, format_information):
         """Format information placement (finder sub pattern side).
@@ -684,15 +1254,15 @@ class rMQRCore:
         for n in range(15):
             di = n % 5
             dj = n // 5
-            self._qr[si + di][sj + dj] = Color.BLACK if format_information >> n & 1 else Color.WHITE
-        self._qr[self._height - 1 - 5][self._width - 1 - 4] = (
-            Color.BLACK if format_information >> 15 & 1 else Color.WHITE
+            self._put_module(sj + dj, si + di, Color.BLACK if format_information >> n & 1 else Color.WHITE)
+        self._put_module(
+            self._width - 1 - 4, self._height - 1 - 5, Color.BLACK if format_information >> 15 & 1 else Color.WHITE
         )
-        self._qr[self._height - 1 - 5][self._width - 1 - 3] = (
-            Color.BLACK if format_information >> 16 & 1 else Color.WHITE
+        self._put_module(
+            self._width - 1 - 3, self._height - 1 - 5, Color.BLACK if format_information >> 16 & 1 else Color.WHITE
         )
-        self._qr[self._height - 1 - 5][self._width - 1 - 2] = (
-            Color.BLACK if format_information >> 17 & 1 else Color.WHITE
+        self._put_module(
+            self._width - 1 - 2, self._height - 1 - 5, Color.BLACK if format_information >> 17 & 1 else Color.WHITE
         )
 
     def put_data(self, final_codewords, remainder_bits_num):
@@ -700,71 +1270,104 @@ class rMQRCore:
 
         This method puts data into the encoding region of the rMQR Code. The data
         should be encoded by NumericEncoder, AlphanumericEncoder, ByteEncoder or KanjiEncoder.
-        Also this method computes a two-dimensional list shows where encoding region at the
-        same time. And returns the list.
+        The data mask is applied to the encoding region at the same time.
         See: "7.7.3 Symbol character placement" in the ISO/IEC 23941.
 
         Args:
-            encoded_data (str): The data after encoding. Expected all segments are joined.
+            final_codewords (bytearray): The final codeword sequence.
             reminder_bits_num (int): The number of modules without data.
 
         Returns:
-            list: A two-dimensional list shows where encoding region.
+            void
 
         """
-        mask_area = self._put_final_codewords(final_codewords, remainder_bits_num)
-        self._apply_mask(mask_area)
+        self._put_final_codewords(final_codewords, remainder_bits_num)
 
-    def _put_final_codewords(self, final_codewords, reminder_bits_num):
-        """Puts the final codeword sequence.
+    def put_data_rows(self, data_rows):
+        """Puts the masked encoding region computed by rMQRCore.data_rows_many().
+
+        Args:
+            data_rows (list): The packed rows of the encoding region. The modules outside of
+                the encoding region are 0.
+
+        Returns:
+            void
+
+        """
+        self._rows = [row | data_row for row, data_row in zip(self._rows, data_rows)]
+        self._defined = None
+
+    @classmethod
+    def data_rows_many(cls, width, height, final_codewords_list):
+        """Computes the masked encoding regions of many symbols with NumPy.
 
-        This method puts the final codeword sequence into the encoding region of the rMQR Code.
-        The `final_codewords` is computed by self._make_final_codewords method. Also, this method
-        computes a two-dimensional list shows where encoding region at the same time.
-        And returns the list.
+        The remainder bits are 0 before masking, so they are placed with the mask only.
 
         Args:
-            final_codewords (list): The list of the final codeword strings.
-            reminder_bits_num (int): The number of modules without data.
+            width (int): The width.
+            height (int): The height.
+            final_codewords_list (list): The final codeword sequences of the same length.
 
         Returns:
-            list: A two-dimensional list shows where encoding region.
+            list: The packed rows of the encoding region of each symbol for
+                rMQRCore.put_data_rows(), or None if NumPy is not installed.
+
+        """
+        try:
+            import numpy as np
+
+            from .util.numpy_backend import apply_mask, pack_rows, place_codewords
+        except ImportError:
+            return None
+
+        final_codewords = np.frombuffer(b"".join(final_codewords_list), dtype=np.uint8).reshape(
+            len(final_codewords_list), -1
+        )
+        modules = place_codewords(final_codewords, cls.placement_map(width, height), width * height)
+        apply_mask(modules, cls.mask_plane(width, height), width)
+        return pack_rows(modules, width, height)
+
+    @classmethod
+    def placement_map(cls, width, height):
+        """Returns the positions of the modules in the encoding region in placement order.
+
+        The i-th bit of the final codeword sequence is placed at the i-th position, and the
+        remainder bits follow the codewords. The positions depend only on the size, so the
+        map is computed at the first call for each size and cached.
+
+        Args:
+            width (int): The width.
+            height (int): The height.
+
+        Returns:
+            array.array: The linear indices `y * width + x` of the modules.
+
+        """
+        placement_map = cls._placement_maps.get((width, height))
+        if placement_map is None:
+            core = cls(width, height)
+            core.put_function_patterns()
+            core.put_format_information(0)
+            placement_map = array("H", core._walk_encoding_region())
+            cls._placement_maps[(width, height)] = placement_map
+        return placement_map
+
+    def _walk_encoding_region(self):
+        """Walks the encoding region.
+
+        This method walks the modules which are not yet defined, two columns at a time
+        from right to left, upward and downward alternately.
+
+        Yields:
+            int: The linear index `y * width + x` of the module.
 
         """
         dy = -1  # Up
-        current_codeword_idx = 0
-        current_bit_idx = 0
         cx, cy = self._width - 2, self._height - 6
-        remaining_remainder_bits = reminder_bits_num
-        mask_area = [[False for i in range(self._width)] for j in range(self._height)]
-
-        while True:
+        while cx > 0:
             for x in [cx, cx - 1]:
-                if self._qr[cy][x] == Color.UNDEFINED:
-                    # Process only empty cell
-                    if current_codeword_idx == len(final_codewords):
-                        # Remainder bits
-                        self._qr[cy][x] = Color.WHITE
-                        mask_area[cy][x] = True
-                        remaining_remainder_bits -= 1
-                    else:
-                        # Codewords
-                        self._qr[cy][x] = (
-                            Color.BLACK
-                            if final_codewords[current_codeword_idx][current_bit_idx] == "1"
-                            else Color.WHITE
-                        )
-                        mask_area[cy][x] = True
-                        current_bit_idx += 1
-                        if current_bit_idx == 8:
-                            current_bit_idx = 0
-                            current_codeword_idx += 1
-
-                    if current_codeword_idx == len(final_codewords) and remaining_remainder_bits == 0:
-                        break
-
-            if current_codeword_idx == len(final_codewords) and remaining_remainder_bits == 0:
-                break
+                if not self._is_defined(x, cy):
+                    yield cy * self._width + x
 
             # Update current coordinates
             if dy < 0 and cy == 1:
@@ -776,60 +1379,133 @@ class rMQRCore:
             else:
                 cy += dy
 
-        return mask_area
+    @classmethod
+    def mask_plane(cls, width, height):
+        """Returns the data mask of the encoding region as packed rows.
+
+        Args:
+            width (int): The width.
+            height (int): The height.
+
+        Returns:
+            tuple: The integers for each row. The bit `width - 1 - x` of the y-th integer is 1
+                if the module at (x, y) is in the encoding region and is flipped by the data mask.
 
-    def _apply_mask(self, mask_area):
-        """Data masking.
+        """
+        return cls._mask_patterns(width, height)[1]
 
-        This method applies the data mask.
+    @classmethod
+    def _placement_bits(cls, width, height):
+        """Returns the cached placement map in the form of the packed rows.
 
         Args:
-            mask_area (list): A two-dimensional list shows where encoding region.
-                This is computed by self._put_data().
+            width (int): The width.
+            height (int): The height.
+
+        Returns:
+            tuple: (ys, bits). The i-th module in the placement map is the bit bits[i]
+                of the ys[i]-th packed row.
+
+        """
+        placement_bits = cls._placement_bits_cache.get((width, height))
+        if placement_bits is None:
+            ys = []
+            bits = []
+            for index in cls.placement_map(width, height):
+                y, x = divmod(index, width)
+                ys.append(y)
+                bits.append(1 << (width - 1 - x))
+            placement_bits = (tuple(ys), tuple(bits))
+            cls._placement_bits_cache[(width, height)] = placement_bits
+        return placement_bits
+
+    @classmethod
+    def _mask_patterns(cls, width, height):
+        """Returns the cached data mask patterns.
+
+        The data mask is fixed and the encoding region depends only on the size. So the
+        patterns are computed at the first call for each size and cached.
+
+        Args:
+            width (int): The width.
+            height (int): The height.
+
+        Returns:
+            tuple: (mask stream, mask plane). The mask stream is an integer whose i-th bit
+                from the most significant side is the mask of the i-th module in the placement
+                map. The mask plane is the same as rMQRCore.mask_plane().
+
+        """
+        patterns = cls._mask_patterns_cache.get((width, height))
+        if patterns is None:
+            stream = 0
+            plane = [0] * height
+            for index in cls.placement_map(width, height):
+                y, x = divmod(index, width)
+                bit = 1 if mask(x, y) else 0
+                stream = stream << 1 | bit
+                plane[y] |= bit << (width - 1 - x)
+            patterns = (stream, tuple(plane))
+            cls._mask_patterns_cache[(width, height)] = patterns
+        return patterns
+
+    def _put_final_codewords(self, final_codewords, reminder_bits_num):
+        """Puts the final codeword sequence with the data mask.
+
+        This method puts the final codeword sequence and the remainder bits into the encoding
+        region of the rMQR Code along the cached placement map. The data mask is applied as one
+        xor of the whole bit sequence with the cached mask stream before the placement.
+        The `final_codewords` is computed by self._make_final_codewords method.
+
+        The encoding region is filled by this method, so all modules are defined after it.
+
+        Args:
+            final_codewords (bytearray): The final codeword sequence.
+            reminder_bits_num (int): The number of modules without data.
 
         Returns:
             void
 
         """
-        for y in range(self._height):
-            for x in range(self._width):
-                if not mask_area[y][x]:
-                    continue
-                if mask(x, y):
-                    if self._qr[y][x] == Color.BLACK:
-                        self._qr[y][x] = Color.WHITE
-                    elif self._qr[y][x] == Color.WHITE:
-                        self._qr[y][x] = Color.BLACK
+        mask_stream = rMQRCore._mask_patterns(self._width, self._height)[0]
+
+        # The remainder bits are 0 before masking.
+        length = len(final_codewords) * 8 + reminder_bits_num
+        masked = (int.from_bytes(final_codewords, "big") << reminder_bits_num) ^ mask_stream
+        padding = -length % 8
+        masked_bytes = (masked << padding).to_bytes((length + padding) // 8, "big")
+
+        # The modules in the encoding region are light in the function patterns template,
+        # so only the dark modules are put. The padding bits are 0 and never put.
+        ys, bits = rMQRCore._placement_bits(self._width, self._height)
+        data_rows = [0] * self._height
+        i = 0
+        for byte in masked_bytes:
+            if byte:
+                for offset in range(8):
+                    if byte & (0x80 >> offset):
+                        data_rows[ys[i + offset]] |= bits[i + offset]
+            i += 8
+        self.put_data_rows(data_rows)
 
     def __str__(self, with_quiet_zone=True):
-        show = {
-            Color.WHITE: "_",
-            Color.BLACK: "X",
-            Color.UNDEFINED: "?",
-            True: "X",
-            False: "_",
-        }
+        quiet_zone = "_" * QUIET_ZONE_MODULES if with_quiet_zone else ""
+        row_format = f"0{self._width}b"
+        full = (1 << self._width) - 1
 
         res = ""
         if with_quiet_zone:
-            res += (show[False] * (self._width + QUIET_ZONE_MODULES * 2) + "\n") * QUIET_ZONE_MODULES
-
-        for y in range(self._height):
-            if with_quiet_zone:
-                res += show[False] * QUIET_ZONE_MODULES
-
-            for x in range(self._width):
-                if self._qr[y][x] in show:
-                    res += show[self._qr[y][x]]
-                else:
-                    res += self._qr.get_data[y][x]
+            res += ("_" * (self._width + QUIET_ZONE_MODULES * 2) + "\n") * QUIET_ZONE_MODULES
 
-            if with_quiet_zone:
-                res += show[False] * QUIET_ZONE_MODULES
-            res += "\n"
+        for y, row in enumerate(self._rows):
+            line = format(row, row_format).translate(_MODULE_CHARACTERS)
+            if self._defined is not None and self._defined[y] != full:
+                undefined = format(~self._defined[y] & full, row_format)
+                line = "".join("?" if u == "1" else c for c, u in zip(line, undefined))
+            res += quiet_zone + line + quiet_zone + "\n"
 
         if with_quiet_zone:
-            res += (show[False] * (self._width + QUIET_ZONE_MODULES * 2) + "\n") * QUIET_ZONE_MODULES
+            res += ("_" * (self._width + QUIET_ZONE_MODULES * 2) + "\n") * QUIET_ZONE_MODULES
         return res
 
 
@@ -843,15 +1519,15 @@ class Block:
 
     def __init__(self, data_codewords_num, ecc_codewords_num):
         self._data_codewords_num = data_codewords_num
-        self._data_codewords = []
+        self._data_codewords = b""
         self._ecc_codewords_num = ecc_codewords_num
-        self._ecc_codewords = []
+        self._ecc_codewords = b""
 
     def set_data_and_compute_ecc(self, data_codewords):
         """Set data and compute ecc.
 
         Args:
-            data_codewords (list): The list of codeword strings.
+            data_codewords (bytes): The data codewords.
 
         Returns:
             void
@@ -860,6 +1536,20 @@ class Block:
         self._data_codewords = data_codewords
         self._compute_ecc_codewords()
 
+    def set_data_and_ecc(self, data_codewords, ecc_codewords):
+        """Set data and the ecc computed in advance.
+
+        Args:
+            data_codewords (bytes): The data codewords.
+            ecc_codewords (bytes): The ecc codewords.
+
+        Returns:
+            void
+
+        """
+        self._data_codewords = data_codewords
+        self._ecc_codewords = ecc_codewords
+
     def get_data_at(self, index):
         """Get data codeword at the index.
 
@@ -867,7 +1557,7 @@ class Block:
             index (int): The index.
 
         Return:
-            str: The data codeword.
+            int: The data codeword.
 
         """
         return self._data_codewords[index]
@@ -879,7 +1569,7 @@ class Block:
             index (int): The index.
 
         Return:
-            str: The ecc codeword.
+            int: The ecc codeword.
 
         """
         return self._ecc_codewords[index]
@@ -1,4 +1,8 @@
+import threading
+from array import array
+
 from . import encoder
+from .encoder.character_classes import ALPHANUMERIC, KANJI, NUMERIC, CharacterClasses
 from .errors import DataTooLongError
 from .format.rmqr_versions import rMQRVersions
 
@@ -9,6 +13,9 @@ encoders = [
     encoder.KanjiEncoder,
 ]
 
+# The list of modes (indices of encoders) for each bitmask of character classes.
+_MODES_BY_MASK = [[mode for mode in range(len(encoders)) if mask >> mode & 1] for mask in range(1 << len(encoders))]
+
 
 def compute_length(segments, version_name):
     """Computes the sum of length of the segments.
@@ -31,9 +38,69 @@ def compute_length(segments, version_name):
     )
 
 
+class LengthBounds:
+    """A class for computing a cheap lower bound of the optimized encoded length.
+
+    The bound is computed without the dynamic programming. Every character costs at least
+    the cheapest per character length among the encoding modes can encode it, that is
+    10/3 bits in the Numeric mode, 11/2 bits in the Alphanumeric mode, 8 bits per byte of
+    UTF-8 in the Byte mode and 13 bits in the Kanji mode. Also at least one mode indicator
+    and character count indicator are needed. The per character part does not depend on
+    the version, so it is computed once.
+
+    """
+
+    # Per character lengths multiplied by 6 to keep them integers.
+    _NUMERIC_LENGTH_6 = 20
+    _ALPHANUMERIC_LENGTH_6 = 33
+    _BYTE_LENGTH_6 = 48
+    _KANJI_LENGTH_6 = 78
+
+    def __init__(self, character_classes):
+        """Computes the per character part of the bound.
+
+        Args:
+            character_classes (rmqrcode.encoder.character_classes.CharacterClasses): The classified data.
+
+        """
+        total = 0
+        for mask, byte_length in zip(character_classes.masks, character_classes.byte_lengths):
+            if mask & NUMERIC:
+                total += self._NUMERIC_LENGTH_6
+            elif mask & ALPHANUMERIC:
+                total += self._ALPHANUMERIC_LENGTH_6
+            else:
+                length = self._BYTE_LENGTH_6 * byte_length
+                if mask & KANJI:
+                    length = min(length, self._KANJI_LENGTH_6)
+                total += length
+        self._characters_length = -(-total // 6)
+
+    def lower(self, character_count_indicator_length):
+        """Returns the lower bound of the encoded length.
+
+        Args:
+            character_count_indicator_length (dict): The number of bits of character count
+                indicator for each encoder class.
+
+        Returns:
+            int: The lower bound.
+
+        """
+        header_length = min(
+            encoder_class.length("", character_count_indicator_length[encoder_class]) for encoder_class in encoders
+        )
+        return header_length + self._characters_length
+
+
 class SegmentOptimizer:
     """A class for computing optimal segmentation of the given data by dynamic programming.
 
+    The dynamic programming tables are flat arrays indexed by the state index
+    `(n * 4 + mode) * 3 + unfilled_length`. They are sized for the length of the data
+    and grown only when longer data is given, so an instance can be reused. Use
+    SegmentOptimizer.for_current_thread() to get the instance shared in the thread.
+
     Attributes:
         MAX_CHARACTER (int): The maximum characters of the given data.
         INF (int): Large enough value. This is used as initial value of the dynamic programming table.
@@ -43,9 +110,44 @@ class SegmentOptimizer:
     MAX_CHARACTER = 360
     INF = 100000
 
+    _STATES_PER_CHARACTER = 4 * 3
+    _thread_local = threading.local()
+
+    @classmethod
+    def for_current_thread(cls):
+        """Returns the instance shared in the current thread.
+
+        Returns:
+            rmqrcode.segments.SegmentOptimizer: The optimizer.
+
+        """
+        optimizer = getattr(cls._thread_local, "optimizer", None)
+        if optimizer is None:
+            optimizer = cls._thread_local.optimizer = cls()
+        return optimizer
+
     def __init__(self):
-        self.dp = [[[self.INF for n in range(3)] for mode in range(4)] for length in range(self.MAX_CHARACTER + 1)]
-        self.parents = [[[-1 for n in range(3)] for mode in range(4)] for length in range(self.MAX_CHARACTER + 1)]
+        self.dp = array("i")
+        self.parents = array("i")
+        self._initial_dp = array("i")
+
+    def _prepare_tables(self, data):
+        """Resets the dynamic programming tables for the data.
+
+        Args:
+            data (str): The data to encode.
+
+        Returns:
+            void
+
+        """
+        size = (len(data) + 1) * self._STATES_PER_CHARACTER
+        if len(self.dp) < size:
+            self.dp = array("i", [self.INF]) * size
+            self.parents = array("i", [-1]) * size
+            self._initial_dp = array("i", [self.INF]) * size
+        else:
+            memoryview(self.dp)[:size] = memoryview(self._initial_dp)[:size]
 
     def compute(self, data, version, ecc):
         """Computes the optimize segmentation for the given data.
@@ -61,21 +163,50 @@ class SegmentOptimizer:
         Raises:
             rmqrcode.DataTooLongError: If the data is too long to encode.
 
+        """
+        qr_version = rMQRVersions[version]
+        optimized = self.optimize(data, qr_version["character_count_indicator_length"])
+        if optimized["cost"] > qr_version["number_of_data_bits"][ecc]:
+            raise DataTooLongError
+
+        return optimized["segments"]
+
+    def optimize(self, data, character_count_indicator_length, character_classes=None):
+        """Computes the optimize segmentation for the given character count indicator lengths.
+
+        The result depends on the version only through the character count indicator
+        lengths. So the result can be shared by the versions have the same lengths.
+        This method does not check the capacity of the version.
+
+        Args:
+            data (str): The data to encode.
+            character_count_indicator_length (dict): The number of bits of character count
+                indicator for each encoder class.
+            character_classes (rmqrcode.encoder.character_classes.CharacterClasses): The
+                classified data. This is computed from the data if not given.
+
+        Returns:
+            dict: The dict object includes "cost" and "segments". The "cost" is the length
+                of the encoded bits. The "segments" is the list of segments.
+
+        Raises:
+            rmqrcode.DataTooLongError: If the data is too long to encode.
+
         """
         if len(data) > self.MAX_CHARACTER:
             raise DataTooLongError()
 
-        self.qr_version = rMQRVersions[version]
-        self._compute_costs(data)
-        best = self._find_best(data)
-        if best["cost"] > self.qr_version["number_of_data_bits"][ecc]:
-            raise DataTooLongError
+        if character_classes is None:
+            character_classes = CharacterClasses(data)
 
+        self._character_count_indicator_length = character_count_indicator_length
+        self._compute_costs(character_classes)
+        best = self._find_best(data)
         path = self._reconstruct_path(best["index"])
         segments = self._compute_segments(path, data)
-        return segments
+        return {"cost": best["cost"], "segments": segments}
 
-    def _compute_costs(self, data):
+    def _compute_costs(self, character_classes):
         """Computes costs by dynamic programming.
 
         This method computes costs of the dynamic programming table. Define
@@ -84,46 +215,55 @@ class SegmentOptimizer:
         and the remainder bits length is `unfilled_length`.
 
         Args:
-            data (str): The data to encode.
+            character_classes (rmqrcode.encoder.character_classes.CharacterClasses): The classified data.
 
         Returns:
             void
 
         """
+        self._prepare_tables(character_classes.data)
+        dp = self.dp
+        parents = self.parents
+
+        self._header_lengths = []
         for mode in range(len(encoders)):
             encoder_class = encoders[mode]
-            character_count_indicator_length = self.qr_version["character_count_indicator_length"][encoder_class]
-            self.dp[0][mode][0] = encoder_class.length("", character_count_indicator_length)
-            self.parents[0][mode][0] = (0, 0, 0)
-
-        for n in range(0, len(data)):
+            character_count_indicator_length = self._character_count_indicator_length[encoder_class]
+            self._header_lengths.append(encoder_class.length("", character_count_indicator_length))
+            dp[mode * 3] = self._header_lengths[mode]
+            parents[mode * 3] = 0
+
+        for n, (mask, byte_length) in enumerate(zip(character_classes.masks, character_classes.byte_lengths)):
+            valid_modes = _MODES_BY_MASK[mask]
+            base_index = n * self._STATES_PER_CHARACTER
+            next_base_index = base_index + self._STATES_PER_CHARACTER
             for mode in range(4):
                 for unfilled_length in range(3):
-                    if self.dp[n][mode][unfilled_length] == self.INF:
+                    index = base_index + mode * 3 + unfilled_length
+                    current_cost = dp[index]
+                    if current_cost == self.INF:
                         continue
 
-                    for new_mode in range(4):
-                        if not encoders[new_mode].is_valid_characters(data[n]):
-                            continue
-
+                    for new_mode in valid_modes:
                         if new_mode == mode:
                             cost, new_length = self._compute_new_state_without_mode_changing(
-                                data[n], new_mode, unfilled_length
+                                byte_length, new_mode, unfilled_length
                             )
                         else:
                             cost, new_length = self._compute_new_state_with_mode_changing(
-                                data[n], new_mode, unfilled_length
+                                byte_length, new_mode, unfilled_length
                             )
 
-                        if self.dp[n][mode][unfilled_length] + cost < self.dp[n + 1][new_mode][new_length]:
-                            self.dp[n + 1][new_mode][new_length] = self.dp[n][mode][unfilled_length] + cost
-                            self.parents[n + 1][new_mode][new_length] = (n, mode, unfilled_length)
+                        new_index = next_base_index + new_mode * 3 + new_length
+                        if current_cost + cost < dp[new_index]:
+                            dp[new_index] = current_cost + cost
+                            parents[new_index] = index
 
-    def _compute_new_state_without_mode_changing(self, character, new_mode, unfilled_length):
+    def _compute_new_state_without_mode_changing(self, byte_length, new_mode, unfilled_length):
         """Computes the new state values without mode changing.
 
         Args:
-            character (str): The current character. Assume this as one length string.
+            byte_length (int): The length of UTF-8 bytes of the current character.
             new_mode (int): The state of the new mode.
             unfilled_length (int): The state of the current unfilled_length.
 
@@ -140,17 +280,20 @@ class SegmentOptimizer:
             cost = 6 if unfilled_length == 0 else 5
         elif encoder_class == encoder.ByteEncoder:
             new_length = 0
-            cost = 8 * len(character.encode("utf-8"))
+            cost = 8 * byte_length
         elif encoder_class == encoder.KanjiEncoder:
             new_length = 0
             cost = 13
         return (cost, new_length)
 
-    def _compute_new_state_with_mode_changing(self, character, new_mode, unfilled_length):
+    def _compute_new_state_with_mode_changing(self, byte_length, new_mode, unfilled_length):
         """Computes the new state values with mode changing.
 
+        The cost is the length of the mode indicator and the character count indicator
+        of the new segment plus the cost of the current character as the first character.
+
         Args:
-            character (str): The current character. Assume this as one length string.
+            byte_length (int): The length of UTF-8 bytes of the current character.
             new_mode (int): The state of the new mode.
             unfilled_length (int): The state of the current unfilled_length.
 
@@ -158,14 +301,8 @@ class SegmentOptimizer:
             tuple: (cost, new_length).
 
         """
-        encoder_class = encoders[new_mode]
-        character_count_indicator_length = self.qr_version["character_count_indicator_length"][encoder_class]
-        if encoder_class in [encoder.NumericEncoder, encoder.AlphanumericEncoder]:
-            new_length = 1
-        elif encoder_class in [encoder.ByteEncoder, encoder.KanjiEncoder]:
-            new_length = 0
-        cost = encoder_class.length(character, character_count_indicator_length)
-        return (cost, new_length)
+        cost, new_length = self._compute_new_state_without_mode_changing(byte_length, new_mode, 0)
+        return (self._header_lengths[new_mode] + cost, new_length)
 
     def _find_best(self, data):
         """Find the index which has the minimum costs.
@@ -175,16 +312,16 @@ class SegmentOptimizer:
 
         Returns:
             dict: The dict object includes "cost" and "index". The "cost" is the value of minimum cost.
-                The "index" is the index of the dp table as a tuple (n, mode, unfilled_length).
+                The "index" is the state index of the dp table.
 
         """
         best = self.INF
-        best_index = (-1, -1)
-        for mode in range(4):
-            for unfilled_length in range(3):
-                if self.dp[len(data)][mode][unfilled_length] < best:
-                    best = self.dp[len(data)][mode][unfilled_length]
-                    best_index = (len(data), mode, unfilled_length)
+        best_index = -1
+        base_index = len(data) * self._STATES_PER_CHARACTER
+        for index in range(base_index, base_index + self._STATES_PER_CHARACTER):
+            if self.dp[index] < best:
+                best = self.dp[index]
+                best_index = index
         return {"cost": best, "index": best_index}
 
     def _reconstruct_path(self, best_index):
@@ -194,14 +331,14 @@ class SegmentOptimizer:
             best_index: The best index computed by self._find_best().
 
         Returns:
-            list: The path of minimum cost in the dynamic programming table.
+            list: The path of minimum cost in the dynamic programming table as state indices.
 
         """
         path = []
         index = best_index
-        while index[0] != 0:
+        while index >= self._STATES_PER_CHARACTER:
             path.append(index)
-            index = self.parents[index[0]][index[1]][index[2]]
+            index = self.parents[index]
         path.reverse()
         return path
 
@@ -221,16 +358,18 @@ class SegmentOptimizer:
         segments = []
         current_segment_data = ""
         current_mode = -1
-        for p in path:
+        for index in path:
+            n, state = divmod(index, self._STATES_PER_CHARACTER)
+            mode = state // 3
             if current_mode == -1:
-                current_mode = p[1]
-                current_segment_data += data[p[0] - 1]
-            elif current_mode == p[1]:
-                current_segment_data += data[p[0] - 1]
+                current_mode = mode
+                current_segment_data += data[n - 1]
+            elif current_mode == mode:
+                current_segment_data += data[n - 1]
             else:
                 segments.append({"data": current_segment_data, "encoder_class": encoders[current_mode]})
-                current_segment_data = data[p[0] - 1]
-                current_mode = p[1]
+                current_segment_data = data[n - 1]
+                current_mode = mode
         if current_mode != -1:
             segments.append({"data": current_segment_data, "encoder_class": encoders[current_mode]})
         return segments
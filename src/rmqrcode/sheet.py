@@ -0,0 +1,390 @@
+"""Vector sheet output of many rMQR Codes for printing.
+
+The symbols are placed on the pages by SheetLayout and drawn as merged filled
+rectangles (see rmqrcode.util.rectangles). The writers stream the document page by
+page: the drawing operators of the current page are kept in memory until the page
+is full, and then the page is written into the binary stream.
+
+Example:
+    >>> layout = SheetLayout(pitch_x=50, pitch_y=30, module_size=0.5)
+    >>> with open("labels.pdf", "wb") as f, PDFSheetWriter(f, layout) as writer:
+    ...     for data in labels:
+    ...         writer.add(rMQR.fit(data))
+
+"""
+
+import zlib
+from abc import ABCMeta, abstractmethod
+
+from .rmqrcode import QUIET_ZONE_MODULES
+from .util.rectangles import rectangles
+
+# Points per millimeter.
+POINTS_PER_MM = 72 / 25.4
+
+
+def _number(value):
+    """Formats the number for PDF and PostScript.
+
+    Args:
+        value (float): The number.
+
+    Returns:
+        str: The number with at most 4 decimal places.
+
+    """
+    return f"{value:.4f}".rstrip("0").rstrip(".")
+
+
+class SheetLayout:
+    """A class represents the layout of the labels on the pages.
+
+    The labels are placed in a grid from the top left corner of the page, row by row.
+    All lengths are in millimeters. Each symbol including the quiet zone is drawn at
+    the top left corner of its label.
+
+    Args:
+        page_width (float): The width of the page. A4 by default.
+        page_height (float): The height of the page. A4 by default.
+        margin_left (float): The distance from the left edge of the page to the first column.
+        margin_top (float): The distance from the top edge of the page to the first row.
+        pitch_x (float): The distance between the left edges of adjacent labels.
+        pitch_y (float): The distance between the top edges of adjacent labels.
+        module_size (float): The size of a module.
+        columns (int): The number of columns. If None, as many columns as fit between the margins.
+        rows (int): The number of rows. If None, as many rows as fit between the margins.
+
+    Raises:
+        ValueError: If a length, columns or rows is not positive.
+
+    """
+
+    def __init__(
+        self,
+        page_width=210.0,
+        page_height=297.0,
+        margin_left=10.0,
+        margin_top=10.0,
+        pitch_x=50.0,
+        pitch_y=30.0,
+        module_size=0.5,
+        columns=None,
+        rows=None,
+    ):
+        if min(page_width, page_height, pitch_x, pitch_y, module_size) <= 0:
+            raise ValueError("The page size, the pitch and the module size must be positive.")
+        if (columns is not None and columns < 1) or (rows is not None and rows < 1):
+            raise ValueError("The columns and the rows must be positive.")
+        self.page_width = page_width
+        self.page_height = page_height
+        self.margin_left = margin_left
+        self.margin_top = margin_top
+        self.pitch_x = pitch_x
+        self.pitch_y = pitch_y
+        self.module_size = module_size
+        # The margins are assumed to be the same on both sides.
+        if columns is None:
+            columns = max(1, int((page_width - margin_left * 2) / pitch_x + 1e-9))
+        if rows is None:
+            rows = max(1, int((page_height - margin_top * 2) / pitch_y + 1e-9))
+        self.columns = columns
+        self.rows = rows
+
+    @property
+    def labels_per_page(self):
+        return self.columns * self.rows
+
+    def check_symbol(self, qr):
+        """Checks whether the symbol including the quiet zone fits in a label.
+
+        Args:
+            qr (rmqrcode.rMQR): The rMQR Code.
+
+        Returns:
+            void
+
+        Raises:
+            ValueError: If the symbol is wider than pitch_x or taller than pitch_y.
+
+        """
+        width = (qr.width() + QUIET_ZONE_MODULES * 2) * self.module_size
+        height = (qr.height() + QUIET_ZONE_MODULES * 2) * self.module_size
+        if width > self.pitch_x + 1e-9 or height > self.pitch_y + 1e-9:
+            raise ValueError(
+                f"The symbol {qr.version_name()} is {_number(width)} x {_number(height)} mm including the quiet zone, "
+                f"which does not fit in the pitch {_number(self.pitch_x)} x {_number(self.pitch_y)} mm."
+            )
+
+    def position(self, index):
+        """Returns the position of the label.
+
+        Args:
+            index (int): The index of the label in the whole document.
+
+        Returns:
+            tuple: (page index, x, y). x and y are the distances of the top left corner
+                of the label from the left and the top edges of the page.
+
+        """
+        page, index_in_page = divmod(index, self.labels_per_page)
+        row, column = divmod(index_in_page, self.columns)
+        return (page, self.margin_left + column * self.pitch_x, self.margin_top + row * self.pitch_y)
+
+
+class SheetWriter(metaclass=ABCMeta):
+    """A base class of the sheet writers.
+
+    Args:
+        stream (io.RawIOBase): The binary stream to write into.
+        layout (SheetLayout): The layout.
+
+    """
+
+    def __init__(self, stream, layout):
+        self._stream = stream
+        self._layout = layout
+        self._offset = 0
+        self._count = 0
+        self._page_index = -1
+        self._page_operators = []
+        self._closed = False
+        self._begin_document()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def add(self, qr):
+        """Draws the rMQR Code on the next label.
+
+        A page is written into the stream when the next page begins.
+
+        Args:
+            qr (rmqrcode.rMQR): The rMQR Code.
+
+        Returns:
+            void
+
+        Raises:
+            ValueError: If the symbol does not fit in a label.
+
+        """
+        self._layout.check_symbol(qr)
+        page_index, x, y = self._layout.position(self._count)
+        if page_index != self._page_index:
+            if self._page_index >= 0:
+                self._flush_page()
+            self._page_index = page_index
+            self._page_operators = []
+        self._page_operators.append(self._symbol_operators(qr, x, y))
+        self._count += 1
+
+    def close(self):
+        """Writes the last page and finishes the document.
+
+        The stream is not closed.
+
+        Returns:
+            void
+
+        """
+        if self._closed:
+            return
+        if self._page_index >= 0:
+            self._flush_page()
+        self._end_document()
+        self._closed = True
+
+    def _write(self, data):
+        self._stream.write(data)
+        self._offset += len(data)
+
+    def _flush_page(self):
+        self._write_page("".join(self._page_operators).encode("ascii"))
+        self._page_operators = []
+
+    def _symbol_operators(self, qr, x, y):
+        """Returns the drawing operators of the symbol.
+
+        Args:
+            qr (rmqrcode.rMQR): The rMQR Code.
+            x (float): The distance of the left edge of the label from the left edge of the page in mm.
+            y (float): The distance of the top edge of the label from the top edge of the page in mm.
+
+        Returns:
+            str: The operators.
+
+        """
+        # The coordinate system is transformed so that the unit is a module and the origin
+        # is the top left corner of the symbol, with the y axis downward.
+        scale = _number(self._layout.module_size * POINTS_PER_MM)
+        left = _number(x * POINTS_PER_MM)
+        top = _number((self._layout.page_height - y) * POINTS_PER_MM)
+        res = [self._begin_symbol(scale, left, top)]
+        for rx, ry, w, h in rectangles(qr.packed_rows(), qr.width()):
+            res.append(self._rectangle(rx + QUIET_ZONE_MODULES, ry + QUIET_ZONE_MODULES, w, h))
+        res.append(self._end_symbol())
+        return "".join(res)
+
+    @abstractmethod
+    def _begin_document(self):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def _write_page(self, content):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def _end_document(self):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def _begin_symbol(self, scale, left, top):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def _rectangle(self, x, y, w, h):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def _end_symbol(self):
+        raise NotImplementedError()
+
+
+class PDFSheetWriter(SheetWriter):
+    """A class to write the rMQR Codes into a PDF document.
+
+    Each page consists of a content stream object and a page object. Only the offsets
+    of the objects and the page object numbers are kept until the document is finished.
+
+    Args:
+        stream (io.RawIOBase): The binary stream to write into.
+        layout (SheetLayout): The layout.
+        compress (bool): Flag to select whether compress the content streams.
+
+    """
+
+    # The object numbers of the catalog and the page tree. The page tree is written last.
+    _CATALOG = 1
+    _PAGES = 2
+
+    def __init__(self, stream, layout, compress=True):
+        self._compress = compress
+        self._object_offsets = {}
+        self._page_objects = []
+        self._next_object = 3
+        super().__init__(stream, layout)
+
+    def _write_object(self, number, body):
+        self._object_offsets[number] = self._offset
+        self._write(f"{number} 0 obj\n".encode("ascii") + body + b"\nendobj\n")
+
+    def _begin_document(self):
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._write_object(self._CATALOG, f"<< /Type /Catalog /Pages {self._PAGES} 0 R >>".encode("ascii"))
+
+    def _write_page(self, content):
+        content_object = self._next_object
+        page_object = self._next_object + 1
+        self._next_object += 2
+
+        if self._compress:
+            content = zlib.compress(content)
+            dictionary = f"<< /Length {len(content)} /Filter /FlateDecode >>"
+        else:
+            dictionary = f"<< /Length {len(content)} >>"
+        self._write_object(content_object, dictionary.encode("ascii") + b"\nstream\n" + content + b"\nendstream")
+
+        media_box = f"[0 0 {_number(self._layout.page_width * POINTS_PER_MM)} "
+        media_box += f"{_number(self._layout.page_height * POINTS_PER_MM)}]"
+        self._write_object(
+            page_object,
+            (
+                f"<< /Type /Page /Parent {self._PAGES} 0 R /MediaBox {media_box} "
+                f"/Resources << >> /Contents {content_object} 0 R >>"
+            ).encode("ascii"),
+        )
+        self._page_objects.append(page_object)
+
+    def _end_document(self):
+        kids = " ".join(f"{number} 0 R" for number in self._page_objects)
+        self._write_object(
+            self._PAGES, f"<< /Type /Pages /Kids [{kids}] /Count {len(self._page_objects)} >>".encode("ascii")
+        )
+
+        xref_offset = self._offset
+        size = self._next_object
+        xref = [f"xref\n0 {size}\n", "0000000000 65535 f \n"]
+        for number in range(1, size):
+            xref.append(f"{self._object_offsets[number]:010d} 00000 n \n")
+        xref.append(f"trailer\n<< /Size {size} /Root {self._CATALOG} 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n")
+        self._write("".join(xref).encode("ascii"))
+
+    def _begin_symbol(self, scale, left, top):
+        return f"q {scale} 0 0 -{scale} {left} {top} cm\n"
+
+    def _rectangle(self, x, y, w, h):
+        return f"{x} {y} {w} {h} re\n"
+
+    def _end_symbol(self):
+        return "f Q\n"
+
+
+class EPSSheetWriter(SheetWriter):
+    """A class to write the rMQR Codes into an EPS file.
+
+    EPS has only one page, so the number of the symbols is limited to
+    SheetLayout.labels_per_page.
+
+    Args:
+        stream (io.RawIOBase): The binary stream to write into.
+        layout (SheetLayout): The layout.
+
+    """
+
+    def add(self, qr):
+        """Draws the rMQR Code on the next label.
+
+        Args:
+            qr (rmqrcode.rMQR): The rMQR Code.
+
+        Returns:
+            void
+
+        Raises:
+            ValueError: If the page is full, or if the symbol does not fit in a label.
+
+        """
+        if self._count >= self._layout.labels_per_page:
+            raise ValueError("EPS has only one page.")
+        super().add(qr)
+
+    def _begin_document(self):
+        width = round(self._layout.page_width * POINTS_PER_MM)
+        height = round(self._layout.page_height * POINTS_PER_MM)
+        self._write(
+            (
+                "%!PS-Adobe-3.0 EPSF-3.0\n"
+                f"%%BoundingBox: 0 0 {width} {height}\n"
+                "%%LanguageLevel: 2\n"
+                "%%Pages: 1\n"
+                "%%EndComments\n"
+            ).encode("ascii")
+        )
+
+    def _write_page(self, content):
+        self._write(b"%%Page: 1 1\n" + content + b"showpage\n")
+
+    def _end_document(self):
+        self._write(b"%%EOF\n")
+
+    def _begin_symbol(self, scale, left, top):
+        return f"gsave {left} {top} translate {scale} -{scale} scale\n"
+
+    def _rectangle(self, x, y, w, h):
+        return f"{x} {y} {w} {h} rectfill\n"
+
+    def _end_symbol(self):
+        return "grestore\n"
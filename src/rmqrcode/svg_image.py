@@ -0,0 +1,81 @@
+import io
+from xml.sax.saxutils import quoteattr
+
+from .rmqrcode import QUIET_ZONE_MODULES
+from .util.rectangles import rectangles
+
+
+class SVGImage:
+    """A class to make an SVG image of the rMQR Code.
+
+    The dark modules are drawn as a single path. Each horizontal run of the dark modules
+    is one rectangle of the path, and the same runs in consecutive rows are merged into
+    one rectangle if merge_rows is True. The coordinates are in modules and the quiet
+    zone is included.
+
+    Args:
+        qr (rmqrcode.rMQR): The rMQR Code.
+        module_size (int): The size of a module in pixels.
+        dark_color (str): The color of the dark modules.
+        light_color (str): The color of the background. The background is transparent if None.
+        merge_rows (bool): Flag to select whether merge the same runs in consecutive rows.
+
+    """
+
+    def __init__(self, qr, module_size=10, dark_color="#000000", light_color="#ffffff", merge_rows=True):
+        self._module_size = module_size
+        self._dark_color = dark_color
+        self._light_color = light_color
+        self._merge_rows = merge_rows
+        self._symbol_width = qr.width()
+        self._rows = qr.packed_rows()
+
+    def write(self, stream):
+        """Writes the SVG image into the text stream.
+
+        The path is written rectangle by rectangle, so no whole document is built in memory.
+
+        Args:
+            stream (io.TextIOBase): The text stream to write into.
+
+        Returns:
+            void
+
+        """
+        width = self._symbol_width + QUIET_ZONE_MODULES * 2
+        height = len(self._rows) + QUIET_ZONE_MODULES * 2
+        stream.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width * self._module_size}" '
+            f'height="{height * self._module_size}" viewBox="0 0 {width} {height}" shape-rendering="crispEdges">\n'
+        )
+        if self._light_color is not None:
+            stream.write(f'<rect width="{width}" height="{height}" fill={quoteattr(self._light_color)}/>\n')
+        stream.write(f'<path fill={quoteattr(self._dark_color)} d="')
+        for x, y, w, h in rectangles(self._rows, self._symbol_width, self._merge_rows):
+            stream.write(f"M{x + QUIET_ZONE_MODULES} {y + QUIET_ZONE_MODULES}h{w}v{h}h-{w}z")
+        stream.write('"/>\n</svg>\n')
+
+    def save(self, name):
+        """Saves the SVG image.
+
+        Args:
+            name (str): The file path.
+
+        Returns:
+            void
+
+        """
+        with open(name, "w", encoding="utf-8") as f:
+            self.write(f)
+
+    def to_string(self):
+        """Returns the SVG image as a string.
+
+        Returns:
+            str: The SVG document.
+
+        """
+        stream = io.StringIO()
+        self.write(stream)
+        return stream.getvalue()
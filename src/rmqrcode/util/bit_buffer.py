@@ -0,0 +1,79 @@
+class BitBuffer:
+    """A class represents a packed sequence of bits.
+
+    Bits are appended from the most significant side. The complete bytes are
+    stored in a bytearray and the remaining bits (less than 8) are kept in an
+    integer accumulator until the next byte is filled.
+
+    Example:
+        >>> buffer = BitBuffer()
+        >>> buffer.append(0b001, 3)
+        >>> buffer.append(0b10011, 5)
+        >>> buffer.to_bytes()
+            bytearray(b'3')
+
+    """
+
+    def __init__(self):
+        self._bytes = bytearray()
+        self._pending = 0
+        self._pending_length = 0
+
+    def append(self, value, length):
+        """Appends the lowest `length` bits of the value.
+
+        Args:
+            value (int): The value to append. This must be less than 2^length.
+            length (int): The number of bits.
+
+        Returns:
+            void
+
+        """
+        pending = self._pending << length | value
+        pending_length = self._pending_length + length
+        while pending_length >= 8:
+            pending_length -= 8
+            self._bytes.append(pending >> pending_length & 0xFF)
+        self._pending = pending & ((1 << pending_length) - 1)
+        self._pending_length = pending_length
+
+    def extend(self, other):
+        """Appends all bits of the other buffer.
+
+        Args:
+            other (BitBuffer): The buffer to append.
+
+        Returns:
+            void
+
+        """
+        if self._pending_length == 0:
+            self._bytes += other._bytes
+        else:
+            for byte in other._bytes:
+                self.append(byte, 8)
+        self.append(other._pending, other._pending_length)
+
+    def to_bytes(self):
+        """Returns the bits as bytes.
+
+        The last byte is padded with 0 bits if the length is not a multiple of 8.
+
+        Returns:
+            bytearray: The packed bits.
+
+        """
+        res = bytearray(self._bytes)
+        if self._pending_length > 0:
+            res.append(self._pending << (8 - self._pending_length))
+        return res
+
+    def __len__(self):
+        return len(self._bytes) * 8 + self._pending_length
+
+    def __str__(self):
+        res = "".join(format(byte, "08b") for byte in self._bytes)
+        if self._pending_length > 0:
+            res += format(self._pending, f"0{self._pending_length}b")
+        return res
@@ -1,5 +1,5 @@
-from .galois_fields import GaloisFields
-from .utilities import msb, to_binary
+from .galois_fields import EXP_TABLE, multiplication_row
+from .utilities import msb
 
 
 def compute_bch(data):
@@ -14,24 +14,118 @@ def compute_bch(data):
     return tmp_data
 
 
-gf = GaloisFields()
+class ReedSolomonEncoder:
+    """A class computes Reed-Solomon error correction codewords for a generator polynomial.
+
+    The remainder of the polynomial division is kept as one integer whose bytes are
+    the coefficients. For each data codeword, the remainder is shifted by one byte and
+    xored with a precomputed row, which is the generator polynomial multiplied by the
+    feedback coefficient. So the division needs only one table lookup per data codeword.
+
+    Attributes:
+        generator (tuple): The exponents of the coefficients of the generator polynomial.
+        ecc_codewords_num (int): The number of error correction codewords.
+
+    """
+
+    def __init__(self, generator):
+        self.generator = tuple(generator)
+        self.ecc_codewords_num = len(generator) - 1
+        coefficients = [EXP_TABLE[e] for e in self.generator[1:]]
+        rows = [multiplication_row(c) for c in coefficients]
+        self._feedback_table = [int.from_bytes(bytes(row[factor] for row in rows), "big") for factor in range(256)]
+
+    def encode(self, data):
+        """Computes the error correction codewords.
+
+        Args:
+            data (bytes): The data codewords.
+
+        Returns:
+            bytes: The error correction codewords.
+
+        """
+        feedback_table = self._feedback_table
+        shift = 8 * (self.ecc_codewords_num - 1)
+        mask = (1 << shift) - 1
+        remainder = 0
+        for codeword in data:
+            remainder = ((remainder & mask) << 8) ^ feedback_table[(remainder >> shift) ^ codeword]
+        return remainder.to_bytes(self.ecc_codewords_num, "big")
+
+    def feedback_table_bytes(self):
+        """Returns the feedback table as bytes.
+
+        Returns:
+            bytes: The concatenation of 256 rows. The i-th row is the generator polynomial
+                (without the leading term) multiplied by i.
+
+        """
+        return b"".join(row.to_bytes(self.ecc_codewords_num, "big") for row in self._feedback_table)
+
+
+_reed_solomon_encoders = {}
+
+
+def get_reed_solomon_encoder(g):
+    """Returns the cached ReedSolomonEncoder for the generator polynomial.
+
+    Args:
+        g (list): The exponents of the coefficients of the generator polynomial.
+
+    Returns:
+        ReedSolomonEncoder: The encoder.
+
+    """
+    key = tuple(g)
+    encoder = _reed_solomon_encoders.get(key)
+    if encoder is None:
+        encoder = _reed_solomon_encoders[key] = ReedSolomonEncoder(key)
+    return encoder
 
 
 def compute_reed_solomon(data, g, num_error_codewords):
-    f = list(map(lambda x: int(x, 2), data))
+    encoder = get_reed_solomon_encoder(g)
+    if encoder.ecc_codewords_num != num_error_codewords:
+        raise ValueError("The degree of the generator polynomial does not match the number of ecc codewords.")
+    return encoder.encode(data)
+
+
+NUMPY_BATCH_THRESHOLD = 32
+
+
+def compute_reed_solomon_batch(data_blocks, g, num_error_codewords):
+    """Computes the error correction codewords of many data blocks.
+
+    The blocks are computed at once by the NumPy backend if NumPy is installed and
+    the batch is large enough. Otherwise each block is computed in pure Python.
+
+    Args:
+        data_blocks (list): The list of data blocks. All blocks have the same length.
+        g (list): The exponents of the coefficients of the generator polynomial.
+        num_error_codewords (int): The number of error correction codewords.
 
-    for i in range(num_error_codewords):
-        f.append(0)
+    Returns:
+        list: The list of the error correction codewords as bytes.
 
-    for i in range(len(data)):
-        if f[i] == 0:
-            continue
-        mult = gf.i2e[f[i]]
-        for j in range(len(g)):
-            f[i + j] ^= gf.e2i[(g[j] + mult) % 255]
+    Raises:
+        ValueError: If the degree of the generator polynomial is not num_error_codewords.
 
-    rs_codewords = []
-    for i in range(num_error_codewords):
-        rs_codewords.append(to_binary(f[-num_error_codewords + i], 8))
+    """
+    if len(g) - 1 != num_error_codewords:
+        raise ValueError("The degree of the generator polynomial does not match the number of ecc codewords.")
+    if len(data_blocks) >= NUMPY_BATCH_THRESHOLD:
+        try:
+            import numpy as np
 
-    return rs_codewords
+            from .numpy_backend import (
+                compute_reed_solomon_batch as compute_reed_solomon_batch_numpy,
+            )
+        except ImportError:
+            pass
+        else:
+            data_array = np.frombuffer(b"".join(data_blocks), dtype=np.uint8).reshape(len(data_blocks), -1)
+            ecc_array = compute_reed_solomon_batch_numpy(data_array, g)
+            return [row.tobytes() for row in ecc_array]
+    encoder = get_reed_solomon_encoder(g)
+    return [encoder.encode(data) for data in data_blocks]
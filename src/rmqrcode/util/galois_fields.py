@@ -1,21 +1,66 @@
-# GF(2^8)
-class GaloisFields:
-    e2i = {}
-    i2e = {}
-
-    def __init__(self):
-        # Irreducible polynomial in GF(2^8)
-        p = (1 << 8) | (1 << 4) | (1 << 3) | (1 << 2) | 1
-
-        self.e2i[0] = 1
-        self.e2i[255] = 1
-        self.i2e[0] = -1
-        self.i2e[1] = 0
-
-        tmp = 1
-        for e in range(1, 255):
-            tmp <<= 1
-            if tmp & (1 << 8):
-                tmp ^= p
-            self.e2i[e] = tmp
-            self.i2e[tmp] = e
+"""Arithmetic in GF(2^8).
+
+The field is generated by the irreducible polynomial x^8 + x^4 + x^3 + x^2 + 1
+with the primitive element alpha = 2.
+
+Attributes:
+    EXP_TABLE (bytes): The antilog table. EXP_TABLE[e] is alpha^e. The table is
+        doubled (512 entries) so that EXP_TABLE[LOG_TABLE[a] + LOG_TABLE[b]] needs no modulo.
+    LOG_TABLE (tuple): The log table. LOG_TABLE[a] is the exponent e such that alpha^e = a.
+        LOG_TABLE[0] is undefined and is set to 0.
+
+"""
+
+IRREDUCIBLE_POLYNOMIAL = (1 << 8) | (1 << 4) | (1 << 3) | (1 << 2) | 1
+
+
+def _make_tables():
+    exp_table = bytearray(512)
+    log_table = [0] * 256
+
+    tmp = 1
+    for e in range(255):
+        exp_table[e] = tmp
+        exp_table[e + 255] = tmp
+        log_table[tmp] = e
+        tmp <<= 1
+        if tmp & (1 << 8):
+            tmp ^= IRREDUCIBLE_POLYNOMIAL
+    exp_table[510] = exp_table[0]
+    exp_table[511] = exp_table[1]
+    return bytes(exp_table), tuple(log_table)
+
+
+EXP_TABLE, LOG_TABLE = _make_tables()
+
+
+def multiply(a, b):
+    """Multiplies two elements.
+
+    Args:
+        a (int): An element of GF(2^8).
+        b (int): An element of GF(2^8).
+
+    Returns:
+        int: The product a * b.
+
+    """
+    if a == 0 or b == 0:
+        return 0
+    return EXP_TABLE[LOG_TABLE[a] + LOG_TABLE[b]]
+
+
+def multiplication_row(a):
+    """Returns the products of the element and every element.
+
+    Args:
+        a (int): An element of GF(2^8).
+
+    Returns:
+        bytes: The lookup row. The i-th byte is a * i.
+
+    """
+    if a == 0:
+        return bytes(256)
+    log_a = LOG_TABLE[a]
+    return bytes([0]) + bytes(EXP_TABLE[log_a + LOG_TABLE[i]] for i in range(1, 256))
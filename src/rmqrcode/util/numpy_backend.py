@@ -0,0 +1,158 @@
+"""Vectorized implementations with NumPy.
+
+This module requires NumPy. Import this module only when NumPy is available.
+The pure Python implementations are used as fallback otherwise.
+
+"""
+
+import numpy as np
+
+from .error_correction import get_reed_solomon_encoder
+
+_feedback_arrays = {}
+
+
+def _feedback_array(g):
+    """Returns the feedback table of the generator polynomial as an array.
+
+    Args:
+        g (list): The exponents of the coefficients of the generator polynomial.
+
+    Returns:
+        numpy.ndarray: The uint8 array with shape (256, number of ecc codewords). The i-th
+            row is the generator polynomial (without the leading term) multiplied by i.
+
+    """
+    key = tuple(g)
+    array = _feedback_arrays.get(key)
+    if array is None:
+        encoder = get_reed_solomon_encoder(key)
+        array = np.frombuffer(encoder.feedback_table_bytes(), dtype=np.uint8).reshape(256, encoder.ecc_codewords_num)
+        _feedback_arrays[key] = array
+    return array
+
+
+def compute_reed_solomon_batch(data_blocks, g):
+    """Computes the error correction codewords of many data blocks at once.
+
+    All blocks are divided by the generator polynomial in lockstep. For each data
+    codeword column, the feedback coefficients of all blocks are gathered from the
+    feedback table in one operation.
+
+    Args:
+        data_blocks (numpy.ndarray): The uint8 array with shape (N, k). Each row is a data block.
+        g (list): The exponents of the coefficients of the generator polynomial.
+
+    Returns:
+        numpy.ndarray: The uint8 array with shape (N, number of ecc codewords).
+
+    """
+    data_blocks = np.asarray(data_blocks, dtype=np.uint8)
+    feedback_array = _feedback_array(g)
+    data_codewords_num = data_blocks.shape[1]
+    ecc_codewords_num = feedback_array.shape[1]
+
+    # Each row is the polynomial of a data block multiplied by x^(ecc_codewords_num).
+    # The division proceeds column by column and leaves the remainders in the last columns.
+    polynomials = np.zeros((data_blocks.shape[0], data_codewords_num + ecc_codewords_num), dtype=np.uint8)
+    polynomials[:, :data_codewords_num] = data_blocks
+    for i in range(data_codewords_num):
+        polynomials[:, i + 1 : i + 1 + ecc_codewords_num] ^= feedback_array[polynomials[:, i]]
+    return polynomials[:, data_codewords_num:]
+
+
+def place_codewords(final_codewords, placement_map, module_count):
+    """Places the final codeword sequences of many symbols.
+
+    Args:
+        final_codewords (numpy.ndarray): The uint8 array with shape (N, number of codewords).
+            Each row is the final codeword sequence of a symbol.
+        placement_map (array.array): The linear indices of the modules in the encoding region
+            in placement order. See rmqrcode.rmqrcode.rMQRCore.placement_map().
+        module_count (int): The number of modules of a symbol, that is width * height.
+
+    Returns:
+        numpy.ndarray: The uint8 array with shape (N, module_count). The value is 1 for the
+            dark data modules and 0 for the others, including the modules outside of the
+            encoding region and the remainder bits.
+
+    """
+    bits = np.unpackbits(np.asarray(final_codewords, dtype=np.uint8), axis=1)
+    indices = np.frombuffer(placement_map, dtype=np.uint16)[: bits.shape[1]]
+    modules = np.zeros((bits.shape[0], module_count), dtype=np.uint8)
+    modules[:, indices] = bits
+    return modules
+
+
+def pack_rows(modules, width, height):
+    """Packs the modules of many symbols into rows of integers.
+
+    Args:
+        modules (numpy.ndarray): The uint8 array with shape (N, width * height) computed by
+            place_codewords().
+        width (int): The width.
+        height (int): The height.
+
+    Returns:
+        list: The list of the packed rows of each symbol. The bit `width - 1 - x` of the
+            y-th integer is 1 if the module at (x, y) is 1. See rmqrcode.rmqrcode.rMQRCore.rows().
+
+    """
+    packed = np.packbits(modules.reshape(-1, height, width), axis=2).tobytes()
+    stride = (width + 7) // 8
+    padding = stride * 8 - width
+    rows = [int.from_bytes(packed[i : i + stride], "big") >> padding for i in range(0, len(packed), stride)]
+    return [rows[i : i + height] for i in range(0, len(rows), height)]
+
+
+_mask_arrays = {}
+
+
+def apply_mask(modules, mask_plane, width):
+    """Applies the data mask to the modules of many symbols in place.
+
+    Args:
+        modules (numpy.ndarray): The uint8 array with shape (N, width * height) computed by
+            place_codewords().
+        mask_plane (tuple): The mask plane as packed rows. See rmqrcode.rmqrcode.rMQRCore.mask_plane().
+        width (int): The width.
+
+    Returns:
+        void
+
+    """
+    key = (width, len(mask_plane))
+    mask_array = _mask_arrays.get(key)
+    if mask_array is None:
+        row_bytes = (width + 7) // 8
+        packed = np.frombuffer(
+            b"".join((row << (row_bytes * 8 - width)).to_bytes(row_bytes, "big") for row in mask_plane),
+            dtype=np.uint8,
+        ).reshape(len(mask_plane), row_bytes)
+        mask_array = np.unpackbits(packed, axis=1)[:, :width].reshape(-1)
+        _mask_arrays[key] = mask_array
+    modules ^= mask_array
+
+
+def unpack_modules(packed, height, width, dtype=None):
+    """Unpacks the modules packed 1 bit per module into an array.
+
+    Args:
+        packed (bytes): The packed modules. See rmqrcode.rmqrcode.rMQRCore.to_packed_bytes().
+        height (int): The number of rows.
+        width (int): The number of modules in a row.
+        dtype (numpy.dtype): The data type of the array. The default is numpy.uint8.
+
+    Returns:
+        numpy.ndarray: The array with shape (height, width). The value is 1 for the dark module.
+
+    """
+    stride = (width + 7) // 8
+    modules = np.unpackbits(np.frombuffer(packed, dtype=np.uint8).reshape(height, stride), axis=1, count=width)
+    if dtype is None:
+        return modules
+    dtype = np.dtype(dtype)
+    if dtype == np.bool_:
+        # The values are 0 or 1, so the same memory is valid as bool.
+        return modules.view(np.bool_)
+    return modules.astype(dtype, copy=False)
@@ -0,0 +1,63 @@
+"""Rasterization of the packed rows into scaled pixel lines.
+
+The raster writers stream an image line by line. A row of modules is scaled up
+horizontally to a line of pixels once, and the writer repeats the line module_size
+times for the vertical scaling.
+
+The rows are packed as in rmqrcode.rmqrcode.rMQRCore.rows(): the bit `width - 1 - x`
+of a row is 1 if the module at x-th column is dark.
+
+"""
+
+
+def scaled_lines(rows, width, module_size=1, quiet_zone_modules=0, bits_per_pixel=1, dark=1, light=0):
+    """Yields the pixel lines for each row of modules including the quiet zone.
+
+    If bits_per_pixel is 1, the pixels are packed from the most significant bit and
+    the line is padded with 0 bits to a multiple of 8. If bits_per_pixel is 8, each
+    pixel takes 1 byte.
+
+    Args:
+        rows (list): The packed rows from top to bottom.
+        width (int): The number of modules in a row.
+        module_size (int): The size of a module in pixels.
+        quiet_zone_modules (int): The width of the quiet zone in modules.
+        bits_per_pixel (int): 1 or 8.
+        dark (int): The pixel value of the dark modules.
+        light (int): The pixel value of the light modules and the quiet zone.
+
+    Yields:
+        bytes: The pixel line of a row of modules. The lines are yielded for the rows of
+            the quiet zone too, so height + quiet_zone_modules * 2 lines are yielded.
+
+    Raises:
+        ValueError: If bits_per_pixel is neither 1 nor 8.
+
+    """
+    total_width = width + quiet_zone_modules * 2
+    row_format = f"0{total_width}b"
+    if bits_per_pixel == 1:
+        scale = str.maketrans({"0": str(light) * module_size, "1": str(dark) * module_size})
+        line_bytes = (total_width * module_size + 7) // 8
+        padding = line_bytes * 8 - total_width * module_size
+
+        def to_line(row):
+            pixels = int(format(row << quiet_zone_modules, row_format).translate(scale), 2)
+            return (pixels << padding).to_bytes(line_bytes, "big")
+
+    elif bits_per_pixel == 8:
+        scale = str.maketrans({"0": chr(light) * module_size, "1": chr(dark) * module_size})
+
+        def to_line(row):
+            return format(row << quiet_zone_modules, row_format).translate(scale).encode("latin-1")
+
+    else:
+        raise ValueError("bits_per_pixel must be 1 or 8")
+
+    light_line = to_line(0)
+    for _ in range(quiet_zone_modules):
+        yield light_line
+    for row in rows:
+        yield to_line(row)
+    for _ in range(quiet_zone_modules):
+        yield light_line
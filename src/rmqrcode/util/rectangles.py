@@ -0,0 +1,64 @@
+"""Decomposition of the dark modules into rectangles.
+
+The vector writers draw a symbol as filled rectangles. The horizontal runs of the
+dark modules in each row are merged into single rectangles, and optionally the
+same runs in consecutive rows are merged into taller rectangles.
+
+The rows are packed as in rmqrcode.rmqrcode.rMQRCore.rows(): the bit `width - 1 - x`
+of a row is 1 if the module at x-th column is dark.
+
+"""
+
+import re
+
+_RUN_PATTERN = re.compile("1+")
+
+
+def horizontal_runs(row, width):
+    """Returns the runs of the dark modules in a packed row.
+
+    Args:
+        row (int): The packed row.
+        width (int): The number of modules in the row.
+
+    Returns:
+        list: The list of (x, length) tuples from left to right.
+
+    """
+    return [(m.start(), m.end() - m.start()) for m in _RUN_PATTERN.finditer(format(row, f"0{width}b"))]
+
+
+def rectangles(rows, width, merge_rows=True):
+    """Yields the rectangles which cover the dark modules exactly.
+
+    Args:
+        rows (list): The packed rows from top to bottom.
+        width (int): The number of modules in a row.
+        merge_rows (bool): Flag to select whether merge the same runs in consecutive rows.
+
+    Yields:
+        tuple: (x, y, width, height) of a rectangle in modules. The rectangles are yielded
+            when they are closed, so a rectangle is yielded after all rectangles above
+            its bottom edge.
+
+    """
+    if not merge_rows:
+        for y, row in enumerate(rows):
+            for x, length in horizontal_runs(row, width):
+                yield (x, y, length, 1)
+        return
+
+    # The open rectangles: (x, length) -> top y.
+    opened = {}
+    y = 0
+    for y, row in enumerate(rows):
+        runs = horizontal_runs(row, width)
+        current = set(runs)
+        for run in [run for run in opened if run not in current]:
+            top = opened.pop(run)
+            yield (run[0], top, run[1], y - top)
+        for run in runs:
+            if run not in opened:
+                opened[run] = y
+    for run, top in opened.items():
+        yield (run[0], top, run[1], y + 1 - top)
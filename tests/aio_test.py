@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from rmqrcode import DataTooLongError, ErrorCorrectionLevel, IllegalVersionError, rMQR
+from rmqrcode.aio import Offloader
+from rmqrcode.batch import encode_image
+
+
+class TestAio:
+    def test_fit_make_render(self):
+        async def run():
+            offloader = Offloader(max_concurrency=2)
+            qr = await offloader.fit("https://oudon.xyz", ecc=ErrorCorrectionLevel.H)
+            made = await offloader.make("https://oudon.xyz", "R13x43")
+            png = await offloader.render(qr, "png", module_size=2)
+            with pytest.raises(IllegalVersionError):
+                await offloader.make("abc", "R1x1")
+            return qr, made, png
+
+        qr, made, png = asyncio.run(run())
+        expected = rMQR.fit("https://oudon.xyz", ecc=ErrorCorrectionLevel.H)
+        assert qr.to_list() == expected.to_list()
+        assert made.version_name() == "R13x43"
+        assert png == encode_image(expected, "png", module_size=2)
+
+    @pytest.mark.parametrize("max_concurrency", [0, -1])
+    def test_invalid_max_concurrency(self, max_concurrency):
+        with pytest.raises(ValueError):
+            Offloader(max_concurrency=max_concurrency)
+
+    def test_fit_many(self):
+        async def data():
+            for item in ["a", "b" * 400, "c"]:
+                yield item
+
+        async def run():
+            offloader = Offloader(max_concurrency=2)
+            results = [result async for result in offloader.fit_many(data(), return_exceptions=True)]
+            with pytest.raises(DataTooLongError):
+                async for _ in offloader.fit_many(["a", "b" * 400]):
+                    pass
+            return results
+
+        results = asyncio.run(run())
+        assert results[0].to_list() == rMQR.fit("a").to_list()
+        assert isinstance(results[1], DataTooLongError)
+        assert results[2].to_list() == rMQR.fit("c").to_list()
+
+    def test_backpressure_and_limit(self):
+        state = {"read": 0, "running": 0, "peak": 0}
+        lock = threading.Lock()
+
+        def data():
+            for i in range(20):
+                state["read"] += 1
+                yield i
+
+        def work(item):
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.005)
+            with lock:
+                state["running"] -= 1
+            return item
+
+        async def run():
+            offloader = Offloader(max_concurrency=3)
+            results = []
+            async for result in offloader.map(work, data()):
+                # The slow consumer holds the reading back.
+                assert state["read"] <= len(results) + 1 + 3
+                await asyncio.sleep(0.01)
+                results.append(result)
+            return results
+
+        assert asyncio.run(run()) == list(range(20))
+        assert state["peak"] <= 3
+
+    def test_process_executor(self):
+        async def run(executor):
+            offloader = Offloader(executor, max_concurrency=2)
+            return [png async for png in offloader.make_many(["a", "b"], "R7x43", render="svg")]
+
+        with ProcessPoolExecutor(1) as executor:
+            results = asyncio.run(run(executor))
+        assert results == [encode_image(rMQR.fit(data), "svg") for data in ["a", "b"]]
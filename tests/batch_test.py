@@ -0,0 +1,202 @@
+import io
+import subprocess
+import sys
+import tarfile
+import zipfile
+
+import pytest
+from PIL import Image
+
+from rmqrcode import DataTooLongError, IllegalVersionError, rMQR
+from rmqrcode.batch import (
+    DirectoryWriter,
+    RecordError,
+    archive_format,
+    archive_writer,
+    check_name,
+    check_template,
+    make_qr,
+    output_name,
+    process_records,
+    read_records,
+    render,
+)
+
+
+class TestBatch:
+    def test_read_records_text(self):
+        records = list(read_records(["abc\n", "\n", "def\n"], defaults={"ecc": "H"}))
+        assert records == [
+            {"data": "abc", "ecc": "H", "index": 0, "line": 1},
+            {"data": "def", "ecc": "H", "index": 1, "line": 3},
+        ]
+
+    def test_read_records_jsonl(self):
+        lines = ['{"data": "abc", "ecc": "H"}', "{bad", '{"output": "a.png"}']
+        records = list(read_records(lines, "jsonl", defaults={"ecc": "M"}))
+        assert records[0] == {"data": "abc", "ecc": "H", "index": 0, "line": 1}
+        assert isinstance(records[1], RecordError) and records[1].line == 2
+        assert isinstance(records[2], RecordError) and records[2].line == 3
+
+    def test_output_name(self):
+        assert output_name({"index": 3}, "{version}/{index:03d}.svg", "R7x43") == "R7x43/003.svg"
+        assert output_name({"index": 3, "output": "a.png"}, "{index}.svg", "R7x43") == "a.png"
+
+    @pytest.mark.parametrize("name", ["a.png", "a.pgm", "a.bmp"])
+    def test_render(self, name):
+        qr = rMQR.fit("https://oudon.xyz")
+        img = Image.open(io.BytesIO(render(qr, name, module_size=2)))
+        assert img.size == (qr.width() * 2 + 8, qr.height() * 2 + 8)
+
+    def test_process_records(self):
+        records = list(
+            read_records(
+                ['{"data": "abc"}', '{"data": "abc", "ecc": "Q"}', '{"data": "abc", "version": "R1x1"}', "{bad"]
+                + ['{"data": "%s", "version": "R7x43"}' % ("a" * 100)],
+                "jsonl",
+            )
+        )
+        results = process_records(records, template="{index}.svg")
+        assert results[0][0] == "0.svg" and b"<svg" in results[0][1]
+        assert isinstance(results[1], RecordError) and results[1].line == 2
+        assert isinstance(results[2], IllegalVersionError) and results[2].line == 3
+        assert isinstance(results[3], RecordError) and results[3].line == 4
+        assert isinstance(results[4], DataTooLongError) and results[4].line == 5
+
+    @pytest.mark.parametrize("jobs", ["1", "2"])
+    def test_console_batch(self, tmp_path, jobs):
+        res = subprocess.run(
+            [sys.executable, "-m", "rmqrcode.console", "--batch", "-", "--output-dir", str(tmp_path), "--jobs", jobs],
+            input="abc\n" + "a" * 400 + "\ndef\n",
+            capture_output=True,
+            text=True,
+        )
+        assert res.returncode == 1
+        assert "Error: line 2: The data is too long." in res.stderr
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["000000.png", "000002.png"]
+
+    @pytest.mark.parametrize(
+        "line",
+        [
+            '{"data": "\\ud800"}',
+            '{"data": "abc", "output": 1}',
+            '{"data": "abc", "version": ["R7x43"]}',
+            '{"data": "abc", "ecc": {"M": 1}}',
+            '{"data": "abc", "fit_strategy": []}',
+            '{"data": "abc", "output": "a.bogusfmt"}',
+            '{"data": "abc", "output": "a"}',
+            '{"data": "abc", "output": "../a.png"}',
+            '{"data": "abc", "output": "/tmp/a.png"}',
+        ],
+    )
+    def test_process_records_invalid_record(self, line):
+        records = list(read_records(['{"data": "a"}', line, '{"data": "b"}'], "jsonl"))
+        results = process_records(records)
+        assert isinstance(results[1], RecordError) and results[1].line == 2
+        assert [result[0] for result in (results[0], results[2])] == ["000000.png", "000002.png"]
+
+    def test_process_records_in_batch(self):
+        lines = ['{"data": "abc"}', '{"data": "abc", "version": "R9x59"}', '{"data": "abc", "ecc": "H"}']
+        lines += ['{"data": "abc"}', '{"data": "%s", "version": "R9x59"}' % ("a" * 100), '{"data": "def"}']
+        records = list(read_records(lines, "jsonl"))
+        results = process_records(records, template="{index}.svg")
+        assert isinstance(results[4], DataTooLongError) and results[4].line == 5
+        for i in (0, 1, 2, 3, 5):
+            assert results[i] == (f"{i}.svg", render(make_qr(records[i]), f"{i}.svg", 10))
+
+    @pytest.mark.parametrize("template", ["{index}.png", "{version}/{index:06d}.svg", "a{{b}}.png"])
+    def test_check_template(self, template):
+        check_template(template)
+
+    @pytest.mark.parametrize("template", ["{}.png", "{0}.png", "{name}.png", "{index.foo}.png", "{version[0]}.png"])
+    def test_check_template_invalid(self, template):
+        with pytest.raises(ValueError):
+            check_template(template)
+
+    @pytest.mark.parametrize("option", [["--output-template", "{index.foo}.png"], ["--jobs", "-1"]])
+    def test_console_batch_invalid_options(self, tmp_path, option):
+        res = subprocess.run(
+            [sys.executable, "-m", "rmqrcode.console", "--batch", "-", "--output-dir", str(tmp_path)] + option,
+            input="abc\n",
+            capture_output=True,
+            text=True,
+        )
+        assert res.returncode == 2
+        assert "Traceback" not in res.stderr
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.parametrize("jobs", ["1", "2"])
+    def test_console_batch_invalid_records(self, tmp_path, jobs):
+        lines = [
+            '{"data": "\\ud800"}',
+            '{"data": "abc", "output": 1}',
+            '{"data": "abc", "version": ["R7x43"]}',
+            '{"data": "abc", "output": "a.bogusfmt"}',
+            '{"data": "abc", "output": "../a.png"}',
+            '{"data": "abc"}',
+        ]
+        res = subprocess.run(
+            [sys.executable, "-m", "rmqrcode.console", "--batch", "-", "--input-format", "jsonl", "--jobs", jobs]
+            + ["--output-dir", str(tmp_path / "out")],
+            input="\n".join(lines),
+            capture_output=True,
+            text=True,
+        )
+        assert res.returncode == 1
+        assert "Traceback" not in res.stderr
+        assert res.stderr.count("Error: line") == 5
+        assert sorted(p.name for p in (tmp_path / "out").iterdir()) == ["000005.png"]
+        assert not (tmp_path / "a.png").exists()
+
+    @pytest.mark.parametrize("name", ["", "/a.png", "\\a.png", "C:a.png", "../a.png", "a/../../b.png", "a\\..\\b.png"])
+    def test_check_name(self, name):
+        with pytest.raises(RecordError):
+            check_name(name)
+
+    def test_writers_reject_unsafe_names(self, tmp_path):
+        check_name("a/b.c/d.png")
+        with pytest.raises(RecordError):
+            DirectoryWriter(str(tmp_path / "out")).write("../a.png", b"abc")
+        assert not (tmp_path / "a.png").exists()
+        for format in ("zip", "tar"):
+            with archive_writer(io.BytesIO(), format) as writer:
+                with pytest.raises(RecordError):
+                    writer.write("/a.png", b"abc")
+
+    def test_archive_format(self):
+        assert archive_format("a.ZIP") == "zip"
+        assert archive_format("a.tgz") == "tar.gz"
+        assert archive_format("a.tar.xz") == "tar.xz"
+        assert archive_format("a.7z") is None
+
+    def test_directory_writer(self, tmp_path):
+        with DirectoryWriter(str(tmp_path)) as writer:
+            writer.write("a/b.png", b"abc")
+        assert (tmp_path / "a" / "b.png").read_bytes() == b"abc"
+
+    @pytest.mark.parametrize("format", ["zip", "tar", "tar.gz"])
+    def test_archive_writer(self, format):
+        stream = io.BytesIO()
+        with archive_writer(stream, format) as writer:
+            writer.write("a/0.png", b"abc")
+            writer.write("1.svg", b"")
+        stream.seek(0)
+        if format == "zip":
+            with zipfile.ZipFile(stream) as z:
+                assert z.namelist() == ["a/0.png", "1.svg"]
+                assert z.read("a/0.png") == b"abc"
+        else:
+            with tarfile.open(fileobj=stream) as t:
+                assert t.getnames() == ["a/0.png", "1.svg"]
+                assert t.extractfile("a/0.png").read() == b"abc"
+
+    def test_console_batch_archive(self):
+        res = subprocess.run(
+            [sys.executable, "-m", "rmqrcode.console", "--batch", "-", "--archive", "-", "--archive-format", "zip"],
+            input=b"abc\ndef\n",
+            capture_output=True,
+        )
+        assert res.returncode == 0
+        with zipfile.ZipFile(io.BytesIO(res.stdout)) as z:
+            assert z.namelist() == ["000000.png", "000001.png"]
+            assert Image.open(io.BytesIO(z.read("000001.png"))).format == "PNG"
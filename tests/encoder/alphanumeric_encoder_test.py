@@ -20,3 +20,4 @@ class TestAlphaNumericEncoder:
         assert AlphanumericEncoder.is_valid_characters("AC-42") is True
         assert AlphanumericEncoder.is_valid_characters("abc123") is False
         assert AlphanumericEncoder.is_valid_characters("📌") is False
+        assert AlphanumericEncoder.is_valid_characters("AB\nCD") is False
@@ -0,0 +1,26 @@
+from rmqrcode.encoder.character_classes import ALPHANUMERIC, BYTE, KANJI, NUMERIC, CharacterClasses
+
+
+class TestCharacterClasses:
+    def test_classify_ascii(self):
+        classes = CharacterClasses("1A a\n")
+        assert list(classes.masks) == [
+            NUMERIC | ALPHANUMERIC | BYTE,
+            ALPHANUMERIC | BYTE,
+            ALPHANUMERIC | BYTE,
+            BYTE,
+            BYTE,
+        ]
+        assert list(classes.byte_lengths) == [1, 1, 1, 1, 1]
+
+    def test_classify_non_ascii(self):
+        classes = CharacterClasses("9漢é📌")
+        assert list(classes.masks) == [NUMERIC | ALPHANUMERIC | BYTE, KANJI | BYTE, BYTE, BYTE]
+        assert list(classes.byte_lengths) == [1, 3, 2, 4]
+
+    def test_all_in(self):
+        assert CharacterClasses("123").all_in(NUMERIC) is True
+        assert CharacterClasses("123").all_in(ALPHANUMERIC) is True
+        assert CharacterClasses("12A").all_in(NUMERIC) is False
+        assert CharacterClasses("漢字").all_in(KANJI) is True
+        assert CharacterClasses("").all_in(KANJI) is True
@@ -20,3 +20,4 @@ class TestNumericEncoder:
         assert NumericEncoder.is_valid_characters("0123456789") is True
         assert NumericEncoder.is_valid_characters("A1234!678@") is False
         assert NumericEncoder.is_valid_characters("📌") is False
+        assert NumericEncoder.is_valid_characters("12\n") is False
@@ -0,0 +1,48 @@
+import sys
+import threading
+
+from rmqrcode import ErrorCorrectionLevel
+from rmqrcode.format import format_information
+from rmqrcode.format.format_information import (
+    compute_format_information,
+    get_format_information,
+)
+from rmqrcode.format.rmqr_versions import rMQRVersions
+
+
+class TestFormatInformation:
+    def test_get_format_information(self):
+        assert get_format_information("R7x43", ErrorCorrectionLevel.M) == 0
+        assert get_format_information("R17x139", ErrorCorrectionLevel.H) == 0b111111101110000101
+
+    def test_table_matches_computed_values(self):
+        for version_name, qr_version in rMQRVersions.items():
+            for ecc in ErrorCorrectionLevel:
+                assert get_format_information(version_name, ecc) == compute_format_information(
+                    qr_version["version_indicator"], ecc
+                )
+
+    def test_first_calls_from_threads(self, monkeypatch):
+        switch_interval = sys.getswitchinterval()
+        errors = []
+
+        def run(barrier):
+            barrier.wait()
+            try:
+                get_format_information("R17x139", ErrorCorrectionLevel.H)
+            except KeyError as e:
+                errors.append(e)
+
+        sys.setswitchinterval(1e-6)
+        try:
+            for _ in range(5):
+                monkeypatch.setattr(format_information, "_format_information_table", None)
+                barrier = threading.Barrier(16)
+                threads = [threading.Thread(target=run, args=(barrier,)) for _ in range(16)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+        assert errors == []
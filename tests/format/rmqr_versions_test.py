@@ -0,0 +1,49 @@
+import pytest
+
+from rmqrcode import ErrorCorrectionLevel, rMQR
+from rmqrcode.format.generator_polynomials import GeneratorPolynomials
+from rmqrcode.format.rmqr_versions import rMQRVersions
+
+
+class TestRMQRVersions:
+    @pytest.mark.parametrize("version_name", list(rMQRVersions))
+    def test_blocks_fill_the_symbol(self, version_name):
+        qr_version = rMQRVersions[version_name]
+        for ecc, blocks in qr_version["blocks"].items():
+            assert sum(block["num"] * block["c"] for block in blocks) == qr_version["codewords_total"]
+            data_codewords_num = sum(block["num"] * block["k"] for block in blocks)
+            number_of_data_bits = qr_version["number_of_data_bits"][ecc]
+            assert number_of_data_bits <= data_codewords_num * 8 < number_of_data_bits + 8
+            for block in blocks:
+                assert block["c"] - block["k"] in GeneratorPolynomials
+
+    def test_corrected_blocks(self):
+        assert rMQRVersions["R13x27"]["blocks"][ErrorCorrectionLevel.M] == [{"num": 1, "c": 21, "k": 12}]
+        assert rMQRVersions["R17x43"]["blocks"][ErrorCorrectionLevel.M] == [{"num": 1, "c": 61, "k": 39}]
+
+    # The final codeword sequences of "rMQR" with the error correction level M. The symbols
+    # are decoded by zxing-cpp. R13x99 has blocks of different lengths.
+    @pytest.mark.parametrize(
+        "version_name, expected",
+        [
+            ("R13x27", "68e49aa2a400ec11ec11ec115419f600a11ea4c885"),
+            (
+                "R17x43",
+                "623926a8a900ec11ec11ec11ec11ec11ec11ec11ec11ec11ec11ec11ec11ec11ec11ec11ec11ec"
+                "0d35f998ce35491a951e6186fb1703047a2816976055",
+            ),
+            (
+                "R13x99",
+                "61ec1c1193ec541154ec8011ecec1111ecec1111ecec1111ecec1111ecec1111ecec1111ecec1111"
+                "ecec1111ecec1111ecec1111ecec1111ecec1111ecec1111ecec1111ecec1111ec"
+                "5bed34f1916a2e5b690aefd60325f7b96894d2d485535d0e42041efae5d2ca4a22b3eb095a8eb3ce",
+            ),
+        ],
+    )
+    def test_final_codewords(self, version_name, expected):
+        qr = rMQR(version_name, ErrorCorrectionLevel.M)
+        qr.add_segment("rMQR")
+        qr_version = rMQRVersions[version_name]
+        codewords = qr._make_codewords(qr._encode_data(), qr_version["codewords_total"])
+        blocks = qr._split_into_blocks(codewords, qr_version["blocks"][ErrorCorrectionLevel.M])
+        assert bytes(qr._make_final_codewords(blocks)).hex() == expected
@@ -0,0 +1,42 @@
+import io
+
+import pytest
+from PIL import Image
+
+from rmqrcode import rMQR
+from rmqrcode.netpbm import write_pbm, write_pgm, write_raw
+
+
+class TestNetpbm:
+    def _assert_pixels(self, img, binary_list, module_size, dark, light):
+        assert img.size == (len(binary_list[0]) * module_size, len(binary_list) * module_size)
+        for y, row in enumerate(binary_list):
+            for x, value in enumerate(row):
+                expected = dark if value else light
+                assert img.getpixel((x * module_size, y * module_size)) == expected
+                assert img.getpixel((x * module_size + module_size - 1, y * module_size + module_size - 1)) == expected
+
+    def test_write_pbm(self):
+        qr = rMQR.fit("https://oudon.xyz")
+        stream = io.BytesIO()
+        write_pbm(qr, stream, module_size=3)
+        assert stream.getvalue().startswith(b"P4\n")
+        stream.seek(0)
+        self._assert_pixels(Image.open(stream), qr.to_list(), 3, 0, 255)
+
+    def test_write_pgm(self):
+        qr = rMQR.fit("https://oudon.xyz")
+        stream = io.BytesIO()
+        write_pgm(qr, stream, module_size=2, quiet_zone_modules=0)
+        assert stream.getvalue().startswith(b"P5\n")
+        stream.seek(0)
+        self._assert_pixels(Image.open(stream), qr.to_list(with_quiet_zone=False), 2, 0, 255)
+
+    def test_write_raw(self):
+        qr = rMQR.fit("https://oudon.xyz")
+        for bits_per_pixel in (1, 8):
+            stream = io.BytesIO()
+            write_raw(qr, stream, bits_per_pixel=bits_per_pixel)
+            assert stream.getvalue() == qr.tobytes(bits_per_module=bits_per_pixel)
+        with pytest.raises(ValueError):
+            write_raw(qr, io.BytesIO(), bits_per_pixel=2)
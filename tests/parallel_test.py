@@ -0,0 +1,93 @@
+import multiprocessing
+import os
+from functools import partial
+
+import pytest
+
+from rmqrcode import DataTooLongError, ErrorCorrectionLevel, PNGImage, parallel, rMQR
+from rmqrcode.parallel import (
+    PackedSymbol,
+    _next_chunk_size,
+    fit_parallel,
+    make_parallel,
+)
+
+
+def render_png(qr, module_size):
+    return PNGImage(qr, module_size).to_bytes()
+
+
+class TestParallel:
+    def test_fit_parallel(self):
+        data = [f"https://oudon.xyz/{i}" for i in range(40)]
+        symbols = list(fit_parallel(data, jobs=2))
+        assert [symbol.index for symbol in symbols] == list(range(40))
+        for symbol, item in zip(symbols, data):
+            qr = rMQR.fit(item)
+            assert symbol.version_name == qr.version_name()
+            assert symbol.packed == qr.tobytes(with_quiet_zone=False)
+            assert symbol.to_list() == qr.to_list()
+
+    def test_unordered(self):
+        data = [str(i) for i in range(40)]
+        symbols = list(fit_parallel(data, jobs=2, ordered=False))
+        assert sorted(symbol.index for symbol in symbols) == list(range(40))
+
+    def test_render_and_recycle_workers(self):
+        data = ["abc", "def"] * 20
+        symbols = list(fit_parallel(data, jobs=2, render=partial(render_png, module_size=2), max_tasks_per_child=1))
+        assert symbols[1].rendered == PNGImage(rMQR.fit("def"), 2).to_bytes()
+
+    def test_errors(self):
+        data = ["abc", "a" * 400, "def"]
+        with pytest.raises(DataTooLongError):
+            list(fit_parallel(data, jobs=1))
+        results = list(fit_parallel(data, jobs=1, return_exceptions=True))
+        assert isinstance(results[1], DataTooLongError)
+        assert results[1].index == 1
+        assert results[2].index == 2
+
+    def test_errors_of_identical_items(self):
+        data = ["x" * 1000, "ok", "x" * 1000]
+        for ordered in (True, False):
+            results = sorted(
+                fit_parallel(data, jobs=1, ordered=ordered, return_exceptions=True), key=lambda result: result.index
+            )
+            assert [result.index for result in results] == [0, 1, 2]
+            assert isinstance(results[0], DataTooLongError) and isinstance(results[2], DataTooLongError)
+            assert results[0] is not results[2]
+
+    def test_make_parallel(self):
+        symbols = list(make_parallel(["abc", "123"], version="R7x59", ecc=ErrorCorrectionLevel.H, jobs=1))
+        assert [symbol.version_name for symbol in symbols] == ["R7x59", "R7x59"]
+
+    def test_next_chunk_size(self):
+        assert _next_chunk_size(16, 16, 0.01, 0.1) == 32
+        assert _next_chunk_size(16, 16, 1.0, 0.1) == 8
+        assert _next_chunk_size(16, 16, 0.1, 0.1) == 16
+
+    def test_manual_recycling_bounds_processes(self, monkeypatch):
+        monkeypatch.setattr(parallel, "_NATIVE_MAX_TASKS_PER_CHILD", False)
+        # The processes left by the other tests are not counted.
+        others = set(multiprocessing.active_children())
+        pool = parallel._Pool(2, 1)
+        try:
+            futures = []
+            for _ in range(10):
+                futures.append(pool.submit(os.getpid))
+                assert len(set(multiprocessing.active_children()) - others) <= 2
+            pids = {future.result() for future in futures}
+        finally:
+            pool.shutdown()
+        # The workers were replaced several times.
+        assert len(pids) > 2
+        assert set(multiprocessing.active_children()) <= others
+
+
+class TestPackedSymbol:
+    def test_to_list(self):
+        qr = rMQR.fit("https://oudon.xyz")
+        symbol = PackedSymbol.from_qr(0, qr)
+        assert symbol.to_list() == qr.to_list()
+        assert symbol.to_list(with_quiet_zone=False) == qr.to_list(with_quiet_zone=False)
+        assert symbol.row_stride() == qr.row_stride(with_quiet_zone=False)
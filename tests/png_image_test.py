@@ -0,0 +1,30 @@
+import io
+
+from PIL import Image
+
+from rmqrcode import PNGImage, rMQR
+
+
+class TestPNGImage:
+    def test_png(self):
+        qr = rMQR.fit("https://oudon.xyz")
+        img = Image.open(io.BytesIO(PNGImage(qr, module_size=3).to_bytes()))
+        binary_list = qr.to_list()
+        assert img.mode == "1"
+        assert img.size == (len(binary_list[0]) * 3, len(binary_list) * 3)
+        for y, row in enumerate(binary_list):
+            for x, value in enumerate(row):
+                expected = 0 if value else 255
+                assert img.getpixel((x * 3, y * 3)) == expected
+                assert img.getpixel((x * 3 + 2, y * 3 + 2)) == expected
+
+    def test_write_and_save(self, tmp_path):
+        image = PNGImage(rMQR.fit("abc"), module_size=1)
+        stream = io.BytesIO()
+        image.write(stream)
+        assert stream.getvalue() == image.to_bytes()
+        assert stream.getvalue().startswith(b"\x89PNG\r\n\x1a\n")
+
+        path = tmp_path / "qr.png"
+        image.save(path)
+        assert path.read_bytes() == image.to_bytes()
@@ -0,0 +1,71 @@
+import io
+import subprocess
+import sys
+
+import pytest
+
+from rmqrcode import QRImage, rMQR
+
+
+class TestQRImage:
+    def test_image(self):
+        qr = rMQR.fit("https://oudon.xyz")
+        image = QRImage(qr, module_size=3)
+        img = image._image()
+        binary_list = qr.to_list()
+        assert img.mode == "RGB"
+        assert img.size == (len(binary_list[0]) * 3, len(binary_list) * 3)
+        for y, row in enumerate(binary_list):
+            for x, value in enumerate(row):
+                expected = (0, 0, 0) if value else (255, 255, 255)
+                assert img.getpixel((x * 3, y * 3)) == expected
+                assert img.getpixel((x * 3 + 2, y * 3 + 2)) == expected
+
+    def test_image_is_made_lazily(self):
+        image = QRImage(rMQR.fit("abc"))
+        assert image._img is None
+        image.get_ndarray()
+        assert image._img is not None
+
+    def test_modes(self):
+        qr = rMQR.fit("https://oudon.xyz")
+        binary_list = qr.to_list()
+        expected = {
+            "1": lambda value: 0 if value else 255,
+            "L": lambda value: 0 if value else 255,
+            "P": lambda value: 1 if value else 0,
+        }
+        for mode, color in expected.items():
+            img = QRImage(qr, module_size=2, mode=mode)._image()
+            assert img.mode == mode
+            for y, row in enumerate(binary_list):
+                for x, value in enumerate(row):
+                    assert img.getpixel((x * 2 + 1, y * 2 + 1)) == color(value)
+
+    def test_custom_colors(self):
+        qr = rMQR.fit("https://oudon.xyz")
+        image = QRImage(qr, module_size=1, dark_color=(0, 0, 128), light_color=(255, 255, 200))
+        img = image._image()
+        assert img.mode == "RGB"
+        for y, row in enumerate(qr.to_list()):
+            for x, value in enumerate(row):
+                assert img.getpixel((x, y)) == ((0, 0, 128) if value else (255, 255, 200))
+
+    @pytest.mark.parametrize("mode", ["1", "L"])
+    def test_raise_value_error_for_custom_colors_in_mode(self, mode):
+        with pytest.raises(ValueError):
+            QRImage(rMQR.fit("abc"), mode=mode, dark_color=(0, 0, 128))
+        QRImage(rMQR.fit("abc"), mode=mode, dark_color=[0, 0, 0])
+
+    def test_save_image_format(self):
+        stream = io.BytesIO()
+        QRImage(rMQR.fit("abc"), module_size=1).save(stream, image_format="BMP")
+        assert stream.getvalue().startswith(b"BM")
+
+    def test_raise_value_error_for_invalid_mode(self):
+        with pytest.raises(ValueError):
+            QRImage(rMQR.fit("abc"), mode="CMYK")
+
+    def test_pillow_is_imported_lazily(self):
+        code = "import sys, rmqrcode; assert 'PIL' not in sys.modules; rmqrcode.QRImage; assert 'PIL' in sys.modules"
+        subprocess.run([sys.executable, "-c", code], check=True)
@@ -1,12 +1,18 @@
+from rmqrcode.enums.color import Color
+from rmqrcode.format.rmqr_versions import rMQRVersions
+from rmqrcode.rmqrcode import rMQRCore
 from rmqrcode import (
     rMQR,
     encoder,
     ErrorCorrectionLevel,
+    FitStrategy,
     DataTooLongError,
     IllegalVersionError,
     NoSegmentError,
 )
 
+import logging
+
 import pytest
 
 
@@ -14,6 +20,16 @@ class TestRMQR:
     def test_fit(self):
         qr = rMQR.fit("abc")
 
+    def test_fit_with_newline(self):
+        qr = rMQR.fit("AB\nCD")
+        assert qr.version_name() == "R7x43"
+
+    def test_fit_strategy(self):
+        data = "Test test test"
+        assert rMQR.fit(data, fit_strategy=FitStrategy.MINIMIZE_WIDTH).version_name() == "R11x43"
+        assert rMQR.fit(data, fit_strategy=FitStrategy.MINIMIZE_HEIGHT).version_name() == "R7x77"
+        assert rMQR.fit(data, fit_strategy=FitStrategy.BALANCED).version_name() == "R7x77"
+
     def test_make(self):
         qr = rMQR("R13x99", ErrorCorrectionLevel.M)
         qr.add_segment("abc")
@@ -89,3 +105,185 @@ class TestRMQR:
     def test_raise_invalid_version_error(self):
         with pytest.raises(IllegalVersionError) as e:
             qr = rMQR("not exists", ErrorCorrectionLevel.M)
+
+    def test_fit_many(self):
+        data = [
+            "abc",
+            "https://oudon.xyz",
+            "abc",
+            ("123", ErrorCorrectionLevel.H),
+            ("abc", ErrorCorrectionLevel.M, FitStrategy.MINIMIZE_WIDTH),
+        ]
+        qrs = list(rMQR.fit_many(data, chunk_size=2))
+        assert len(qrs) == 5
+        expected = [
+            rMQR.fit("abc"),
+            rMQR.fit("https://oudon.xyz"),
+            rMQR.fit("abc"),
+            rMQR.fit("123", ecc=ErrorCorrectionLevel.H),
+            rMQR.fit("abc", fit_strategy=FitStrategy.MINIMIZE_WIDTH),
+        ]
+        for qr, expected_qr in zip(qrs, expected):
+            assert qr.version_name() == expected_qr.version_name()
+            assert qr.to_list() == expected_qr.to_list()
+
+    def test_fit_many_yields_independent_objects_for_identical_data(self):
+        qr1, qr2 = rMQR.fit_many(["abc", "abc"])
+        assert qr1 is not qr2
+        assert qr1.to_list() == qr2.to_list()
+        qr2.add_segment("d")
+        assert len(qr1._segments) == 1
+        assert qr1._qr is not qr2._qr
+
+    def test_make_many_duplicates_are_not_affected_by_the_first(self):
+        qrs = rMQR.make_many(["abc", "abc", "abc"], version="R13x99")
+        first = next(qrs)
+        expected = first.to_list()
+        first.add_segment("def")
+        first.make()
+        assert first.to_list() != expected
+        for qr in qrs:
+            assert len(qr._segments) == 1
+            assert qr.to_list() == expected
+
+    def test_fit_many_is_lazy(self):
+        def data():
+            i = 0
+            while True:
+                yield str(i)
+                i += 1
+
+        qrs = rMQR.fit_many(data(), chunk_size=4)
+        assert [next(qrs).to_list() for _ in range(5)][4] == rMQR.fit("4").to_list()
+
+    def test_fit_many_errors(self):
+        data = ["abc", "a" * 400, "def"]
+        with pytest.raises(DataTooLongError):
+            list(rMQR.fit_many(data))
+        results = list(rMQR.fit_many(data, return_exceptions=True))
+        assert isinstance(results[1], DataTooLongError)
+        assert results[2].to_list() == rMQR.fit("def").to_list()
+
+    def test_fit_many_invalid_items(self):
+        data = ["a" * 400, "\ud800", ["abc"], "def", "a" * 400, "\ud800"]
+        results = list(rMQR.fit_many(data, return_exceptions=True))
+        assert [type(result) for result in results] == [
+            DataTooLongError,
+            UnicodeEncodeError,
+            TypeError,
+            rMQR,
+            DataTooLongError,
+            UnicodeEncodeError,
+        ]
+        # Each item has its own exception object.
+        assert results[0] is not results[4]
+        assert results[1] is not results[5]
+        with pytest.raises(UnicodeEncodeError):
+            list(rMQR.fit_many(["abc", "\ud800"]))
+
+    def test_make_many(self):
+        qrs = list(
+            rMQR.make_many(["abc", ("xyz", "R13x43"), ("123", "R7x59", ErrorCorrectionLevel.H)], version="R7x43")
+        )
+        assert [qr.version_name() for qr in qrs] == ["R7x43", "R13x43", "R7x59"]
+        expected = rMQR("R7x59", ErrorCorrectionLevel.H)
+        expected.add_segment("123")
+        expected.make()
+        assert qrs[2].to_list() == expected.to_list()
+
+        results = list(rMQR.make_many(["a" * 100, ("abc", "R1x1")], version="R7x43", return_exceptions=True))
+        assert isinstance(results[0], DataTooLongError)
+        assert isinstance(results[1], IllegalVersionError)
+
+    def test_logger_is_shared(self):
+        qr1 = rMQR("R7x43", ErrorCorrectionLevel.M)
+        qr2 = rMQR("R7x43", ErrorCorrectionLevel.M)
+        assert qr1._logger is qr2._logger
+        assert len(qr1._logger.handlers) == 1
+
+    def test_debug_logging(self, caplog):
+        rMQR.fit("abc")
+        assert caplog.records == []
+        caplog.set_level(logging.DEBUG, logger="rmqrcode")
+        rMQR.fit("abc")
+        assert any(record.getMessage().startswith("Put QR data codeword") for record in caplog.records)
+
+    def test_make_reuses_function_patterns(self):
+        qr1 = rMQR("R13x99", ErrorCorrectionLevel.M)
+        qr1.add_segment("abc")
+        qr1.make()
+        qr2 = rMQR("R13x99", ErrorCorrectionLevel.H)
+        qr2.add_segment("xyz")
+        qr2.make()
+        assert qr1.to_list() != qr2.to_list()
+        # The finder pattern is drawn on both symbols.
+        assert qr1.to_list(with_quiet_zone=False)[0][:7] == [1] * 7
+        assert qr2.to_list(with_quiet_zone=False)[0][:7] == [1] * 7
+
+    def test_packed_rows(self):
+        qr = rMQR("R7x43", ErrorCorrectionLevel.M)
+        qr.add_segment("123")
+        qr.make()
+        binary_list = qr.to_list(with_quiet_zone=False)
+        for y, row in enumerate(qr._qr.rows()):
+            assert [row >> (42 - x) & 1 for x in range(43)] == binary_list[y]
+        assert qr.value_at(0, 0) == Color.BLACK
+        assert qr.value_at(7, 0) == Color.WHITE
+        with pytest.raises(IndexError):
+            qr._qr.get_data(43, 0)
+
+    def test_tobytes(self):
+        qr = rMQR.fit("https://oudon.xyz")
+        for with_quiet_zone in (True, False):
+            binary_list = qr.to_list(with_quiet_zone=with_quiet_zone)
+            stride = qr.row_stride(with_quiet_zone=with_quiet_zone)
+            assert stride == (len(binary_list[0]) + 7) // 8
+            packed = qr.tobytes(with_quiet_zone=with_quiet_zone)
+            assert len(packed) == stride * len(binary_list)
+            for y, row in enumerate(binary_list):
+                bits = int.from_bytes(packed[y * stride : (y + 1) * stride], "big")
+                assert [bits >> (stride * 8 - 1 - x) & 1 for x in range(len(row))] == row
+            assert qr.tobytes(with_quiet_zone=with_quiet_zone, bits_per_module=8) == bytes(sum(binary_list, []))
+        with pytest.raises(ValueError):
+            qr.tobytes(bits_per_module=2)
+
+    def test_to_memoryview(self):
+        qr = rMQR.fit("https://oudon.xyz")
+        view = qr.to_memoryview(bits_per_module=8)
+        assert view.readonly
+        assert view.tolist() == qr.to_list()
+        view = qr.to_memoryview(with_quiet_zone=False)
+        assert view.shape == (qr.height(), qr.row_stride(with_quiet_zone=False))
+
+    def test_undefined_modules_before_put_data(self):
+        core = rMQRCore(43, 7)
+        core.put_function_patterns()
+        assert core.get_data(0, 0) == Color.BLACK
+        assert core.get_data(10, 3) == Color.UNDEFINED
+        assert "?" in core.__str__(with_quiet_zone=False)
+
+    def test_placement_map(self):
+        placement_map = rMQRCore.placement_map(43, 7)
+        # 13 codewords and no remainder bits
+        assert len(placement_map) == 13 * 8
+        assert len(set(placement_map)) == len(placement_map)
+        # The right side of R7 is occupied by the finder sub pattern and the format information,
+        # so the placement starts at the left of them.
+        assert placement_map[0] == 1 * 43 + 34
+
+    def test_mask_plane(self):
+        mask_plane = rMQRCore.mask_plane(43, 7)
+        placement_map = rMQRCore.placement_map(43, 7)
+        for y in range(7):
+            for x in range(43):
+                expected = y * 43 + x in placement_map and (y // 2 + x // 3) % 2 == 0
+                assert (mask_plane[y] >> (43 - 1 - x) & 1) == expected
+
+    def test_make_all_versions(self):
+        for version_name in rMQRVersions:
+            for ecc in ErrorCorrectionLevel:
+                qr = rMQR(version_name, ecc)
+                qr.add_segment("a")
+                qr.make()
+                # All modules are defined.
+                assert "?" not in str(qr)
@@ -1,4 +1,6 @@
-from rmqrcode.segments import SegmentOptimizer, compute_length
+from rmqrcode.segments import LengthBounds, SegmentOptimizer, compute_length
+from rmqrcode.format.rmqr_versions import rMQRVersions
+from rmqrcode.encoder.character_classes import CharacterClasses
 from rmqrcode import encoder, ErrorCorrectionLevel, DataTooLongError
 import pytest
 
@@ -57,3 +59,31 @@ class TestSegments:
         optimizer = SegmentOptimizer()
         segments = optimizer.compute("123Abc", "R7x43", ErrorCorrectionLevel.M)
         assert compute_length(segments, "R7x43") is 47
+
+    def test_optimize_returns_cost_and_segments(self):
+        optimizer = SegmentOptimizer()
+        optimized = optimizer.optimize("123Abc", rMQRVersions["R7x43"]["character_count_indicator_length"])
+        assert optimized["cost"] == 47
+        assert optimized["segments"] == [
+            {"data": "123", "encoder_class": encoder.NumericEncoder},
+            {"data": "Abc", "encoder_class": encoder.ByteEncoder},
+        ]
+
+    def test_length_bounds_lower(self):
+        character_count_indicator_length = rMQRVersions["R7x43"]["character_count_indicator_length"]
+        bounds = LengthBounds(CharacterClasses("123Abc"))
+        # Header 3 + 2 (Kanji), "123" 10 bits and "Abc" 5.5 + 8 + 8 bits.
+        assert bounds.lower(character_count_indicator_length) == 37
+        assert bounds.lower(character_count_indicator_length) <= compute_length(
+            SegmentOptimizer().compute("123Abc", "R7x43", ErrorCorrectionLevel.M), "R7x43"
+        )
+
+    def test_optimizer_can_be_reused(self):
+        optimizer = SegmentOptimizer()
+        optimizer.compute("漢字" * 20, "R17x139", ErrorCorrectionLevel.M)
+        segments = optimizer.compute("123Abc", "R7x43", ErrorCorrectionLevel.M)
+        assert segments == [
+            {"data": "123", "encoder_class": encoder.NumericEncoder},
+            {"data": "Abc", "encoder_class": encoder.ByteEncoder},
+        ]
+        assert SegmentOptimizer.for_current_thread() is SegmentOptimizer.for_current_thread()
@@ -0,0 +1,94 @@
+import io
+import re
+import zlib
+
+import pytest
+
+from rmqrcode import ErrorCorrectionLevel, rMQR
+from rmqrcode.sheet import EPSSheetWriter, PDFSheetWriter, SheetLayout
+
+
+class TestSheetLayout:
+    def test_grid(self):
+        layout = SheetLayout(page_width=210, page_height=297, margin_left=10, margin_top=10, pitch_x=50, pitch_y=30)
+        assert (layout.columns, layout.rows) == (3, 9)
+        assert layout.position(0) == (0, 10, 10)
+        assert layout.position(4) == (0, 60, 40)
+        assert layout.position(27) == (1, 10, 10)
+
+    @pytest.mark.parametrize("kwargs", [{"module_size": 0}, {"columns": 0}, {"rows": 0}, {"columns": -1}])
+    def test_raise_value_error(self, kwargs):
+        with pytest.raises(ValueError):
+            SheetLayout(**kwargs)
+
+    def test_check_symbol(self):
+        qr = rMQR("R7x43", ErrorCorrectionLevel.M)
+        # 47 x 11 modules including the quiet zone.
+        SheetLayout(pitch_x=23.5, pitch_y=5.5, module_size=0.5).check_symbol(qr)
+        with pytest.raises(ValueError):
+            SheetLayout(pitch_x=23, pitch_y=30, module_size=0.5).check_symbol(qr)
+        with pytest.raises(ValueError):
+            SheetLayout(pitch_x=50, pitch_y=5, module_size=0.5).check_symbol(qr)
+
+
+class TestPDFSheetWriter:
+    def test_pdf(self):
+        layout = SheetLayout(columns=2, rows=2)
+        qr = rMQR.fit("https://oudon.xyz")
+        stream = io.BytesIO()
+        with PDFSheetWriter(stream, layout, compress=False) as writer:
+            for _ in range(5):
+                writer.add(qr)
+        data = stream.getvalue()
+        assert data.startswith(b"%PDF-1.4")
+        assert b"/Count 2" in data
+
+        # Every entry of the cross-reference table points to its object.
+        xref_offset = int(re.search(rb"startxref\n(\d+)", data).group(1))
+        lines = data[xref_offset:].split(b"\n")
+        size = int(lines[1].split()[1])
+        for number in range(1, size):
+            offset = int(lines[2 + number][:10])
+            assert data[offset:].startswith(f"{number} 0 obj".encode("ascii"))
+
+        # The rectangles of a symbol cover the dark modules.
+        content = data.split(b"stream\n")[1].split(b"\nendstream")[0].decode("ascii")
+        symbol = content.split("Q\n")[0]
+        binary_list = qr.to_list()
+        drawn = [[0] * len(binary_list[0]) for _ in binary_list]
+        for x, y, w, h in re.findall(r"(\d+) (\d+) (\d+) (\d+) re", symbol):
+            for j in range(int(y), int(y) + int(h)):
+                for i in range(int(x), int(x) + int(w)):
+                    drawn[j][i] = 1
+        assert drawn == binary_list
+
+    def test_compress(self):
+        stream = io.BytesIO()
+        with PDFSheetWriter(stream, SheetLayout()) as writer:
+            writer.add(rMQR.fit("abc"))
+        data = stream.getvalue()
+        assert b"/FlateDecode" in data
+        compressed = data.split(b"stream\n")[1].split(b"\nendstream")[0]
+        assert b" re\n" in zlib.decompress(compressed)
+
+    def test_raise_value_error_for_large_symbol(self):
+        stream = io.BytesIO()
+        with PDFSheetWriter(stream, SheetLayout(pitch_x=20, pitch_y=10, module_size=0.5)) as writer:
+            with pytest.raises(ValueError):
+                writer.add(rMQR("R7x43", ErrorCorrectionLevel.M))
+        assert b"/Count 0" in stream.getvalue()
+
+
+class TestEPSSheetWriter:
+    def test_eps(self):
+        layout = SheetLayout(columns=2, rows=1)
+        stream = io.BytesIO()
+        with EPSSheetWriter(stream, layout) as writer:
+            writer.add(rMQR.fit("abc"))
+            writer.add(rMQR.fit("def"))
+            with pytest.raises(ValueError):
+                writer.add(rMQR.fit("ghi"))
+        data = stream.getvalue().decode("ascii")
+        assert data.startswith("%!PS-Adobe-3.0 EPSF-3.0\n")
+        assert data.count("grestore") == 2
+        assert data.endswith("%%EOF\n")
@@ -0,0 +1,41 @@
+import re
+import xml.etree.ElementTree as ET
+
+from rmqrcode import SVGImage, rMQR
+
+SVG_NAMESPACE = "{http://www.w3.org/2000/svg}"
+
+
+class TestSVGImage:
+    def test_svg(self):
+        qr = rMQR.fit("https://oudon.xyz")
+        root = ET.fromstring(SVGImage(qr, module_size=4).to_string())
+        assert root.get("viewBox") == f"0 0 {qr.width() + 4} {qr.height() + 4}"
+        assert root.get("width") == str((qr.width() + 4) * 4)
+        paths = root.findall(f"{SVG_NAMESPACE}path")
+        assert len(paths) == 1
+
+        binary_list = qr.to_list()
+        drawn = [[0] * len(binary_list[0]) for _ in binary_list]
+        for x, y, w, h in re.findall(r"M(\d+) (\d+)h(\d+)v(\d+)h-\d+z", paths[0].get("d")):
+            for j in range(int(y), int(y) + int(h)):
+                for i in range(int(x), int(x) + int(w)):
+                    drawn[j][i] = 1
+        assert drawn == binary_list
+
+    def test_transparent_background(self):
+        root = ET.fromstring(SVGImage(rMQR.fit("abc"), light_color=None).to_string())
+        assert root.findall(f"{SVG_NAMESPACE}rect") == []
+
+    def test_colors_are_escaped(self):
+        dark_color = '"/><script>alert(1)</script><x y="'
+        root = ET.fromstring(SVGImage(rMQR.fit("abc"), dark_color=dark_color, light_color="a&b<c>'").to_string())
+        assert [child.tag for child in root] == [f"{SVG_NAMESPACE}rect", f"{SVG_NAMESPACE}path"]
+        assert root.find(f"{SVG_NAMESPACE}path").get("fill") == dark_color
+        assert root.find(f"{SVG_NAMESPACE}rect").get("fill") == "a&b<c>'"
+
+    def test_save(self, tmp_path):
+        image = SVGImage(rMQR.fit("abc"))
+        path = tmp_path / "qr.svg"
+        image.save(path)
+        assert path.read_text(encoding="utf-8") == image.to_string()
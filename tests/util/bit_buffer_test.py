@@ -0,0 +1,25 @@
+from rmqrcode.util.bit_buffer import BitBuffer
+
+
+class TestBitBuffer:
+    def test_append(self):
+        buffer = BitBuffer()
+        buffer.append(0b001, 3)
+        buffer.append(0b1011001111, 10)
+        assert len(buffer) == 13
+        assert str(buffer) == "0011011001111"
+
+    def test_to_bytes_pads_last_byte(self):
+        buffer = BitBuffer()
+        buffer.append(0b001, 3)
+        buffer.append(0b10011, 5)
+        buffer.append(0b1, 1)
+        assert buffer.to_bytes() == bytearray([0b00110011, 0b10000000])
+
+    def test_extend(self):
+        buffer = BitBuffer()
+        buffer.append(0b1, 1)
+        other = BitBuffer()
+        other.append(0xABC, 12)
+        buffer.extend(other)
+        assert str(buffer) == "1101010111100"
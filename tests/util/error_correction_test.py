@@ -0,0 +1,30 @@
+import pytest
+
+from rmqrcode.format.generator_polynomials import GeneratorPolynomials
+from rmqrcode.util.error_correction import (
+    compute_reed_solomon,
+    compute_reed_solomon_batch,
+)
+
+
+class TestErrorCorrection:
+    def test_compute_reed_solomon(self):
+        data = bytes.fromhex("205b0b78d172dc4d4340ec11ec11ec11")
+        ecc = compute_reed_solomon(data, GeneratorPolynomials[10], 10)
+        assert ecc == bytes.fromhex("c4232777ebd7e7e25d17")
+
+    def test_compute_reed_solomon_30_ecc_codewords(self):
+        data = bytes(range(200, 255))
+        ecc = compute_reed_solomon(data, GeneratorPolynomials[30], 30)
+        assert ecc == bytes.fromhex("dc095eb26707b302eda99e67837773e0f2729e978a9f3a084efa071510d5")
+
+    def test_compute_reed_solomon_batch(self):
+        blocks = [bytes((i * 7 + j * 13) % 256 for j in range(45)) for i in range(100)]
+        ecc_blocks = compute_reed_solomon_batch(blocks, GeneratorPolynomials[30], 30)
+        assert ecc_blocks == [compute_reed_solomon(block, GeneratorPolynomials[30], 30) for block in blocks]
+
+    @pytest.mark.parametrize("num_blocks", [1, 100])
+    def test_compute_reed_solomon_batch_raise_value_error(self, num_blocks):
+        blocks = [bytes(45)] * num_blocks
+        with pytest.raises(ValueError):
+            compute_reed_solomon_batch(blocks, GeneratorPolynomials[30], 28)
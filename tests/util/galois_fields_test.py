@@ -0,0 +1,27 @@
+from rmqrcode.util.galois_fields import (
+    EXP_TABLE,
+    LOG_TABLE,
+    multiplication_row,
+    multiply,
+)
+
+
+class TestGaloisFields:
+    def test_tables(self):
+        assert EXP_TABLE[0] == 1
+        assert EXP_TABLE[8] == 0b00011101
+        assert EXP_TABLE[255] == 1
+        for a in range(1, 256):
+            assert EXP_TABLE[LOG_TABLE[a]] == a
+
+    def test_multiply(self):
+        assert multiply(0, 123) == 0
+        assert multiply(1, 123) == 123
+        assert multiply(2, 128) == 0b00011101
+        assert multiply(0x53, 0xCA) == multiply(0xCA, 0x53)
+
+    def test_multiplication_row(self):
+        row = multiplication_row(0x53)
+        assert len(row) == 256
+        for i in range(256):
+            assert row[i] == multiply(0x53, i)
@@ -0,0 +1,87 @@
+import pytest
+
+from rmqrcode import ErrorCorrectionLevel, rMQR
+from rmqrcode.format.generator_polynomials import GeneratorPolynomials
+from rmqrcode.format.rmqr_versions import rMQRVersions
+from rmqrcode.rmqrcode import rMQRCore
+from rmqrcode.util.error_correction import compute_reed_solomon
+
+np = pytest.importorskip("numpy")
+
+
+class TestNumpyBackend:
+    def test_compute_reed_solomon_batch(self):
+        from rmqrcode.util.numpy_backend import compute_reed_solomon_batch
+
+        data_blocks = np.arange(5 * 12, dtype=np.uint8).reshape(5, 12)
+        ecc_blocks = compute_reed_solomon_batch(data_blocks, GeneratorPolynomials[9])
+        assert ecc_blocks.shape == (5, 9)
+        for data, ecc in zip(data_blocks, ecc_blocks):
+            assert ecc.tobytes() == compute_reed_solomon(data.tobytes(), GeneratorPolynomials[9], 9)
+
+    def test_place_codewords(self):
+        from rmqrcode.util.numpy_backend import place_codewords
+
+        width, height = 43, 7
+        placement_map = rMQRCore.placement_map(width, height)
+        final_codewords = np.array([[0b10110000] + [0] * 12, [0] * 12 + [0b00000001]], dtype=np.uint8)
+        modules = place_codewords(final_codewords, placement_map, width * height)
+        assert modules.shape == (2, width * height)
+        assert modules[0].sum() == 3
+        assert [modules[0][placement_map[i]] for i in range(4)] == [1, 0, 1, 1]
+        assert modules[1].sum() == 1
+        assert modules[1][placement_map[13 * 8 - 1]] == 1
+
+    def test_place_codewords_and_apply_mask(self):
+        from rmqrcode.util.numpy_backend import apply_mask, place_codewords
+
+        qr = rMQR("R13x77", ErrorCorrectionLevel.M)
+        qr.add_segment("numpy")
+        qr.make()
+        codewords = qr._make_codewords(qr._encode_data(), rMQRVersions["R13x77"]["codewords_total"])
+        blocks = qr._split_into_blocks(codewords, rMQRVersions["R13x77"]["blocks"][ErrorCorrectionLevel.M])
+        final_codewords = np.frombuffer(qr._make_final_codewords(blocks), dtype=np.uint8).reshape(1, -1)
+
+        modules = place_codewords(final_codewords, rMQRCore.placement_map(77, 13), 77 * 13)
+        apply_mask(modules, rMQRCore.mask_plane(77, 13), 77)
+        expected = np.array(qr.to_list(with_quiet_zone=False), dtype=np.uint8).reshape(-1)
+        for index in rMQRCore.placement_map(77, 13):
+            assert modules[0][index] == expected[index]
+
+    def test_to_numpy(self):
+        qr = rMQR.fit("https://oudon.xyz", ecc=ErrorCorrectionLevel.M)
+        for with_quiet_zone in (True, False):
+            array = qr.to_numpy(with_quiet_zone=with_quiet_zone)
+            assert array.dtype == np.uint8
+            assert array.tolist() == qr.to_list(with_quiet_zone=with_quiet_zone)
+        assert qr.to_numpy(dtype=bool).tolist() == [[bool(v) for v in row] for row in qr.to_list()]
+        assert qr.to_numpy(dtype=np.float32).dtype == np.float32
+
+    def test_make_many_places_large_groups_with_numpy(self, monkeypatch):
+        from rmqrcode.util import numpy_backend
+
+        calls = []
+        place_codewords = numpy_backend.place_codewords
+        apply_mask = numpy_backend.apply_mask
+
+        def spy_place_codewords(*args):
+            calls.append(("place_codewords", args[0].shape))
+            return place_codewords(*args)
+
+        def spy_apply_mask(*args):
+            calls.append(("apply_mask", args[0].shape))
+            return apply_mask(*args)
+
+        monkeypatch.setattr(numpy_backend, "place_codewords", spy_place_codewords)
+        monkeypatch.setattr(numpy_backend, "apply_mask", spy_apply_mask)
+        data = [f"numpy {i}" for i in range(40)]
+        qrs = list(rMQR.make_many(data, version="R13x77"))
+        assert calls == [
+            ("place_codewords", (40, rMQRVersions["R13x77"]["codewords_total"])),
+            ("apply_mask", (40, 77 * 13)),
+        ]
+        for d, qr in zip(data, qrs):
+            expected = rMQR("R13x77", ErrorCorrectionLevel.M)
+            expected.add_segment(d)
+            expected.make()
+            assert qr.to_list() == expected.to_list()
@@ -0,0 +1,17 @@
+from rmqrcode.util.raster import scaled_lines
+
+
+class TestRaster:
+    def test_scaled_lines(self):
+        rows = [0b101, 0b010]
+        assert list(scaled_lines(rows, 3, module_size=2)) == [bytes([0b11001100]), bytes([0b00110000])]
+        assert list(scaled_lines(rows, 3, quiet_zone_modules=1)) == [
+            bytes([0b00000000]),
+            bytes([0b01010000]),
+            bytes([0b00100000]),
+            bytes([0b00000000]),
+        ]
+        assert list(scaled_lines(rows, 3, bits_per_pixel=8, dark=0, light=255)) == [
+            bytes([0, 255, 0]),
+            bytes([255, 0, 255]),
+        ]
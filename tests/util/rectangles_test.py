@@ -0,0 +1,25 @@
+from rmqrcode import rMQR
+from rmqrcode.util.rectangles import horizontal_runs, rectangles
+
+
+class TestRectangles:
+    def test_horizontal_runs(self):
+        assert horizontal_runs(0b0110111, 7) == [(1, 2), (4, 3)]
+        assert horizontal_runs(0, 7) == []
+
+    def test_rectangles(self):
+        rows = [0b1100, 0b1100, 0b0011]
+        assert list(rectangles(rows, 4)) == [(0, 0, 2, 2), (2, 2, 2, 1)]
+        assert list(rectangles(rows, 4, merge_rows=False)) == [(0, 0, 2, 1), (0, 1, 2, 1), (2, 2, 2, 1)]
+
+    def test_rectangles_cover_dark_modules(self):
+        qr = rMQR.fit("https://oudon.xyz")
+        binary_list = qr.to_list(with_quiet_zone=False)
+        for merge_rows in (True, False):
+            covered = [[0] * qr.width() for _ in range(qr.height())]
+            for x, y, w, h in rectangles(qr.packed_rows(), qr.width(), merge_rows):
+                for j in range(y, y + h):
+                    for i in range(x, x + w):
+                        assert covered[j][i] == 0
+                        covered[j][i] = 1
+            assert covered == binary_list